@@ -0,0 +1,107 @@
+"""Memory and reload cost of compact price history
+
+Builds a synthetic universe shaped like yfinance output (float64 OHLC,
+Dividends, Stock Splits, tz-aware index) and compares it with
+compact_frame: in-memory bytes per ticker-year, Feather file size, and
+reload time from disk (pandas Feather vs. the memory-mapped compact
+layout). Also checks that the round trip is exact, that compact prices
+match the originals, and that indicators computed from them agree.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.compact import compact_frame, read_feather, write_feather
+from src.indicators import INDICATOR_COLUMNS
+from src.utils import add_technical_indicators
+from synthetic import generate_universe
+
+
+def frame_bytes(frames):
+    return sum(int(frame.memory_usage(deep=True).sum()) for frame in frames.values())
+
+
+def reload_seconds(paths, reader, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for path in paths:
+            reader(path)
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--symbols', type=int, default=200)
+    parser.add_argument('--years', type=float, default=10)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    raw = generate_universe(args.symbols, args.years)
+    compact = {symbol: compact_frame(frame) for symbol, frame in raw.items()}
+    ticker_years = len(raw) * args.years
+
+    raw_bytes, compact_bytes = frame_bytes(raw), frame_bytes(compact)
+    print(f"{len(raw)} tickers x {args.years:g} years")
+    print(f"  in memory:        {raw_bytes / ticker_years / 1024:7.1f} KiB -> "
+          f"{compact_bytes / ticker_years / 1024:7.1f} KiB per ticker-year ({1 - compact_bytes / raw_bytes:.0%} less)")
+
+    sample = list(raw)[:20]
+    raw_features = {s: add_technical_indicators(raw[s]) for s in sample}
+    compact_features = {s: add_technical_indicators(compact[s]) for s in sample}
+    print(f"  with indicators:  {frame_bytes(raw_features) / len(sample) / args.years / 1024:7.1f} KiB -> "
+          f"{frame_bytes(compact_features) / len(sample) / args.years / 1024:7.1f} KiB per ticker-year")
+
+    directory = tempfile.mkdtemp()
+    raw_paths, compact_paths = [], []
+    for symbol in raw:
+        raw_path = os.path.join(directory, f'{symbol}.raw.feather')
+        raw[symbol].reset_index().to_feather(raw_path)
+        raw_paths.append(raw_path)
+        compact_path = os.path.join(directory, f'{symbol}.feather')
+        write_feather(compact[symbol], compact_path)
+        compact_paths.append(compact_path)
+
+    raw_file = sum(os.path.getsize(p) for p in raw_paths)
+    compact_file = sum(os.path.getsize(p) for p in compact_paths)
+    print(f"  feather on disk:  {raw_file / ticker_years / 1024:7.1f} KiB -> "
+          f"{compact_file / ticker_years / 1024:7.1f} KiB per ticker-year")
+
+    raw_seconds = reload_seconds(raw_paths, pd.read_feather, args.repeats)
+    compact_seconds = reload_seconds(compact_paths, read_feather, args.repeats)
+    print(f"  reload universe:  {raw_seconds * 1000:7.1f} ms -> {compact_seconds * 1000:7.1f} ms (memory-mapped)")
+
+    failed = False
+    for symbol, path in zip(raw, compact_paths):
+        reloaded = read_feather(path)
+        if not reloaded.index.equals(compact[symbol].index) or not reloaded.equals(compact[symbol]):
+            print(f"FAIL: {symbol} does not round-trip through Feather")
+            failed = True
+
+        original = raw[symbol][['Open', 'High', 'Low', 'Close']].to_numpy()
+        error = np.max(np.abs(compact[symbol][['Open', 'High', 'Low', 'Close']].to_numpy() / original - 1))
+        if error > 1e-6 or not (compact[symbol]['Volume'] == raw[symbol]['Volume']).all():
+            print(f"FAIL: {symbol} compact prices differ by {error:.2e}")
+            failed = True
+
+    worst = 0.0
+    for symbol in sample:
+        expected = raw_features[symbol][INDICATOR_COLUMNS].to_numpy()
+        actual = compact_features[symbol][INDICATOR_COLUMNS].to_numpy()
+        scale = np.nanmax(np.abs(expected), axis=0)
+        with np.errstate(invalid='ignore'):
+            worst = max(worst, float(np.nanmax(np.abs(actual - expected) / np.where(scale > 0, scale, 1))))
+    print(f"  max indicator error relative to column range: {worst:.2e}")
+    if worst > 1e-5:
+        print("FAIL: indicators from compact history diverge")
+        failed = True
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
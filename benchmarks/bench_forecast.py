@@ -0,0 +1,73 @@
+"""Per-horizon forecast latency: legacy per-day model.predict loop vs FeatureRollout
+
+The legacy loop only rotated the window with np.roll (no predicted bar was
+fed back); FeatureRollout appends each predicted bar, updates indicators in
+O(1) and writes the scaled row into a ring buffer, so the two differ in
+output as well as speed. Runs on the real model and a synthetic history.
+"""
+import argparse
+
+import numpy as np
+
+from common import time_call, summarize
+from config import APP_SETTINGS
+from src.model_loader import ModelLoader
+from src.forecast_engine import ForecastEngine
+from src.rollout import FeatureRollout, history_state
+from src.utils import add_technical_indicators
+from synthetic import synthetic_ohlcv
+
+
+def legacy_rollout(model, target_scaler, sequence, days_ahead):
+    """The loop _generate_predictions used before ForecastEngine"""
+    predictions = []
+    current_sequence = sequence.copy()
+    for _ in range(days_ahead):
+        pred_input = current_sequence.reshape(1, *current_sequence.shape)
+        pred_scaled = model.predict(pred_input, verbose=0)
+        predictions.append(target_scaler.inverse_transform(pred_scaled)[0][0])
+        current_sequence = np.roll(current_sequence, -1, axis=0)
+    return predictions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--horizons', type=int, nargs='+', default=[1, 7, 14, APP_SETTINGS['max_prediction_days']])
+    parser.add_argument('--repeats', type=int, default=30)
+    args = parser.parse_args()
+
+    loader = ModelLoader()
+    if not loader.load_all():
+        raise SystemExit("Model files not available")
+
+    sequence_length = APP_SETTINGS['sequence_length']
+    feature_columns = loader.config['feature_columns']
+    scaler_info = next(iter(loader.scalers.values()))
+    feature_scaler, target_scaler = scaler_info['feature_scaler'], scaler_info['target_scaler']
+
+    engine = ForecastEngine(loader.model, sequence_length, len(feature_columns))
+    engine.warmup()
+    rollout = FeatureRollout(engine, feature_columns, sequence_length)
+
+    data = synthetic_ohlcv(500)
+    features = add_technical_indicators(data)[feature_columns].bfill().values
+    sequence = feature_scaler.transform(features[-sequence_length:]).astype(np.float32)
+
+    def feature_rollout(days):
+        return rollout.run(
+            sequence, history_state(data), feature_scaler.scale_, feature_scaler.min_,
+            target_scaler.scale_[0], target_scaler.min_[0], days
+        )[0]
+
+    print(f"{'horizon':>8} {'impl':>8} {'p50 ms':>10} {'p99 ms':>10}")
+    for days in args.horizons:
+        for name, fn in (
+            ('legacy', lambda: legacy_rollout(loader.model, target_scaler, sequence, days)),
+            ('rollout', lambda: feature_rollout(days)),
+        ):
+            stats = summarize(time_call(fn, repeats=args.repeats))
+            print(f"{days:>8} {name:>8} {stats['p50_ms']:>10.2f} {stats['p99_ms']:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
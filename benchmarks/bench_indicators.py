@@ -0,0 +1,42 @@
+"""Indicator engine throughput in bars/sec (equivalence is covered by tests/test_indicators.py)"""
+import argparse
+import time
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from src.indicators import IndicatorEngine, indicator_frame
+from src.utils import add_technical_indicators
+from synthetic import synthetic_ohlcv
+
+
+def throughput(fn, bars, repeats=3):
+    best = min(_timed(fn) for _ in range(repeats))
+    return bars / best
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--bars', type=int, default=2500)
+    args = parser.parse_args()
+
+    df = synthetic_ohlcv(args.bars)
+    engine = IndicatorEngine()
+    records = df.to_dict('records')
+
+    def stream():
+        engine.reset('SYN')
+        for bar in records:
+            engine.update('SYN', bar)
+
+    print(f"{'pandas':>14}: {throughput(lambda: add_technical_indicators(df), args.bars):>12,.0f} bars/sec")
+    print(f"{'batch':>14}: {throughput(lambda: indicator_frame(df), args.bars):>12,.0f} bars/sec")
+    print(f"{'stream':>14}: {throughput(stream, args.bars):>12,.0f} bars/sec")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""Load test for the Unix-socket inference server
+
+Starts an InferenceServer in a separate process (stub model over the
+synthetic universe, forecast cache disabled so every request reaches the
+model), then drives it from N simulated sessions, each sending requests
+back to back. Runs once with micro-batching off (max_batch=1) and once with
+the configured window, and reports throughput and tail latency for both.
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from common import summarize
+from config import INFERENCE_SERVER_SETTINGS
+from src.cache import MarketDataCache
+from src.data_collector import DataCollector
+from src.fetchers import LocalFetcher
+from src.forecast_cache import ForecastCache
+from src.inference_server import InferenceClient, InferenceServer
+from src.predictor import StockPredictor
+from stub_model import StubModelLoader
+from synthetic import generate_universe
+
+
+class NoForecastCache(ForecastCache):
+    """Never hits, so the load test measures model calls rather than dict lookups"""
+
+    def get(self, symbol, last_bar, model_version, days_ahead):
+        return None
+
+
+def serve(socket_path, n_symbols, window_seconds, max_batch):
+    universe = generate_universe(n_symbols, years=1)
+    predictor = StockPredictor()
+    predictor.data_collector = DataCollector(cache=MarketDataCache(), fetcher=LocalFetcher(frames=universe))
+    predictor.model_loader = StubModelLoader(universe)
+    predictor.forecast_cache = NoForecastCache()
+    predictor.forecast_store = None
+    predictor.initialize()
+
+    # Fill the market data cache so requests time inference, not the first load
+    predictor.predict_many(list(universe), 1)
+
+    server = InferenceServer(predictor, socket_path, window_seconds, max_batch)
+    server.serve_forever()
+
+
+def wait_ready(client, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if client.is_ready:
+            return
+        time.sleep(0.1)
+    raise SystemExit("Inference server did not come up")
+
+
+def load_test(client, symbols, sessions, requests_per_session, days_ahead):
+    latencies = []
+    failures = [0]
+    lock = threading.Lock()
+
+    def session(seed):
+        rng = np.random.default_rng(seed)
+        for _ in range(requests_per_session):
+            symbol = symbols[rng.integers(len(symbols))]
+            start = time.perf_counter()
+            result = client.predict_prices(symbol, days_ahead)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+                if result is None:
+                    failures[0] += 1
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    return wall, latencies, failures[0]
+
+
+def run(label, args, window_seconds, max_batch):
+    socket_path = os.path.join(tempfile.mkdtemp(), 'inference.sock')
+    process = multiprocessing.Process(
+        target=serve, args=(socket_path, args.symbols, window_seconds, max_batch), daemon=True
+    )
+    process.start()
+    try:
+        client = InferenceClient(socket_path)
+        wait_ready(client)
+        symbols = [f'SYN{i:03d}.JK' for i in range(args.symbols)]
+        wall, latencies, failures = load_test(client, symbols, args.sessions, args.requests, args.days)
+        stats = summarize(latencies)
+        server_stats = client.stats()
+        print(f"{label:>12}: {len(latencies) / wall:8.1f} req/s  p50 {stats['p50_ms']:7.2f} ms  "
+              f"p99 {stats['p99_ms']:7.2f} ms  mean batch {server_stats['mean_batch']:5.1f}  "
+              f"failures {failures}")
+    finally:
+        process.terminate()
+        process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--symbols', type=int, default=30)
+    parser.add_argument('--sessions', type=int, default=32, help="concurrent simulated sessions")
+    parser.add_argument('--requests', type=int, default=50, help="requests per session")
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--window-ms', type=float, default=INFERENCE_SERVER_SETTINGS['batch_window_ms'])
+    parser.add_argument('--max-batch', type=int, default=INFERENCE_SERVER_SETTINGS['max_batch'])
+    args = parser.parse_args()
+
+    print(f"{args.sessions} sessions x {args.requests} requests, {args.symbols} symbols")
+    run('unbatched', args, 0.0, 1)
+    run('micro-batch', args, args.window_ms / 1000, args.max_batch)
+
+
+if __name__ == '__main__':
+    main()
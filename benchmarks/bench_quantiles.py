@@ -0,0 +1,71 @@
+"""Quantile forecast latency: 1,000 paths x 30 days per ticker
+
+Uses the stub model over synthetic data. The first call per symbol starts
+the residual backtest in the background and answers from daily-return
+residuals; once the backtest is done, calls only draw and summarize paths,
+which is the figure that must stay well under a second.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from common import summarize, time_call
+from src.cache import MarketDataCache
+from src.data_collector import DataCollector
+from src.fetchers import LocalFetcher
+from src.predictor import StockPredictor
+from stub_model import StubModelLoader
+from synthetic import generate_universe
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--symbols', type=int, default=3)
+    parser.add_argument('--paths', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--repeats', type=int, default=30)
+    args = parser.parse_args()
+
+    universe = generate_universe(args.symbols, years=6)
+    predictor = StockPredictor()
+    predictor.data_collector = DataCollector(cache=MarketDataCache(), fetcher=LocalFetcher(frames=universe))
+    predictor.model_loader = StubModelLoader(universe)
+    predictor.forecast_store = None
+    predictor.initialize()
+
+    for symbol in [s for s in universe if s != '^JKSE']:
+        start = time.perf_counter()
+        result = predictor.predict_quantiles(symbol, args.days, n_paths=args.paths)
+        cold = time.perf_counter() - start
+        if result is None:
+            print(f"{symbol}: no quantile forecast")
+            continue
+        cold_method = result['method']
+
+        start = time.perf_counter()
+        predictor.bootstrap.prepare(symbol, args.days).result()
+        backtest = time.perf_counter() - start
+        result = predictor.predict_quantiles(symbol, args.days, n_paths=args.paths)
+
+        warm = summarize(time_call(
+            lambda: predictor.predict_quantiles(symbol, args.days, n_paths=args.paths), repeats=args.repeats
+        ))
+        point = np.asarray(result['point'])
+        residuals = predictor.bootstrap._residuals[(symbol, predictor._model_version())]
+        simulate = summarize(time_call(
+            lambda: predictor.bootstrap.simulate(point, residuals, args.paths), repeats=args.repeats
+        ))
+
+        bands = np.asarray(result['quantiles'])
+        print(f"{symbol}: {result['method']}, {len(residuals)} residual rows")
+        print(f"  cold ({cold_method}): {cold * 1000:9.1f} ms")
+        print(f"  background backtest : {backtest * 1000:9.1f} ms (after the cold call)")
+        print(f"  warm p50 / p99      : {warm['p50_ms']:9.2f} / {warm['p99_ms']:.2f} ms")
+        print(f"  simulate only p50   : {simulate['p50_ms']:9.2f} ms ({args.paths} x {args.days})")
+        print(f"  day {args.days} band P{result['levels'][0] * 100:g}-P{result['levels'][-1] * 100:g}: "
+              f"{bands[0, -1]:,.0f} - {bands[-1, -1]:,.0f} around {point[-1]:,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""Autoregressive rollout: correctness against full recomputation, and per-step cost
+
+1. Streams real bars through BatchIndicatorState from many origins at once
+   and compares every indicator with add_technical_indicators on the full frame.
+2. Runs FeatureRollout and a reference loop that appends each predicted bar
+   to the DataFrame and recomputes add_technical_indicators every step, on the
+   stub model, and compares predictions and time per step.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from common import summarize, time_call
+from config import APP_SETTINGS
+from src.indicators import INDICATOR_COLUMNS
+from src.numpy_runtime import NumpyForecastEngine
+from src.rollout import FeatureRollout, history_state
+from src.utils import add_technical_indicators
+from stub_model import FEATURE_COLUMNS, StubScaler, stub_model
+from synthetic import synthetic_ohlcv
+
+
+def check_streaming(data, steps, tolerance):
+    expected = add_technical_indicators(data)
+    origins = np.arange(100, len(data) - steps, 7)
+    state = history_state(data, origins)
+
+    worst = {}
+    for k in range(1, steps + 1):
+        bar = data.iloc[origins + k]
+        row = state.update(*(bar[c].to_numpy(dtype=np.float64) for c in ('Open', 'High', 'Low', 'Close', 'Volume')))
+        reference = expected.iloc[origins + k]
+        for column in INDICATOR_COLUMNS:
+            ref = reference[column].to_numpy()
+            diff = np.nanmax(np.abs(row[column] - ref) / np.maximum(np.abs(ref), 1.0))
+            worst[column] = max(worst.get(column, 0.0), float(diff))
+
+    ok = max(worst.values()) <= tolerance
+    print(f"streaming indicators: {len(origins)} origins x {steps} bars, "
+          f"max rel diff {max(worst.values()):.2e} ({'OK' if ok else 'FAIL'})")
+    return ok
+
+
+def reference_rollout(model, data, feature_scaler, target_scaler, days_ahead):
+    """Append each predicted bar and recompute every indicator over the whole frame"""
+    length = APP_SETTINGS['sequence_length']
+    frame = data[['Open', 'High', 'Low', 'Close', 'Volume']].copy()
+    predictions = []
+    for _ in range(days_ahead):
+        features = add_technical_indicators(frame)[FEATURE_COLUMNS].bfill().ffill()
+        window = feature_scaler.transform(features.values[-length:]).astype(np.float32)
+        close = float(target_scaler.inverse_transform(model(window[np.newaxis]))[0, 0])
+        predictions.append(close)
+
+        open_ = frame['Close'].iloc[-1]
+        frame.loc[frame.index[-1] + pd.offsets.BDay()] = {
+            'Open': open_, 'High': max(open_, close), 'Low': min(open_, close),
+            'Close': close, 'Volume': frame['Volume'].iloc[-20:].mean()
+        }
+    return np.array(predictions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--days', type=int, default=APP_SETTINGS['max_prediction_days'])
+    parser.add_argument('--bars', type=int, default=750)
+    parser.add_argument('--repeats', type=int, default=10)
+    parser.add_argument('--tolerance', type=float, default=1e-6)
+    args = parser.parse_args()
+
+    data = synthetic_ohlcv(args.bars)
+    ok = check_streaming(data, steps=40, tolerance=args.tolerance)
+
+    length = APP_SETTINGS['sequence_length']
+    model = stub_model(len(FEATURE_COLUMNS))
+    engine = NumpyForecastEngine(model, length, len(FEATURE_COLUMNS))
+    rollout = FeatureRollout(engine, FEATURE_COLUMNS, length)
+
+    features = add_technical_indicators(data)[FEATURE_COLUMNS]
+    feature_scaler = StubScaler(features.values)
+    target_scaler = StubScaler(data[['Close']].values)
+    window = feature_scaler.transform(features.bfill().values[-length:])
+
+    def fast():
+        return rollout.run(
+            window, history_state(data), feature_scaler.scale_, feature_scaler.min_,
+            target_scaler.scale_[0], target_scaler.min_[0], args.days
+        )[0]
+
+    start = time.perf_counter()
+    reference = reference_rollout(model, data, feature_scaler, target_scaler, args.days)
+    reference_ms = (time.perf_counter() - start) * 1000
+    predicted = fast()
+
+    diff = float(np.max(np.abs(predicted - reference) / np.abs(reference)))
+    ok &= diff <= 1e-4
+    print(f"rollout vs recompute: max rel diff {diff:.2e} over {args.days} days ({'OK' if diff <= 1e-4 else 'FAIL'})")
+
+    stats = summarize(time_call(fast, repeats=args.repeats))
+    print(f"recompute each step : {reference_ms / args.days:8.3f} ms/step")
+    print(f"FeatureRollout      : {stats['p50_ms'] / args.days:8.3f} ms/step (p50 {stats['p50_ms']:.2f} ms total)")
+
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Keras vs NumPy runtime: numerical parity, single-forecast latency and peak RSS
+
+Exports the Keras model to MODEL_PATHS['numpy_model'] first if it's missing.
+RSS is measured in a fresh interpreter per backend.
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+from common import ROOT_DIR, summarize, time_call
+from config import APP_SETTINGS, MODEL_PATHS
+
+RSS_PROBE = r'''
+import json, resource, sys
+sys.path.insert(0, {root!r})
+import numpy as np
+from src.predictor import StockPredictor
+from src.model_loader import ModelLoader
+
+predictor = StockPredictor()
+predictor.model_loader = ModelLoader(backend={backend!r})
+assert predictor.initialize()
+window = np.random.default_rng(0).random((1, {length}, {features}), dtype=np.float32)
+predictor.engine.predict_next(window)
+print(json.dumps({{'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--repeats', type=int, default=30)
+    parser.add_argument('--tolerance', type=float, default=1e-4, help="max abs diff on scaled output")
+    args = parser.parse_args()
+
+    import tensorflow as tf
+    from src.forecast_engine import ForecastEngine
+    from src.model_loader import ModelLoader
+    from src.numpy_runtime import NumpyForecastEngine, NumpyModel, export_numpy_model
+
+    keras_model = tf.keras.models.load_model(ROOT_DIR / MODEL_PATHS['model'])
+    numpy_path = ROOT_DIR / MODEL_PATHS['numpy_model']
+    if not numpy_path.exists():
+        export_numpy_model(keras_model, numpy_path)
+    numpy_model = NumpyModel.load(numpy_path)
+
+    loader = ModelLoader()
+    loader.load_all()
+    sequence_length = APP_SETTINGS['sequence_length']
+    n_features = len(loader.config['feature_columns'])
+
+    rng = np.random.default_rng(0)
+    windows = rng.random((64, sequence_length, n_features), dtype=np.float32)
+    keras_out = keras_model(windows, training=False).numpy()
+    numpy_out = numpy_model(windows)
+    max_diff = float(np.max(np.abs(keras_out - numpy_out)))
+    print(f"parity: max abs diff {max_diff:.2e} over {len(windows)} windows "
+          f"({'OK' if max_diff <= args.tolerance else 'FAIL'}, tolerance {args.tolerance:.0e})")
+
+    engines = {
+        'keras': ForecastEngine(keras_model, sequence_length, n_features),
+        'numpy': NumpyForecastEngine(numpy_model, sequence_length, n_features),
+    }
+    single = windows[:1]
+    for name, engine in engines.items():
+        engine.warmup()
+        # Model cost of a forecast: one predict_next per horizon day
+        stats = summarize(time_call(
+            lambda: [engine.predict_next(single) for _ in range(args.days)], repeats=args.repeats
+        ))
+        print(f"{name:>6} {args.days}-day model steps: p50 {stats['p50_ms']:8.2f} ms  p99 {stats['p99_ms']:8.2f} ms")
+
+    for backend in engines:
+        probe = RSS_PROBE.format(root=str(ROOT_DIR), backend=backend,
+                                 length=sequence_length, features=n_features)
+        output = subprocess.run([sys.executable, '-c', probe], cwd=ROOT_DIR,
+                                capture_output=True, text=True, check=True).stdout
+        rss = json.loads(output.strip().splitlines()[-1])['max_rss_mb']
+        print(f"{backend:>6} peak RSS after load + forecast: {rss:8.1f} MiB")
+
+    if max_diff > args.tolerance:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Cross-process fetch sharing: N app replicas loading the same universe
+
+Each replica is a separate process with its own DataCollector and a
+LocalFetcher with simulated latency. They start together and prefetch the
+same symbols. Without a shared store every replica fetches every symbol;
+with the SQLite store each symbol should be fetched once across all
+replicas. Also checks that in-process callers get the very same cached
+frame object (no defensive copies).
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from src.cache import MarketDataCache
+from src.data_collector import DataCollector
+from src.fetchers import LocalFetcher, RateLimiter
+from src.shared_store import SQLiteMarketStore
+from synthetic import generate_universe
+
+
+def replica(store_path, n_symbols, latency, start_event, results):
+    frames = generate_universe(n_symbols, years=2)
+    store = SQLiteMarketStore(store_path) if store_path else None
+    fetcher = LocalFetcher(frames=frames, latency=latency)
+    collector = DataCollector(cache=MarketDataCache(), fetcher=fetcher, shared_store=store)
+    collector.rate_limiter = RateLimiter(requests_per_second=1000, burst=1000)
+
+    start_event.wait()
+    start = time.perf_counter()
+    report = collector.prefetch(list(frames), max_workers=4)
+    statuses = [info['status'] for info in report.values()]
+    results.put({
+        'pid': os.getpid(),
+        'fetches': fetcher.calls,
+        'shared': statuses.count('shared'),
+        'seconds': time.perf_counter() - start,
+    })
+
+
+def run(label, store_path, args):
+    start_event = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=replica, args=(store_path, args.symbols, args.latency, start_event, results))
+        for _ in range(args.replicas)
+    ]
+    for process in processes:
+        process.start()
+    time.sleep(1.0)  # let every replica finish generating data before the race starts
+    start_event.set()
+
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    fetches = sum(r['fetches'] for r in reports)
+    wall = max(r['seconds'] for r in reports)
+    print(f"{label:>12}: {fetches:4d} source fetches for {args.symbols + 1} symbols x {args.replicas} replicas, "
+          f"slowest replica {wall:.2f}s")
+    return fetches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--replicas', type=int, default=4)
+    parser.add_argument('--symbols', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.2)
+    args = parser.parse_args()
+
+    run('per-process', None, args)
+    store_path = os.path.join(tempfile.mkdtemp(), 'market.sqlite')
+    fetches = run('shared store', store_path, args)
+
+    collector = DataCollector(cache=MarketDataCache(), fetcher=LocalFetcher(frames=generate_universe(1, years=1)))
+    first = collector.get_stock_data('SYN000.JK')
+    second = collector.get_stock_data('SYN000.JK')
+    print(f"in-process: second caller gets the cached object itself: {first is second}")
+
+    if fetches > args.symbols + 1:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
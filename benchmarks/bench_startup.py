@@ -0,0 +1,62 @@
+"""Startup cost: app module imports vs TensorFlow import vs model/scaler deserialization
+
+Each measurement runs in a fresh interpreter so import caches don't leak between runs.
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+from common import ROOT_DIR
+
+PROBE = r'''
+import json, sys, time
+sys.path.insert(0, {root!r})
+
+start = time.perf_counter()
+from src.data_collector import DataCollector
+from src.predictor import StockPredictor
+app_imports = time.perf_counter() - start
+
+predictor = StockPredictor()
+start = time.perf_counter()
+future = predictor.initialize_async()
+handoff = time.perf_counter() - start
+
+ok = future.result()
+total = time.perf_counter() - start
+print(json.dumps(dict(
+    predictor.model_loader.load_timings,
+    ok=ok,
+    app_imports=app_imports,
+    async_handoff=handoff,
+    model_ready=total,
+)))
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    results = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(root=str(ROOT_DIR))],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print("Time until the Analysis tab can render is app_imports + async_handoff;")
+    print("model_ready is when Prediction becomes available.\n")
+    for key in ('app_imports', 'async_handoff', 'import_tensorflow', 'load_model',
+                'load_scalers_config', 'model_ready'):
+        values = np.array([r.get(key, np.nan) for r in results]) * 1000
+        print(f"{key:>20}: median {np.nanmedian(values):9.1f} ms  max {np.nanmax(values):9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Streaming valuation: time to first chunk vs total time, live and replayed from cache
+
+Runs against the local mock server's server-sent events endpoint. Also
+starts several sessions on one fresh report and counts upstream calls.
+"""
+import argparse
+import threading
+import time
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from config import AZURE_OPENAI_CONFIG
+from mock_openai_server import start_mock_server
+from src.valuation_analyzer import ValuationAnalyzer
+
+
+def consume(analyzer, metrics, stock='Bank BCA (BBCA)'):
+    start = time.perf_counter()
+    text = ''.join(analyzer.stream_stock_valuation(
+        stock, 9000.0, [9050.0 + d * 5 for d in range(7)], metrics=metrics
+    ))
+    return text, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--latency', type=float, default=0.3, help="delay before the first event (s)")
+    parser.add_argument('--chunk-delay', type=float, default=0.03, help="gap between events (s)")
+    parser.add_argument('--sessions', type=int, default=8, help="concurrent sessions on one report")
+    args = parser.parse_args()
+
+    server, url = start_mock_server(latency=args.latency, chunk_delay=args.chunk_delay)
+    AZURE_OPENAI_CONFIG.update(endpoint=url, api_key='mock-key')
+    analyzer = ValuationAnalyzer()
+
+    for label in ('live', 'cached'):
+        metrics = {}
+        text, _ = consume(analyzer, metrics)
+        print(f"{label:>7}: first chunk {metrics['ttft_seconds'] * 1000:8.1f} ms  "
+              f"total {metrics['total_seconds'] * 1000:8.1f} ms  "
+              f"{metrics['chunks']:3d} chunks  {len(text)} chars")
+
+    print(f"upstream requests: {server.request_count}")
+
+    before = server.request_count
+    texts = []
+    threads = [
+        threading.Thread(target=lambda: texts.append(consume(analyzer, {}, 'Telkom Indonesia (TLKM)')[0]))
+        for _ in range(args.sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"{args.sessions} concurrent sessions on one report -> {server.request_count - before} upstream call(s), "
+          f"{len(set(texts))} distinct text(s)")
+    server.shutdown()
+
+    if server.request_count - before != 1 or len(set(texts)) != 1:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Intraday streaming: replay minute bars for many symbols and measure lag per bar
+
+Writes a synthetic minute-bar replay file, then feeds it through a
+StreamingForecaster (stub model) on one asyncio loop. Lag is the time from
+a minute's bars being released by the source to that symbol's forecast
+being ready. With --speed N the replay runs at N x real time, so a lag
+under 60/N seconds means the loop keeps up with live cadence.
+
+With --warm-minutes N the first N minutes are served as cached history
+instead: streams are warm-started from the collector before the replay, as
+the live poller does at start-up, so forecasts begin with the first
+replayed bar.
+
+Also checks that the incrementally maintained model windows match the
+features computed from scratch over each symbol's full history, and that
+the last streamed forecast matches a batched rollout seeded from scratch.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from config import APP_SETTINGS, STREAMING_SETTINGS
+from src.cache import MarketDataCache
+from src.data_collector import DataCollector
+from src.fetchers import LocalFetcher, RateLimiter
+from src.predictor import StockPredictor
+from src.rollout import history_state
+from src.streaming import ReplaySource, StreamingForecaster
+from src.utils import add_technical_indicators
+from stub_model import StubModelLoader
+from synthetic import generate_minute_bars
+
+
+def worst(errors):
+    """Largest error over arrays, with NaN counted as infinitely wrong"""
+    return max(float(np.max(np.nan_to_num(error, nan=np.inf))) for error in errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--symbols', type=int, default=300)
+    parser.add_argument('--minutes', type=int, default=150)
+    parser.add_argument('--speed', type=float, default=60.0, help="x real time; 0 = as fast as possible")
+    parser.add_argument('--steps', type=int, default=STREAMING_SETTINGS['forecast_steps'])
+    parser.add_argument('--warm-minutes', type=int, default=0, help="serve these as history and warm-start")
+    args = parser.parse_args()
+
+    bars = generate_minute_bars(args.symbols, args.minutes)
+    frames = {
+        symbol: group.set_index('timestamp').rename(columns=str.capitalize)[['Open', 'High', 'Low', 'Close', 'Volume']]
+        for symbol, group in bars.groupby('symbol')
+    }
+    history = frames
+    if args.warm_minutes:
+        # History includes the first replayed minute, as a live fetch would hold the forming bar
+        history = {symbol: frame.iloc[:args.warm_minutes + 1] for symbol, frame in frames.items()}
+        bars = bars[bars['timestamp'] >= bars['timestamp'].drop_duplicates().iloc[args.warm_minutes]]
+    path = os.path.join(tempfile.mkdtemp(), 'replay.csv')
+    bars.to_csv(path, index=False)
+
+    collector = DataCollector(cache=MarketDataCache(), fetcher=LocalFetcher(frames=history))
+    # Local history: measure the warm start, not the Yahoo rate limit
+    collector.rate_limiter = RateLimiter(requests_per_second=1000, burst=1000)
+    predictor = StockPredictor(data_collector=collector)
+    predictor.model_loader = StubModelLoader(frames)
+    predictor.initialize()
+
+    streamer = StreamingForecaster(predictor, horizon=args.steps)
+    if args.warm_minutes:
+        start = time.perf_counter()
+        ready = streamer.warm(sorted(frames))
+        print(f"warm start: {ready}/{len(frames)} streams ready from {args.warm_minutes} cached minutes "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+    start = time.perf_counter()
+    asyncio.run(streamer.run(ReplaySource(path, args.speed)))
+    wall = time.perf_counter() - start
+
+    info = streamer.info()
+    max_lag = max(streamer.lags) * 1000 if streamer.lags else 0.0
+    print(f"{args.symbols} symbols x {args.minutes} minutes at {args.speed or 'max'}x: "
+          f"{info['closed_bars'] / wall:,.0f} bars/s, {info['forecasts']} forecasts in {info['batches']} batches "
+          f"({info['dropped']} superseded)")
+    print(f"lag per bar: p50 {info['lag_p50_ms']:.1f} ms  p95 {info['lag_p95_ms']:.1f} ms  "
+          f"p99 {info['lag_p99_ms']:.1f} ms  max {max_lag:.1f} ms")
+
+    failed = False
+    if args.speed > 0 and max_lag > 60_000 / args.speed:
+        print(f"FAIL: lag exceeds the {60 / args.speed:.2f}s bar interval at this replay speed")
+        failed = True
+
+    # Equivalence: streamed windows and forecasts vs. a from-scratch computation
+    sequence_length = APP_SETTINGS['sequence_length']
+    symbols = sorted(frames)
+    windows, states, scalers = [], [], []
+    for symbol in symbols:
+        scaler_info = predictor.model_loader.get_scaler_for_stock(symbol)
+        features = add_technical_indicators(frames[symbol])[predictor.model_loader.config['feature_columns']]
+        # A live stream carries the previous value over an undefined indicator (e.g. RSI on flat prices)
+        windows.append(features.ffill().bfill().values[-sequence_length:])
+        states.append(history_state(frames[symbol]))
+        scalers.append(scaler_info)
+
+    window_error = worst(
+        np.abs(streamer.streams[symbol].window() - scaler_info['feature_scaler'].transform(window))
+        for symbol, window, scaler_info in zip(symbols, windows, scalers)
+    )
+    expected = predictor._forecast_batch(windows, states, scalers, args.steps)
+    streamed = np.array([streamer.latest[symbol][1] for symbol in symbols])
+    forecast_error = worst([np.abs(streamed / expected - 1)])
+    print(f"max window error {window_error:.2e}, max forecast relative error {forecast_error:.2e}")
+    if window_error > 1e-4 or forecast_error > 1e-4:
+        print("FAIL: streamed state diverges from the batch computation")
+        failed = True
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
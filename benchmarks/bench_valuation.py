@@ -0,0 +1,61 @@
+"""ValuationAnalyzer against the local mock server: batch concurrency, cache and de-duplication"""
+import argparse
+import asyncio
+import threading
+import time
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from config import AZURE_OPENAI_CONFIG, INDONESIAN_STOCKS, VALUATION_SETTINGS
+from mock_openai_server import start_mock_server
+from src.valuation_analyzer import ValuationAnalyzer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--latency', type=float, default=0.5, help="mock completion time (s)")
+    args = parser.parse_args()
+
+    server, url = start_mock_server(latency=args.latency)
+    AZURE_OPENAI_CONFIG.update(endpoint=url, api_key='mock-key')
+    analyzer = ValuationAnalyzer()
+
+    requests = {
+        name: (5000.0 + i * 100, [5000.0 + i * 100 + d * 10 for d in range(7)])
+        for i, name in enumerate(INDONESIAN_STOCKS)
+    }
+
+    start = time.perf_counter()
+    reports = asyncio.run(analyzer.analyze_universe(requests))
+    cold = time.perf_counter() - start
+    failed = [name for name, text in reports.items() if text.startswith('Error')]
+
+    start = time.perf_counter()
+    asyncio.run(analyzer.analyze_universe(requests))
+    warm = time.perf_counter() - start
+
+    print(f"universe of {len(requests)} (cold): {cold:6.2f} s "
+          f"(sequential would be ~{len(requests) * args.latency:.2f} s, "
+          f"limit {VALUATION_SETTINGS['max_concurrency']} concurrent)")
+    print(f"universe of {len(requests)} (cached): {warm * 1000:6.2f} ms")
+    if failed:
+        print(f"failed: {failed}")
+
+    # Concurrent sessions asking for a fresh identical report share one request
+    before = server.request_count
+    name = 'Dedup Test'
+    threads = [
+        threading.Thread(target=analyzer.analyze_stock_valuation, args=(name, 1000.0, [1010.0] * 7))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"5 concurrent identical requests -> {server.request_count - before} upstream call(s)")
+    print(f"analyzer stats: {analyzer.stats}  cache: {analyzer.cache.info()}")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
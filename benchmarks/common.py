@@ -0,0 +1,34 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Make `config` and `src.*` importable when run as `python benchmarks/<script>.py`
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+def time_call(fn, repeats=50, warmup=3):
+    """Run fn repeatedly and return per-call latencies in milliseconds"""
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return np.array(samples)
+
+
+def summarize(samples):
+    """p50/p99/mean summary of latency samples (ms)"""
+    samples = np.asarray(samples, dtype=float)
+    return {
+        'p50_ms': float(np.percentile(samples, 50)),
+        'p99_ms': float(np.percentile(samples, 99)),
+        'mean_ms': float(samples.mean()),
+        'n': int(len(samples))
+    }
@@ -0,0 +1,111 @@
+"""Local stand-in for the Azure OpenAI chat completions endpoint
+
+Answers POST .../chat/completions with a canned completion after a
+configurable delay and counts requests, so valuation code can be exercised
+without network access or billing. Requests with "stream": true get the
+reply as server-sent events, one word per event.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def mock_completion_text(body):
+    """Deterministic reply derived from the user prompt"""
+    prompt = next((m['content'] for m in body.get('messages', []) if m['role'] == 'user'), '')
+    subject = prompt.strip().splitlines()[0] if prompt.strip() else 'the stock'
+    return (
+        f"**Mock valuation** for: {subject}\n\n"
+        "1. Valuation: Fair\n2. Recommendation: Hold\n3. Risks: market volatility\n"
+        "4. Target range: n/a\n5. Horizon: 3-6 months"
+    )
+
+
+class MockChatHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        if not self.path.split('?')[0].endswith('/chat/completions'):
+            self.send_error(404)
+            return
+
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with self.server.lock:
+            self.server.request_count += 1
+
+        time.sleep(self.server.latency)
+        text = mock_completion_text(body)
+        if body.get('stream'):
+            self._stream(text)
+            return
+
+        payload = json.dumps({
+            'id': 'chatcmpl-mock',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': 'mock',
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': text},
+                'finish_reason': 'stop'
+            }],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}
+        }).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream(self, text):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+        words = text.split(' ')
+        for i, word in enumerate(words):
+            delta = {'content': word if i == len(words) - 1 else word + ' '}
+            if i == 0:
+                delta['role'] = 'assistant'
+            event = {
+                'id': 'chatcmpl-mock',
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': 'mock',
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': None}]
+            }
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            time.sleep(self.server.chunk_delay)
+
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_server(latency=0.2, port=0, chunk_delay=0.02):
+    """Start the server on a daemon thread; returns (server, base_url)
+
+    latency is the delay before the first byte; chunk_delay the gap between
+    streamed events.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), MockChatHandler)
+    server.latency = latency
+    server.chunk_delay = chunk_delay
+    server.request_count = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == '__main__':
+    server, url = start_mock_server(port=8600)
+    print(f"Mock Azure OpenAI listening on {url}; set AZURE_OPENAI_ENDPOINT={url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,138 @@
+"""End-to-end benchmark suite on synthetic IDX-like data
+
+Times each pipeline stage on its own and end to end, with no network:
+data load (cold and cached), add_technical_indicators, _prepare_sequence,
+single and batched forecasts, and calculate_price_metrics. Uses the small
+stand-in model unless --real-model is given and the .h5 is present.
+Results are written as JSON for comparison across commits.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from common import ROOT_DIR, summarize
+from config import MODEL_PATHS
+from src.cache import MarketDataCache
+from src.data_collector import DataCollector
+from src.fetchers import LocalFetcher, RateLimiter
+from src.model_loader import ModelLoader
+from src.predictor import StockPredictor
+from src.utils import add_technical_indicators, calculate_price_metrics
+from stub_model import StubModelLoader
+from synthetic import generate_universe
+
+
+def timed_samples(fn, items, repeats):
+    """Latency (ms) of fn(item) for every item, repeated"""
+    samples = []
+    for _ in range(repeats):
+        for item in items:
+            start = time.perf_counter()
+            fn(item)
+            samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def build_predictor(universe, real_model):
+    fetcher = LocalFetcher(frames=universe)
+    collector = DataCollector(cache=MarketDataCache(), fetcher=fetcher)
+    collector.rate_limiter = RateLimiter(requests_per_second=1e6, burst=1e6)
+
+    predictor = StockPredictor()
+    predictor.data_collector = collector
+    use_real = real_model and (ROOT_DIR / MODEL_PATHS['model']).exists()
+    predictor.model_loader = ModelLoader() if use_real else StubModelLoader(universe)
+    if not predictor.initialize():
+        raise SystemExit("Predictor failed to initialize")
+    return predictor, ('real' if use_real else 'stub')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--symbols', type=int, default=20)
+    parser.add_argument('--years', type=float, default=2)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--real-model', action='store_true')
+    parser.add_argument('--output', default='benchmark_results.json')
+    args = parser.parse_args()
+
+    universe = generate_universe(args.symbols, args.years, seed=args.seed)
+    symbols = [s for s in universe if s != '^JKSE']
+    predictor, model_kind = build_predictor(universe, args.real_model)
+    collector = predictor.data_collector
+
+    def cold_load(symbol):
+        collector.cache.clear()
+        collector.get_stock_data(symbol)
+
+    frames = {symbol: collector.get_stock_data(symbol) for symbol in symbols}
+    with_indicators = {symbol: add_technical_indicators(frame) for symbol, frame in frames.items()}
+
+    def single_forecast(symbol):
+        predictor.forecast_cache.clear()
+        predictor.predict_prices(symbol, days_ahead=args.days)
+
+    def batched_forecast(_):
+        predictor.forecast_cache.clear()
+        predictor.predict_many(symbols, days_ahead=args.days)
+
+    def end_to_end(symbol):
+        collector.cache.clear()
+        predictor.forecast_cache.clear()
+        data = collector.get_stock_data(symbol)
+        calculate_price_metrics(data)
+        predictor.predict_prices(symbol, days_ahead=args.days)
+
+    results = {
+        'data_load_cold': timed_samples(cold_load, symbols, args.repeats),
+        'data_load_cached': timed_samples(collector.get_stock_data, symbols, args.repeats),
+        'add_technical_indicators': timed_samples(lambda s: add_technical_indicators(frames[s]), symbols, args.repeats),
+        'prepare_sequence': timed_samples(lambda s: predictor._prepare_sequence(with_indicators[s], s), symbols, args.repeats),
+        'forecast_single': timed_samples(single_forecast, symbols, args.repeats),
+        'forecast_batch_universe': timed_samples(batched_forecast, [None], args.repeats),
+        'calculate_price_metrics': timed_samples(lambda s: calculate_price_metrics(frames[s]), symbols, args.repeats),
+        'end_to_end_single': timed_samples(end_to_end, symbols, args.repeats),
+    }
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'symbols': len(symbols),
+            'years': args.years,
+            'bars_per_symbol': int(np.mean([len(f) for f in frames.values()])),
+            'days_ahead': args.days,
+            'model': model_kind,
+            'inference_backend': predictor.model_loader.backend,
+        },
+        'results': results,
+    }
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'stage':>26} {'p50 ms':>10} {'p99 ms':>10} {'n':>6}")
+    for stage, stats in results.items():
+        print(f"{stage:>26} {stats['p50_ms']:>10.2f} {stats['p99_ms']:>10.2f} {stats['n']:>6}")
+    print(f"\nwrote {args.output} ({model_kind} model)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Small stand-in for the production model so benchmarks run without the .h5 or TensorFlow
+
+StubModelLoader is a ModelLoader whose load_all builds a tiny random
+LSTM -> Dense network on the NumPy runtime and per-symbol min-max scalers
+fitted to the synthetic data.
+"""
+import numpy as np
+
+from config import APP_SETTINGS
+from src.indicators import INDICATOR_COLUMNS
+from src.model_loader import ModelLoader
+from src.numpy_runtime import NumpyModel
+from src.utils import add_technical_indicators
+
+FEATURE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume'] + INDICATOR_COLUMNS
+
+
+class StubScaler:
+    """Minimal MinMaxScaler with the attributes the predictor relies on"""
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        low, high = np.nanmin(values, axis=0), np.nanmax(values, axis=0)
+        span = np.where(high > low, high - low, 1.0)
+        self.scale_ = 1.0 / span
+        self.min_ = -low * self.scale_
+
+    def transform(self, values):
+        return np.asarray(values, dtype=np.float64) * self.scale_ + self.min_
+
+    def inverse_transform(self, values):
+        return (np.asarray(values, dtype=np.float64) - self.min_) / self.scale_
+
+
+def stub_model(n_features, units=32, seed=0):
+    """Random LSTM(units) -> Dense(1) network on the NumPy runtime"""
+    rng = np.random.default_rng(seed)
+    topology = [
+        {'name': 'input', 'class_name': 'InputLayer', 'inbound': []},
+        {'name': 'lstm', 'class_name': 'LSTM', 'inbound': ['input'], 'activation': 'tanh',
+         'recurrent_activation': 'sigmoid', 'return_sequences': False},
+        {'name': 'dense', 'class_name': 'Dense', 'inbound': ['lstm'], 'activation': 'linear'},
+    ]
+    weights = {
+        'lstm': [
+            rng.normal(0, 0.2, (n_features, 4 * units)).astype(np.float32),
+            rng.normal(0, 0.2, (units, 4 * units)).astype(np.float32),
+            np.zeros(4 * units, dtype=np.float32),
+        ],
+        'dense': [
+            rng.normal(0, 0.2, (units, 1)).astype(np.float32),
+            np.full(1, 0.5, dtype=np.float32),
+        ],
+    }
+    return NumpyModel(topology, weights)
+
+
+class StubModelLoader(ModelLoader):
+    def __init__(self, frames):
+        super().__init__(backend='numpy')
+        self.frames = frames
+
+    def load_all(self):
+        """Build the stub model and fit scalers on the synthetic frames"""
+        self.config = {
+            'sequence_length': APP_SETTINGS['sequence_length'],
+            'feature_columns': FEATURE_COLUMNS,
+        }
+        self.model = stub_model(len(FEATURE_COLUMNS))
+        self.scalers = {}
+        for symbol, frame in self.frames.items():
+            features = add_technical_indicators(frame)[FEATURE_COLUMNS]
+            self.scalers[symbol.replace('.JK', '').replace('^', '')] = {
+                'feature_scaler': StubScaler(features.values),
+                'target_scaler': StubScaler(frame[['Close']].values),
+            }
+        self.loaded_version = self.model_version()
+        self.is_loaded = True
+        return True
+
+    def model_version(self):
+        return 'stub'
@@ -0,0 +1,138 @@
+"""Deterministic synthetic OHLCV data shaped like IDX listings
+
+Prices follow a geometric random walk snapped to the IDX tick-size ladder,
+volumes are whole lots with a weekday profile and spikes on large moves, and
+the calendar skips weekends, fixed national holidays, a yearly Lebaran
+closure and occasional per-symbol trading suspensions.
+"""
+import numpy as np
+import pandas as pd
+
+TIMEZONE = 'Asia/Jakarta'
+LOT_SIZE = 100
+
+# (upper price bound, tick size) for IDX equities
+TICK_LADDER = [(200, 1), (500, 2), (2000, 5), (5000, 10), (np.inf, 25)]
+
+# Typical starting price ranges by board segment
+PRICE_LEVELS = {
+    'large_cap': (4000, 10000),
+    'mid_cap': (500, 4000),
+    'small_cap': (50, 500),
+}
+
+FIXED_HOLIDAYS = ['01-01', '05-01', '06-01', '08-17', '12-25', '12-26']
+# Day-of-week volume multipliers, Monday..Friday
+WEEKDAY_VOLUME = np.array([1.1, 1.0, 0.95, 1.0, 0.85])
+
+
+def snap_to_tick(prices):
+    """Round prices to the IDX tick size for their price band"""
+    prices = np.asarray(prices, dtype=np.float64)
+    ticks = np.select([prices < bound for bound, _ in TICK_LADDER], [tick for _, tick in TICK_LADDER])
+    return np.maximum(np.round(prices / ticks) * ticks, 1.0)
+
+
+def trading_calendar(years, end='2025-06-30', seed=0):
+    """Business days over `years` minus national holidays and a Lebaran week per year"""
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(end)
+    days = pd.bdate_range(end=end, periods=int(years * 261))
+
+    holidays = set()
+    for year in range(days[0].year, days[-1].year + 1):
+        holidays.update(pd.Timestamp(f'{year}-{md}') for md in FIXED_HOLIDAYS)
+        # Lebaran moves ~11 days earlier each year; approximate with a seeded start
+        lebaran = pd.Timestamp(f'{year}-01-01') + pd.Timedelta(days=int(rng.integers(90, 180)))
+        holidays.update(pd.date_range(lebaran, periods=5))
+
+    return days[~days.isin(list(holidays))]
+
+
+def generate_symbol(calendar, segment='large_cap', seed=0, suspension_rate=0.002, start_price=None):
+    """One symbol's OHLCV frame over a trading calendar"""
+    rng = np.random.default_rng(seed)
+    n = len(calendar)
+
+    low_price, high_price = PRICE_LEVELS[segment]
+    drawn_price = rng.uniform(low_price, high_price)
+    start_price = start_price or drawn_price
+    volatility = {'large_cap': 0.015, 'mid_cap': 0.022, 'small_cap': 0.035}[segment]
+
+    returns = rng.standard_t(df=4, size=n) * volatility / np.sqrt(2)
+    close = snap_to_tick(start_price * np.exp(np.cumsum(returns)))
+    prev_close = np.concatenate(([close[0]], close[:-1]))
+    open_ = snap_to_tick(prev_close * np.exp(rng.normal(0, volatility / 3, n)))
+    spread = np.abs(rng.normal(0, volatility / 2, n))
+    high = snap_to_tick(np.maximum(open_, close) * (1 + spread))
+    low = snap_to_tick(np.minimum(open_, close) * (1 - spread))
+
+    base_lots = {'large_cap': 2e5, 'mid_cap': 5e4, 'small_cap': 2e4}[segment]
+    weekday = WEEKDAY_VOLUME[np.asarray(calendar.weekday)]
+    spike = 1 + 20 * np.abs(returns)
+    lots = np.maximum(rng.lognormal(np.log(base_lots), 0.6, n) * weekday * spike, 1)
+    volume = (lots.astype(np.int64) * LOT_SIZE)
+
+    frame = pd.DataFrame({
+        'Open': open_, 'High': high, 'Low': low, 'Close': close,
+        'Volume': volume, 'Dividends': 0.0, 'Stock Splits': 0.0
+    }, index=calendar.tz_localize(TIMEZONE).rename('Date'))
+
+    # Suspensions: short runs of missing sessions
+    suspended = np.zeros(n, dtype=bool)
+    for start in np.flatnonzero(rng.random(n) < suspension_rate):
+        suspended[start:start + int(rng.integers(1, 6))] = True
+    return frame[~suspended]
+
+
+def synthetic_ohlcv(n_days, seed=0, segment='large_cap', start_price=None, start='2015-01-01'):
+    """One symbol over n_days consecutive business days, with no holidays or suspensions"""
+    calendar = pd.bdate_range(start=start, periods=n_days)
+    return generate_symbol(calendar, segment, seed=seed, suspension_rate=0.0, start_price=start_price)
+
+
+def generate_universe(n_symbols, years, seed=0):
+    """{symbol: frame} for n_symbols synthetic listings plus a composite ^JKSE"""
+    calendar = trading_calendar(years, seed=seed)
+    segments = list(PRICE_LEVELS)
+    universe = {}
+    for i in range(n_symbols):
+        symbol = f'SYN{i:03d}.JK'
+        universe[symbol] = generate_symbol(calendar, segments[i % len(segments)], seed=seed + i + 1)
+
+    # Composite index: equal-weighted average of normalized closes, scaled to ~7000
+    closes = pd.DataFrame({s: f['Close'] for s, f in universe.items()}).ffill().bfill()
+    level = (closes / closes.iloc[0]).mean(axis=1) * 7000
+    index = pd.DataFrame({
+        'Open': level.shift(1).fillna(level), 'High': level * 1.004, 'Low': level * 0.996,
+        'Close': level, 'Volume': closes.shape[1] * 1e7, 'Dividends': 0.0, 'Stock Splits': 0.0
+    })
+    index['High'] = index[['Open', 'High', 'Close']].max(axis=1)
+    index['Low'] = index[['Open', 'Low', 'Close']].min(axis=1)
+    universe['^JKSE'] = index
+    return universe
+
+
+def generate_minute_bars(n_symbols, n_minutes, start='2025-06-30 09:00', seed=0):
+    """Long-format 1-minute bars (timestamp, symbol, open, high, low, close, volume), time-ordered"""
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range(start, periods=n_minutes, freq='min')
+    segments = list(PRICE_LEVELS)
+
+    parts = []
+    for i in range(n_symbols):
+        low_price, high_price = PRICE_LEVELS[segments[i % len(segments)]]
+        returns = rng.standard_t(df=4, size=n_minutes) * 0.001
+        close = snap_to_tick(rng.uniform(low_price, high_price) * np.exp(np.cumsum(returns)))
+        open_ = np.concatenate(([close[0]], close[:-1]))
+        spread = np.abs(rng.normal(0, 0.0005, n_minutes))
+        parts.append(pd.DataFrame({
+            'timestamp': timestamps,
+            'symbol': f'SYN{i:03d}.JK',
+            'open': open_,
+            'high': snap_to_tick(np.maximum(open_, close) * (1 + spread)),
+            'low': snap_to_tick(np.minimum(open_, close) * (1 - spread)),
+            'close': close,
+            'volume': rng.integers(1, 500, n_minutes) * LOT_SIZE,
+        }))
+    return pd.concat(parts).sort_values('timestamp', kind='stable').reset_index(drop=True)
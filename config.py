@@ -22,6 +22,7 @@ AZURE_OPENAI_CONFIG = {
 # Model Paths
 MODEL_PATHS = {
     'model': 'models/indonesian_stock_prediction_model.h5',
+    'numpy_model': 'models/indonesian_stock_prediction_model.npz',
     'scalers': 'models/stock_scalers.pkl',
     'config': 'models/model_config.pkl'
 }
@@ -31,5 +32,134 @@ APP_SETTINGS = {
     'max_prediction_days': 30,
     'default_prediction_days': 7,
     'data_period': '2y',
-    'sequence_length': 60
+    'sequence_length': 60,
+    # 'keras' (TensorFlow) or 'numpy' (exported weights, see src/numpy_runtime.py)
+    'inference_backend': os.getenv('INFERENCE_BACKEND', 'keras')
+}
+
+# Market Data Cache
+CACHE_SETTINGS = {
+    'max_bytes': int(os.getenv('STOCK_CACHE_MAX_BYTES', 256 * 1024 * 1024)),
+    'session_ttl_seconds': 300,
+    'cache_dir': os.getenv('STOCK_CACHE_DIR'),
+    'file_format': 'parquet',
+    # Keep float32 OHLC / int64 volume only (see src/compact.py). Opt-in: cuts
+    # memory ~36% but moves indicators by up to ~6e-7 of their range
+    # (benchmarks/bench_compact_history.py), and model inputs then differ from training
+    'compact_history': os.getenv('STOCK_CACHE_COMPACT', '0').lower() in ('1', 'true', 'yes'),
+    'timezone': 'Asia/Jakarta',
+    'session_open': '09:00',
+    'session_close': '16:00'
+}
+
+# Feature Store (scaled model inputs, memory-mapped; disabled when unset)
+FEATURE_STORE_SETTINGS = {
+    'directory': os.getenv('FEATURE_STORE_DIR')
+}
+
+# Process-wide market data service shared by the app's components and sessions
+DATA_SERVICE_SETTINGS = {
+    # SQLite file shared by app replicas on one host; unset keeps data per process
+    'shared_store': os.getenv('MARKET_DATA_STORE'),
+    'lease_seconds': 60,
+    'poll_seconds': 0.2,
+    # The app enables pandas copy-on-write at start-up so shared cached frames are never modified in place
+    'copy_on_write': True
+}
+
+# Concurrent data prefetch
+PREFETCH_SETTINGS = {
+    'max_workers': 4,
+    'requests_per_second': 2.0,
+    'burst': 4,
+    'max_retries': 3,
+    'backoff_seconds': 0.5
+}
+
+# Forecast result cache
+FORECAST_CACHE_SETTINGS = {
+    'max_entries': 256
+}
+
+# Walk-forward backtesting
+BACKTEST_SETTINGS = {
+    'period': '10y',
+    'horizons': [1, 5, 10, 20],
+    'batch_size': 512,
+    'output_path': 'backtests/results.parquet'
+}
+
+# Probabilistic forecasts: point path x bootstrapped historical forecast errors
+PROBABILISTIC_SETTINGS = {
+    'n_paths': 1000,
+    'quantiles': [0.05, 0.25, 0.5, 0.75, 0.95],
+    'residual_period': '5y',
+    'min_residuals': 100,
+    'seed': None
+}
+
+# Cross-sectional market overview (screener, correlation, beta)
+MARKET_OVERVIEW_SETTINGS = {
+    'benchmark': '^JKSE',
+    'period': '2y',
+    'window_days': 252,
+    'trading_days_per_year': 252,
+    'return_horizons': {'1D': 1, '1W': 5, '1M': 21, '3M': 63, '6M': 126, '1Y': 252}
+}
+
+# Nightly batch forecasts (python -m src.batch_forecast), read back by the app; store disabled when unset
+BATCH_FORECAST_SETTINGS = {
+    'output_dir': os.getenv('FORECAST_STORE_DIR'),
+    'symbols_file': os.getenv('FORECAST_SYMBOLS_FILE'),
+    'period': '2y',
+    'batch_size': 64,
+    'loader_workers': 8
+}
+
+# Shared inference server (python -m src.inference_server); the app uses it when INFERENCE_SOCKET is set
+INFERENCE_SERVER_SETTINGS = {
+    'socket_path': os.getenv('INFERENCE_SOCKET'),
+    'default_socket_path': '/tmp/stock-inference.sock',
+    'batch_window_ms': 10,
+    'max_batch': 64,
+    'timeout_seconds': 30,
+    # How long the app waits for the server before reporting it unavailable
+    'connect_timeout_seconds': float(os.getenv('INFERENCE_CONNECT_TIMEOUT', 15))
+}
+
+# Intraday streaming (python -m src.streaming): re-forecast whenever a minute bar closes
+STREAMING_SETTINGS = {
+    'interval': '1m',
+    'buffer_bars': 390,
+    'forecast_steps': 5,
+    'batch_window_ms': 20,
+    'poll_seconds': 60,
+    # Minute history loaded at start-up so streams forecast from the first live bar
+    'warm_period': '5d',
+    'replay_speed': 0.0
+}
+
+# Valuation (Azure OpenAI) client behaviour
+VALUATION_SETTINGS = {
+    'max_concurrency': 4,
+    'timeout_seconds': 30,
+    'max_retries': 2,
+    'backoff_seconds': 1.0,
+    'max_tokens': 800,
+    'temperature': 0.7,
+    'cache_timezone': 'Asia/Jakarta',
+    'cache_max_entries': 1000,
+    # Longest a caller waits on an identical request already in flight
+    'inflight_wait_seconds': 120
+}
+
+# Pipeline instrumentation (off unless ENABLE_INSTRUMENTATION is set)
+INSTRUMENTATION_SETTINGS = {
+    'enabled': os.getenv('ENABLE_INSTRUMENTATION', '').lower() in ('1', 'true', 'yes'),
+    'window': 1000,
+    'prometheus_port': os.getenv('METRICS_PORT'),
+    # Loopback by default; set METRICS_HOST=0.0.0.0 to let a remote scraper in
+    'prometheus_host': os.getenv('METRICS_HOST', '127.0.0.1'),
+    'prometheus_file': os.getenv('METRICS_FILE'),
+    'export_interval_seconds': 15
 }
@@ -0,0 +1,169 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .rollout import history_state
+from .utils import add_technical_indicators
+from config import APP_SETTINGS, BACKTEST_SETTINGS
+
+
+class Backtester:
+    """Walk-forward evaluation of the forecast model over historical windows
+
+    Every 60-bar window of a symbol's scaled feature matrix is built at once
+    as a strided view, and the indicator state at every origin is seeded in
+    one vectorized pass; both are then rolled forward through the model in
+    large batches exactly as a live forecast would be.
+    """
+
+    def __init__(self, predictor, batch_size=None):
+        self.predictor = predictor
+        self.batch_size = batch_size or BACKTEST_SETTINGS['batch_size']
+
+    def run(self, symbol, start=None, end=None, horizons=None, period=None):
+        """Forecast from every window whose last bar falls in [start, end]
+
+        Returns one row per (origin date, horizon) with the close at the
+        origin, the predicted close and the actual close.
+        """
+        if not self.predictor.is_ready:
+            raise ValueError("Predictor not initialized")
+
+        horizons = sorted(horizons or BACKTEST_SETTINGS['horizons'])
+        max_horizon = horizons[-1]
+        sequence_length = APP_SETTINGS['sequence_length']
+
+        data = self.predictor.data_collector.get_stock_data(symbol, period=period or BACKTEST_SETTINGS['period'])
+        if data is None or len(data) < sequence_length + max_horizon:
+            return pd.DataFrame()
+
+        scaled = self._scaled_features(data, symbol)
+        close = data['Close'].to_numpy(dtype=np.float64)
+
+        # (n_windows, sequence_length, n_features) view; window i ends at row i + sequence_length - 1
+        windows = sliding_window_view(scaled, sequence_length, axis=0).transpose(0, 2, 1)
+        origins = np.arange(sequence_length - 1, len(scaled))
+
+        # Keep windows inside the date range that still have max_horizon bars of future
+        mask = origins + max_horizon < len(close)
+        if start is not None:
+            mask &= data.index[origins] >= pd.Timestamp(start, tz=data.index.tz)
+        if end is not None:
+            mask &= data.index[origins] <= pd.Timestamp(end, tz=data.index.tz)
+        selected = np.flatnonzero(mask)
+        if not len(selected):
+            return pd.DataFrame()
+
+        scaler_info = self.predictor.model_loader.get_scaler_for_stock(symbol)
+        feature_scaler, target_scaler = scaler_info['feature_scaler'], scaler_info['target_scaler']
+        predicted = np.empty((len(selected), max_horizon))
+        for batch_start in range(0, len(selected), self.batch_size):
+            batch = selected[batch_start:batch_start + self.batch_size]
+            predicted[batch_start:batch_start + len(batch)] = self.predictor.rollout.run(
+                windows[batch], history_state(data, origins[batch]),
+                feature_scaler.scale_, feature_scaler.min_,
+                target_scaler.scale_[0], target_scaler.min_[0], max_horizon
+            )
+
+        origin_rows = origins[selected]
+        steps = np.array(horizons)
+        return pd.DataFrame({
+            'symbol': symbol,
+            'origin_date': np.repeat(data.index[origin_rows], len(steps)),
+            'horizon': np.tile(steps, len(origin_rows)),
+            'base_close': np.repeat(close[origin_rows], len(steps)),
+            'predicted_close': predicted[:, steps - 1].ravel(),
+            'actual_close': close[origin_rows[:, np.newaxis] + steps].ravel(),
+        })
+
+    def residuals(self, symbol, max_horizon, period=None):
+        """Log forecast errors log(actual / predicted), shape (n_origins, max_horizon)
+
+        Row i is one origin's error trajectory over horizons 1..max_horizon,
+        so resampling whole rows keeps the errors' correlation across days.
+        """
+        results = self.run(symbol, horizons=range(1, max_horizon + 1), period=period)
+        if results.empty:
+            return np.empty((0, max_horizon))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            errors = np.log(results['actual_close'].to_numpy() / results['predicted_close'].to_numpy())
+        errors = errors.reshape(-1, max_horizon)
+        return errors[np.isfinite(errors).all(axis=1)]
+
+    def run_universe(self, symbols, output_path=None, **kwargs):
+        """Backtest several symbols, write per-window results to Parquet, return the summary"""
+        output_path = Path(output_path or BACKTEST_SETTINGS['output_path'])
+        frames = []
+        for symbol in symbols:
+            try:
+                frames.append(self.run(symbol, **kwargs))
+            except Exception as e:
+                print(f"Backtest error for {symbol}: {e}")
+
+        frames = [f for f in frames if not f.empty]
+        results = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        summary = summarize_backtest(results)
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        results.to_parquet(output_path, index=False)
+        summary.to_parquet(output_path.with_name(output_path.stem + '_summary.parquet'), index=False)
+        return summary
+
+    def _scaled_features(self, data, symbol):
+        """Scaled float32 feature matrix for the whole history"""
+        feature_columns = self.predictor.model_loader.config['feature_columns']
+        scaler_info = self.predictor.model_loader.get_scaler_for_stock(symbol)
+
+        features = add_technical_indicators(data)[feature_columns]
+        features = features.bfill().ffill()
+        return scaler_info['feature_scaler'].transform(features.values).astype(np.float32)
+
+
+def summarize_backtest(results):
+    """MAE, MAPE (%) and directional accuracy (%) per symbol and horizon"""
+    if results.empty:
+        return pd.DataFrame(columns=['symbol', 'horizon', 'windows', 'mae', 'mape', 'directional_accuracy'])
+
+    error = results['predicted_close'] - results['actual_close']
+    predicted_move = np.sign(results['predicted_close'] - results['base_close'])
+    actual_move = np.sign(results['actual_close'] - results['base_close'])
+
+    scored = results.assign(
+        abs_error=error.abs(),
+        pct_error=(error.abs() / results['actual_close'].abs()) * 100,
+        direction_hit=(predicted_move == actual_move).astype(float) * 100
+    )
+    summary = scored.groupby(['symbol', 'horizon']).agg(
+        windows=('abs_error', 'size'),
+        mae=('abs_error', 'mean'),
+        mape=('pct_error', 'mean'),
+        directional_accuracy=('direction_hit', 'mean')
+    )
+    return summary.reset_index()
+
+
+if __name__ == '__main__':
+    # python -m src.backtester [SYMBOL ...]: backtest and write BACKTEST_SETTINGS['output_path']
+    import argparse
+    from config import INDONESIAN_STOCKS
+    from .predictor import StockPredictor
+
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the forecast model")
+    parser.add_argument('symbols', nargs='*', default=list(INDONESIAN_STOCKS.values()))
+    parser.add_argument('--start')
+    parser.add_argument('--end')
+    parser.add_argument('--horizons', type=int, nargs='+')
+    parser.add_argument('--output', default=BACKTEST_SETTINGS['output_path'])
+    args = parser.parse_args()
+
+    predictor = StockPredictor()
+    if not predictor.initialize():
+        raise SystemExit("Model files not available")
+
+    summary = Backtester(predictor).run_universe(
+        args.symbols, args.output, start=args.start, end=args.end, horizons=args.horizons
+    )
+    print(summary.to_string(index=False))
@@ -0,0 +1,158 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from .forecast_store import ForecastStore
+from .rollout import history_state
+from .utils import add_technical_indicators
+from config import APP_SETTINGS, BATCH_FORECAST_SETTINGS
+
+
+class BatchForecaster:
+    """Forecast a whole symbol universe into a ForecastStore
+
+    Data loading and feature preparation run on a thread pool while the
+    calling thread runs inference on each batch as soon as enough windows are
+    ready, so downloads and indicator work for later symbols overlap with
+    model calls for earlier ones.
+    """
+
+    def __init__(self, predictor, store, batch_size=None, loader_workers=None):
+        self.predictor = predictor
+        self.store = store
+        self.batch_size = batch_size or BATCH_FORECAST_SETTINGS['batch_size']
+        self.loader_workers = loader_workers or BATCH_FORECAST_SETTINGS['loader_workers']
+
+    def run(self, symbols, days_ahead=None, period=None, force=False):
+        """Forecast every symbol and write the results
+
+        Symbols whose forecast for the latest bar and current model is
+        already stored are skipped unless force is set. Returns a summary
+        dict with counts, per-symbol errors and elapsed seconds.
+        """
+        if not self.predictor.is_ready:
+            raise ValueError("Predictor not initialized")
+
+        horizon = days_ahead or APP_SETTINGS['max_prediction_days']
+        period = period or BATCH_FORECAST_SETTINGS['period']
+        model_version = self.predictor._model_version()
+        summary = {'symbols': len(symbols), 'written': 0, 'skipped': 0, 'batches': 0, 'errors': {}}
+        start = time.perf_counter()
+
+        pending = []
+        with ThreadPoolExecutor(max_workers=self.loader_workers) as pool:
+            futures = {
+                pool.submit(self._prepare, symbol, period, model_version, force): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    prepared = future.result()
+                except Exception as e:
+                    summary['errors'][symbol] = str(e)
+                    continue
+
+                if prepared is None:
+                    summary['skipped'] += 1
+                    continue
+
+                pending.append(prepared)
+                if len(pending) >= self.batch_size:
+                    self._flush(pending, horizon, model_version, summary)
+                    pending = []
+
+        if pending:
+            self._flush(pending, horizon, model_version, summary)
+
+        summary['seconds'] = time.perf_counter() - start
+        return summary
+
+    def _prepare(self, symbol, period, model_version, force):
+        """Load one symbol and build its unscaled window (runs on the loader pool)"""
+        data = self.predictor.data_collector.get_stock_data(symbol, period=period)
+        if data is None or data.empty:
+            raise ValueError("No data available")
+
+        last_bar = data.index[-1]
+        if not force and self.store.get(symbol, last_bar, model_version) is not None:
+            return None
+
+        window = self.predictor._prepare_window(add_technical_indicators(data))
+        scaler_info = self.predictor.model_loader.get_scaler_for_stock(symbol)
+        return symbol, last_bar, window, history_state(data), scaler_info
+
+    def _flush(self, pending, horizon, model_version, summary):
+        """Run one batched rollout and write each symbol's forecast"""
+        symbols, last_bars, windows, states, scalers = zip(*pending)
+        summary['batches'] += 1
+        try:
+            prices = self.predictor._forecast_batch(list(windows), list(states), list(scalers), horizon)
+        except Exception as e:
+            print(f"Batch prediction error: {e}")
+            for symbol in symbols:
+                summary['errors'][symbol] = str(e)
+            return
+
+        for symbol, last_bar, row in zip(symbols, last_bars, prices):
+            try:
+                self.store.write(symbol, last_bar, model_version, row)
+                summary['written'] += 1
+            except Exception as e:
+                summary['errors'][symbol] = str(e)
+
+
+def load_symbols(path):
+    """Symbols from a text or CSV file: first column, one per line, '#' comments
+
+    Bare IDX codes (BBCA) get the '.JK' suffix; index symbols (^JKSE) and
+    already-suffixed codes are kept as they are.
+    """
+    symbols = []
+    for line in Path(path).read_text().splitlines():
+        code = line.split('#', 1)[0].split(',', 1)[0].strip().upper()
+        if not code or code in ('SYMBOL', 'CODE', 'TICKER'):
+            continue
+        if '.' not in code and not code.startswith('^'):
+            code += '.JK'
+        symbols.append(code)
+    return list(dict.fromkeys(symbols))
+
+
+if __name__ == '__main__':
+    # python -m src.batch_forecast [SYMBOL ...] [--symbols-file FILE]: nightly universe forecast
+    import argparse
+    from config import INDONESIAN_STOCKS
+    from .predictor import StockPredictor
+
+    parser = argparse.ArgumentParser(description="Forecast a symbol universe into partitioned Parquet")
+    parser.add_argument('symbols', nargs='*')
+    parser.add_argument('--symbols-file', default=BATCH_FORECAST_SETTINGS['symbols_file'])
+    parser.add_argument('--output-dir', default=BATCH_FORECAST_SETTINGS['output_dir'])
+    parser.add_argument('--days', type=int, default=APP_SETTINGS['max_prediction_days'])
+    parser.add_argument('--period', default=BATCH_FORECAST_SETTINGS['period'])
+    parser.add_argument('--batch-size', type=int, default=BATCH_FORECAST_SETTINGS['batch_size'])
+    parser.add_argument('--workers', type=int, default=BATCH_FORECAST_SETTINGS['loader_workers'])
+    parser.add_argument('--force', action='store_true', help="recompute forecasts already in the store")
+    args = parser.parse_args()
+    if not args.output_dir:
+        parser.error("give --output-dir or set FORECAST_STORE_DIR")
+
+    symbols = list(args.symbols)
+    if args.symbols_file:
+        symbols += load_symbols(args.symbols_file)
+    symbols = list(dict.fromkeys(symbols or INDONESIAN_STOCKS.values()))
+
+    predictor = StockPredictor()
+    if not predictor.initialize():
+        raise SystemExit("Model files not available")
+
+    forecaster = BatchForecaster(predictor, ForecastStore(args.output_dir), args.batch_size, args.workers)
+    summary = forecaster.run(symbols, days_ahead=args.days, period=args.period, force=args.force)
+
+    print(f"{summary['written']} written, {summary['skipped']} up to date, "
+          f"{len(summary['errors'])} failed in {summary['batches']} batches, {summary['seconds']:.1f}s")
+    for symbol, error in sorted(summary['errors'].items()):
+        print(f"  {symbol}: {error}")
+    if summary['errors'] and not summary['written']:
+        raise SystemExit(1)
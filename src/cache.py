@@ -0,0 +1,184 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+from .compact import read_feather, write_feather
+from config import CACHE_SETTINGS
+
+
+class MarketDataCache:
+    """LRU cache of price history keyed on (symbol, period, interval)
+
+    Entries expire with the IDX trading session: while the market is open
+    they live for `session_ttl_seconds`, and anything written after the
+    close stays valid until the next session opens. Eviction is by total
+    DataFrame memory. With a cache_dir, entries are also written to disk so
+    a restarted worker can reload them instead of refetching.
+    """
+
+    def __init__(self, max_bytes=None, session_ttl_seconds=None, cache_dir=None, file_format=None):
+        self.max_bytes = max_bytes or CACHE_SETTINGS['max_bytes']
+        self.session_ttl = session_ttl_seconds or CACHE_SETTINGS['session_ttl_seconds']
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.file_format = file_format or CACHE_SETTINGS['file_format']
+
+        self.timezone = ZoneInfo(CACHE_SETTINGS['timezone'])
+        self.session_open = datetime.strptime(CACHE_SETTINGS['session_open'], '%H:%M').time()
+        self.session_close = datetime.strptime(CACHE_SETTINGS['session_close'], '%H:%M').time()
+
+        self._entries = OrderedDict()  # key -> (data, written_at, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'disk_hits': 0}
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_settings(cls):
+        """Build a cache from CACHE_SETTINGS"""
+        return cls(cache_dir=CACHE_SETTINGS['cache_dir'])
+
+    # Session-aware freshness
+
+    def is_session_open(self, now=None):
+        """True while the IDX regular session is trading"""
+        now = self._now(now)
+        return now.weekday() < 5 and self.session_open <= now.time() < self.session_close
+
+    def _last_close(self, now):
+        """Most recent session close at or before now"""
+        day = now.date()
+        if now.weekday() < 5 and now.time() >= self.session_close:
+            return datetime.combine(day, self.session_close, self.timezone)
+
+        day -= timedelta(days=1)
+        while day.weekday() >= 5:
+            day -= timedelta(days=1)
+        return datetime.combine(day, self.session_close, self.timezone)
+
+    def is_fresh(self, written_at, now=None):
+        """Whether an entry written at `written_at` (epoch seconds) is still valid"""
+        now = self._now(now)
+        if self.is_session_open(now):
+            return now.timestamp() - written_at < self.session_ttl
+        # Outside the session, data written after the last close is final
+        return written_at >= self._last_close(now).timestamp()
+
+    def _now(self, now):
+        if now is None:
+            return datetime.now(self.timezone)
+        return now.astimezone(self.timezone)
+
+    # Lookup and storage
+
+    def get(self, key):
+        """Return cached data for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                data, written_at, _ = entry
+                if self.is_fresh(written_at):
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return data
+                self._remove(key)
+                self.stats['expirations'] += 1
+
+        data, written_at = self._read_disk(key)
+        if data is not None and self.is_fresh(written_at):
+            with self._lock:
+                self._insert(key, data, written_at)
+                self.stats['disk_hits'] += 1
+                self.stats['hits'] += 1
+            return data
+
+        with self._lock:
+            self.stats['misses'] += 1
+        return None
+
+    def put(self, key, data, written_at=None):
+        """Store data for key in memory and, if configured, on disk
+
+        written_at defaults to now; pass the original time when adopting data
+        fetched elsewhere so it expires on the same schedule.
+        """
+        written_at = written_at or time.time()
+        with self._lock:
+            self._insert(key, data, written_at)
+        self._write_disk(key, data)
+
+    def clear(self):
+        """Drop all in-memory entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def info(self):
+        """Counters plus current size, for monitoring"""
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries), bytes=self._bytes)
+
+    def _insert(self, key, data, written_at):
+        if key in self._entries:
+            self._remove(key)
+
+        nbytes = int(data.memory_usage(deep=True).sum())
+        self._entries[key] = (data, written_at, nbytes)
+        self._bytes += nbytes
+
+        # Evict least recently used entries, but always keep the newest one
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats['evictions'] += 1
+
+    def _remove(self, key):
+        _, _, nbytes = self._entries.pop(key)
+        self._bytes -= nbytes
+
+    # Persistent backend
+
+    def _path(self, key):
+        name = '_'.join(re.sub(r'[^A-Za-z0-9.]', '_', str(part)) for part in key)
+        return self.cache_dir / f"{name}.{self.file_format}"
+
+    def _read_disk(self, key):
+        if not self.cache_dir:
+            return None, None
+
+        path = self._path(key)
+        if not path.exists():
+            return None, None
+
+        try:
+            if self.file_format == 'feather':
+                return read_feather(path), path.stat().st_mtime
+            frame = pd.read_parquet(path)
+            data = frame.set_index(frame.columns[0])
+            data.index.name = None if data.index.name == 'index' else data.index.name
+            return data, path.stat().st_mtime
+        except Exception as e:
+            print(f"Error reading cache file {path}: {e}")
+            return None, None
+
+    def _write_disk(self, key, data):
+        if not self.cache_dir:
+            return
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        try:
+            if self.file_format == 'feather':
+                write_feather(data, tmp_path)
+            else:
+                # Stored as a column so Parquet round-trips any index type
+                data.reset_index().to_parquet(tmp_path, index=False)
+            tmp_path.replace(path)
+        except Exception as e:
+            print(f"Error writing cache file {path}: {e}")
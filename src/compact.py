@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+HISTORY_COLUMNS = PRICE_COLUMNS + ['Volume']
+DAY = np.timedelta64(1, 'D')
+
+
+def compact_frame(data):
+    """OHLCV history at half the memory: float32 prices, int64 volume, nothing else
+
+    IDX prices are whole rupiah ticks, which float32 holds exactly up to
+    16.7 million; back-adjusted prices keep about seven significant digits,
+    far below the model's scaler resolution. Dividends, Stock Splits and any
+    other columns are dropped. Frames already in this layout are returned
+    as they are.
+    """
+    if data is None or data.empty:
+        return data
+    if list(data.columns) == HISTORY_COLUMNS and is_compact(data):
+        return data
+
+    columns = {column: data[column].to_numpy(dtype=np.float32) for column in PRICE_COLUMNS}
+    volume = data['Volume'].fillna(0).round()
+    columns['Volume'] = volume.to_numpy(dtype=np.int64)
+    return pd.DataFrame(columns, index=data.index)
+
+
+def is_compact(data):
+    """Whether a frame already uses the compact dtypes"""
+    dtypes = data.dtypes
+    return all(dtypes[column] == np.float32 for column in PRICE_COLUMNS) and dtypes['Volume'] == np.int64
+
+
+def day_numbers(index):
+    """int32 days since 1970-01-01 of each bar's local calendar date"""
+    local = index.tz_localize(None) if getattr(index, 'tz', None) is not None else index
+    return ((local.values.astype('datetime64[D]') - np.datetime64('1970-01-01', 'D')) // DAY).astype(np.int32)
+
+
+def from_day_numbers(days, tz=None):
+    """DatetimeIndex at local midnight for int32 day numbers"""
+    index = pd.DatetimeIndex(np.asarray(days, dtype='int64').astype('datetime64[D]').astype('datetime64[ns]'))
+    return index.tz_localize(tz) if tz else index
+
+
+def to_table(data):
+    """Arrow table of a history frame
+
+    Daily bars (every timestamp at local midnight) store their dates as
+    int32 day numbers with the timezone in the schema metadata; anything
+    else keeps the full timestamp column.
+    """
+    index = data.index
+    tz = str(index.tz) if getattr(index, 'tz', None) is not None else ''
+    local = index.tz_localize(None) if tz else index
+
+    if isinstance(index, pd.DatetimeIndex) and (local == local.normalize()).all():
+        arrays = {'day': pa.array(day_numbers(index))}
+        layout = 'day'
+    else:
+        arrays = {'timestamp': pa.array(local.values)}
+        layout = 'timestamp'
+
+    for column in data.columns:
+        arrays[column] = pa.array(data[column].to_numpy())
+    table = pa.table(arrays)
+    return table.replace_schema_metadata({'index': layout, 'tz': tz, 'index_name': index.name or ''})
+
+
+def from_table(table):
+    """History frame from a table written by to_table
+
+    Numeric columns are converted without copying where Arrow allows it,
+    so a memory-mapped file is read in place.
+    """
+    metadata = {key.decode(): value.decode() for key, value in (table.schema.metadata or {}).items()}
+    layout = metadata.get('index')
+    if layout not in ('day', 'timestamp'):
+        # Plain Feather written by DataFrame.to_feather, index stored as the first column
+        frame = table.to_pandas()
+        data = frame.set_index(frame.columns[0])
+        data.index.name = None if data.index.name == 'index' else data.index.name
+        return data
+
+    tz = metadata.get('tz') or None
+    if layout == 'day':
+        index = from_day_numbers(table.column('day').to_numpy(), tz)
+    else:
+        index = pd.DatetimeIndex(table.column('timestamp').to_numpy())
+        index = index.tz_localize(tz) if tz else index
+    index.name = metadata.get('index_name') or None
+
+    columns = {
+        name: table.column(name).to_numpy(zero_copy_only=False)
+        for name in table.column_names if name != layout
+    }
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+def write_feather(data, target):
+    """Write a history frame as uncompressed Feather v2 (a path or a file-like object)
+
+    Uncompressed so a memory-mapped read needs no decode step.
+    """
+    feather.write_feather(to_table(data), target, compression='uncompressed')
+
+
+def read_feather(source, memory_map=True):
+    """Read a frame written by write_feather, memory-mapping files by default"""
+    if isinstance(source, (str, bytes)) or hasattr(source, '__fspath__'):
+        return from_table(feather.read_table(source, memory_map=memory_map))
+    return from_table(feather.read_table(source))
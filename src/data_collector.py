@@ -1,32 +1,264 @@
-import yfinance as yf
+import random
+import threading
+import time
 import pandas as pd
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from .cache import MarketDataCache
+from .compact import compact_frame
+from .fetchers import RateLimiter, YahooFetcher, period_to_offset
+from .instrumentation import timed
+from .shared_store import SQLiteMarketStore
+from config import CACHE_SETTINGS, PREFETCH_SETTINGS
+
+# Columns that change on the overlapping bar only when history was re-adjusted
+ADJUSTMENT_COLUMNS = ['Open']
+CORPORATE_ACTION_COLUMNS = ['Dividends', 'Stock Splits']
+# Most recent refreshes kept for monitoring
+REFRESH_LOG_SIZE = 1000
 
 class DataCollector:
-    def __init__(self):
-        self.cache = {}
+    _shared = None
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, cache=None, fetcher=None, incremental=False, shared_store=None, compact=None):
+        self.cache = cache if cache is not None else MarketDataCache.from_settings()
+        self.fetcher = fetcher if fetcher is not None else YahooFetcher()
+        self.incremental = incremental
+        self.shared_store = shared_store
+        self.compact = CACHE_SETTINGS['compact_history'] if compact is None else compact
+        self.history = {}
+        self.refresh_log = deque(maxlen=REFRESH_LOG_SIZE)
+        self.rate_limiter = RateLimiter(
+            PREFETCH_SETTINGS['requests_per_second'],
+            PREFETCH_SETTINGS['burst']
+        )
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+    
+    @classmethod
+    def shared(cls):
+        """The process-wide collector every component and session should use
+        
+        Frames are handed out without copies, so callers must not modify
+        them in place; the app enables pandas copy-on-write at start-up
+        (DATA_SERVICE_SETTINGS['copy_on_write']) to make that safe. Replicas
+        on one host also share fetches through the SQLite store when
+        DATA_SERVICE_SETTINGS['shared_store'] is set.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(shared_store=SQLiteMarketStore.from_settings())
+            return cls._shared
     
-    def get_stock_data(self, symbol, period='2y'):
+    @timed('get_stock_data')
+    def get_stock_data(self, symbol, period='2y', interval='1d'):
         """Fetch stock data from Yahoo Finance"""
         try:
-            if symbol in self.cache:
-                return self.cache[symbol]
-            
-            stock = yf.Ticker(symbol)
-            data = stock.history(period=period)
-            
-            if not data.empty:
-                self.cache[symbol] = data
-                return data
-            return None
+            data, _ = self._load((symbol, period, interval))
+            return data
             
         except Exception as e:
             print(f"Error fetching {symbol}: {e}")
             return None
     
+    def prefetch(self, symbols, period='2y', interval='1d', max_workers=None):
+        """Warm the cache for several symbols concurrently
+        
+        Returns {symbol: {'status', 'seconds', 'attempts', 'bars', 'error'}}, where
+        status is 'ok', 'cached', 'coalesced' (shared another caller's fetch),
+        'shared' (fetched by another process), 'empty' or 'error'.
+        """
+        def task(symbol):
+            start = time.perf_counter()
+            try:
+                data, info = self._load((symbol, period, interval))
+                status = info['status'] if data is not None else 'empty'
+                return symbol, {
+                    'status': status,
+                    'seconds': time.perf_counter() - start,
+                    'attempts': info['attempts'],
+                    'bars': len(data) if data is not None else 0,
+                    'error': None
+                }
+            except Exception as e:
+                return symbol, {
+                    'status': 'error',
+                    'seconds': time.perf_counter() - start,
+                    'attempts': PREFETCH_SETTINGS['max_retries'] + 1,
+                    'bars': 0,
+                    'error': str(e)
+                }
+        
+        max_workers = max_workers or PREFETCH_SETTINGS['max_workers']
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch') as pool:
+            return dict(pool.map(task, symbols))
+    
+    def _load(self, key):
+        """Return (data, info) for key, sharing one in-flight fetch between callers"""
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached, {'status': 'cached', 'attempts': 0}
+        
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        
+        if not leader:
+            data, info = future.result()
+            return data, dict(info, status='coalesced')
+        
+        try:
+            result = self._fetch_shared(key)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
+    def _fetch_shared(self, key):
+        """Fetch through the cross-process store: one process fetches, the others adopt its result"""
+        if self.shared_store is None:
+            return self._fetch_with_retry(key)
+        
+        while True:
+            data, written_at = self.shared_store.get(key)
+            if data is not None and self.cache.is_fresh(written_at):
+                self.cache.put(key, data, written_at)
+                return data, {'status': 'shared', 'attempts': 0}
+            
+            if self.shared_store.try_lease(key):
+                try:
+                    result = self._fetch_with_retry(key)
+                    if result[0] is not None:
+                        self.shared_store.put(key, result[0])
+                    return result
+                finally:
+                    self.shared_store.release(key)
+            
+            # Another process is fetching; re-check the store once it finishes (or its lease lapses)
+            self.shared_store.wait(key)
+    
+    @timed('fetch_from_source')
+    def _fetch_with_retry(self, key):
+        """Fetch from the source under the rate limit, retrying with jittered backoff"""
+        symbol, period, interval = key
+        host = getattr(self.fetcher, 'host', 'default')
+        attempts = 0
+        
+        while True:
+            attempts += 1
+            self.rate_limiter.acquire(host)
+            try:
+                if self.incremental:
+                    data = self._slice_period(self.refresh(symbol, period, interval), period)
+                else:
+                    data = self.fetcher.fetch(symbol, period=period, interval=interval)
+                break
+            except Exception:
+                if attempts > PREFETCH_SETTINGS['max_retries']:
+                    raise
+                # Full jitter: uniform over an exponentially growing window
+                backoff = PREFETCH_SETTINGS['backoff_seconds'] * 2 ** (attempts - 1)
+                time.sleep(random.uniform(0, backoff))
+        
+        if data is None or data.empty:
+            return None, {'status': 'empty', 'attempts': attempts}
+        
+        if self.compact:
+            data = compact_frame(data)
+        self.cache.put(key, data)
+        return data, {'status': 'ok', 'attempts': attempts}
+    
+    def fetch_latest(self, symbol, period='1d', interval='1m'):
+        """Fetch from the source now, skipping cached copies, for pollers
+        
+        Goes through the same rate limit and retries as every other fetch,
+        and the result replaces the cached entry for the key.
+        """
+        data, _ = self._fetch_with_retry((symbol, period, interval))
+        return data
+    
     def get_latest_price(self, symbol):
         """Get latest price for a stock"""
         data = self.get_stock_data(symbol, period='1d')
         if data is not None and not data.empty:
             return data['Close'].iloc[-1]
         return None
+    
+    def refresh(self, symbol, period='2y', interval='1d'):
+        """Bring stored history up to date, fetching only bars after the last stored one
+        
+        The last stored bar is requested again and replaced, which picks up
+        intraday revisions. If the overlap shows that history was re-adjusted
+        (a split or dividend), the full period is downloaded again. Each
+        period keeps its own history, so a short request never stands in
+        for a longer one.
+        """
+        start_time = time.perf_counter()
+        key = (symbol, period, interval)
+        stored = self.history.get(key)
+        mode = 'incremental'
+        
+        if stored is None or stored.empty:
+            mode = 'full'
+            fetched = self.fetcher.fetch(symbol, period=period, interval=interval)
+            merged = fetched
+        else:
+            fetched = self.fetcher.fetch(symbol, start=stored.index[-1], interval=interval)
+            if self._needs_backfill(stored, fetched):
+                mode = 'backfill'
+                fetched = self.fetcher.fetch(symbol, period=period, interval=interval)
+                merged = fetched
+            elif fetched.empty:
+                merged = stored
+            else:
+                merged = pd.concat([stored[stored.index < fetched.index[0]], fetched])
+        
+        if merged is not None and not merged.empty:
+            self.history[key] = merged
+        
+        self.refresh_log.append({
+            'symbol': symbol,
+            'mode': mode,
+            'bars': len(fetched),
+            'bytes': int(fetched.memory_usage(deep=True).sum()) if fetched is not None else 0,
+            'seconds': time.perf_counter() - start_time
+        })
+        return self.history.get(key)
+    
+    def _needs_backfill(self, stored, fetched):
+        """Whether newly fetched bars imply the stored history was re-adjusted"""
+        if fetched.empty:
+            return False
+        
+        # A corporate action on a new bar back-adjusts every earlier price
+        new_bars = fetched[fetched.index > stored.index[-1]]
+        for column in CORPORATE_ACTION_COLUMNS:
+            if column in new_bars and (new_bars[column].fillna(0) != 0).any():
+                return True
+        
+        # The open of a finished bar only moves if prices were re-adjusted
+        overlap = fetched.index.intersection(stored.index)
+        for column in ADJUSTMENT_COLUMNS:
+            if column in fetched and len(overlap):
+                before = stored.loc[overlap, column]
+                after = fetched.loc[overlap, column]
+                if not ((before - after).abs() <= 1e-6 * before.abs().clip(lower=1)).all():
+                    return True
+        return False
+    
+    def _slice_period(self, data, period):
+        """Trim stored history to the requested period"""
+        if data is None or data.empty:
+            return data
+        offset = period_to_offset(period)
+        if offset is None:
+            return data
+        return data[data.index > data.index[-1] - offset]
@@ -0,0 +1,178 @@
+import fcntl
+import hashlib
+import json
+import re
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+# Stored rows re-checked against fresh data on every update
+VERIFY_ROWS = 20
+
+
+class FeatureStore:
+    """Scaled model inputs per symbol, persisted as memory-mapped float32 matrices
+
+    Each symbol has three files under the store directory:
+    `<symbol>.f32` (row-major float32, n_features per row), `<symbol>.dates`
+    (int64 nanosecond timestamps, one per row) and `<symbol>.json` (feature
+    count and a hash of the scaler that produced the rows). The dates file is
+    authoritative for the row count and is written last, so readers in other
+    processes never see a row whose features are not on disk yet.
+    """
+
+    def __init__(self, directory, n_features):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.n_features = n_features
+        self._maps = {}  # symbol -> (size_bytes, memmap, inode)
+
+    def update(self, symbol, features, feature_scaler):
+        """Scale and append rows of `features` newer than the stored ones
+
+        The last stored row is rescaled too, so intraday revisions are picked
+        up. The rows before it are compared with the fresh data: if a split
+        or dividend back-adjusted the history they no longer match, and the
+        symbol is rebuilt, as it is for a changed scaler or column count.
+        Returns the number of rows written.
+        """
+        scaler_hash = self._scaler_hash(feature_scaler)
+        dates = features.index.asi8 if hasattr(features.index, 'asi8') else np.asarray(features.index, dtype='int64')
+
+        with self._locked(symbol):
+            meta = self._read_meta(symbol)
+            stored_dates = self._read_dates(symbol)
+
+            if meta != {'n_features': self.n_features, 'scaler_hash': scaler_hash} or not len(stored_dates):
+                return self._rebuild(symbol, features, dates, feature_scaler, scaler_hash)
+
+            keep = int(np.searchsorted(stored_dates, stored_dates[-1]))
+            if not self._tail_matches(symbol, stored_dates, keep, features, dates, feature_scaler):
+                return self._rebuild(symbol, features, dates, feature_scaler, scaler_hash)
+
+            new_rows = dates >= stored_dates[-1]
+            if not new_rows.any():
+                return 0
+
+            scaled = feature_scaler.transform(features.values[new_rows]).astype(np.float32)
+            previous = self.window(symbol, 1, rows=keep)
+            self._forward_fill(scaled, previous[0] if len(previous) else None)
+
+            row_bytes = self.n_features * 4
+            with open(self._path(symbol, 'f32'), 'r+b') as f:
+                f.seek(keep * row_bytes)
+                f.write(scaled.tobytes())
+            with open(self._path(symbol, 'dates'), 'r+b') as f:
+                f.seek(keep * 8)
+                f.write(dates[new_rows].astype(np.int64).tobytes())
+
+            return len(scaled)
+
+    def window(self, symbol, length, rows=None):
+        """Zero-copy view of the last `length` stored rows (or of the first `rows`)"""
+        data = self._map(symbol)
+        if data is None:
+            return np.empty((0, self.n_features), dtype=np.float32)
+
+        if rows is None:
+            rows = self._path(symbol, 'dates').stat().st_size // 8
+        n_rows = min(rows, len(data))
+        return data[max(n_rows - length, 0):n_rows]
+
+    def dates(self, symbol):
+        """Stored row timestamps as int64 nanoseconds"""
+        return self._read_dates(symbol)
+
+    def _rebuild(self, symbol, features, dates, feature_scaler, scaler_hash):
+        # Same fill as the in-memory path: backfill then forward fill
+        filled = features.bfill().ffill()
+        scaled = feature_scaler.transform(filled.values).astype(np.float32)
+
+        # Replace files atomically so mapped readers keep their old inode
+        for suffix, payload in (('f32', scaled), ('dates', np.asarray(dates, dtype=np.int64))):
+            tmp_path = self._path(symbol, suffix + '.tmp')
+            payload.tofile(tmp_path)
+            tmp_path.replace(self._path(symbol, suffix))
+
+        self._path(symbol, 'json').write_text(
+            json.dumps({'n_features': self.n_features, 'scaler_hash': scaler_hash})
+        )
+        self._maps.pop(symbol, None)
+        return len(scaled)
+
+    def _tail_matches(self, symbol, stored_dates, keep, features, dates, feature_scaler):
+        """Whether the last finished stored rows still equal the fresh data scaled"""
+        start = max(keep - VERIFY_ROWS, 0)
+        tail_dates = stored_dates[start:keep]
+        if not len(tail_dates):
+            return True
+
+        positions = np.searchsorted(dates, tail_dates)
+        found = positions < len(dates)
+        found[found] = dates[positions[found]] == tail_dates[found]
+        if not found.all():
+            # Stored bars missing from the fresh frame: history was revised
+            return False
+
+        fresh = feature_scaler.transform(features.values[positions]).astype(np.float32)
+        stored = self.window(symbol, keep - start, rows=keep)
+        # Stored rows carry filled values where the fresh ones are still NaN
+        known = ~np.isnan(fresh)
+        return np.allclose(stored[known], fresh[known], rtol=1e-5, atol=1e-6)
+
+    def _forward_fill(self, scaled, previous):
+        """Fill NaNs from the row above; scaling is affine, so this matches ffill before scaling"""
+        for i in range(len(scaled)):
+            missing = np.isnan(scaled[i])
+            if missing.any():
+                source = scaled[i - 1] if i else previous
+                if source is not None:
+                    scaled[i, missing] = source[missing]
+
+    def _map(self, symbol):
+        path = self._path(symbol, 'f32')
+        if not path.exists():
+            return None
+
+        stat = path.stat()
+        if not stat.st_size:
+            return None
+        cached = self._maps.get(symbol)
+        if cached is None or cached[0] != stat.st_size or cached[2] != stat.st_ino:
+            data = np.memmap(path, dtype=np.float32, mode='r').reshape(-1, self.n_features)
+            cached = (stat.st_size, data, stat.st_ino)
+            self._maps[symbol] = cached
+        return cached[1]
+
+    def _read_dates(self, symbol):
+        path = self._path(symbol, 'dates')
+        if not path.exists():
+            return np.empty(0, dtype=np.int64)
+        return np.fromfile(path, dtype=np.int64)
+
+    def _read_meta(self, symbol):
+        path = self._path(symbol, 'json')
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def _scaler_hash(self, feature_scaler):
+        digest = hashlib.sha1()
+        for attribute in ('scale_', 'min_'):
+            digest.update(np.ascontiguousarray(getattr(feature_scaler, attribute), dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+    def _path(self, symbol, suffix):
+        name = re.sub(r'[^A-Za-z0-9.]', '_', symbol)
+        return self.directory / f"{name}.{suffix}"
+
+    @contextmanager
+    def _locked(self, symbol):
+        """Serialize writers across processes sharing the directory"""
+        with open(self._path(symbol, 'lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
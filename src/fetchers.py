@@ -0,0 +1,125 @@
+import re
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import yfinance as yf
+
+
+def period_to_offset(period):
+    """Convert a Yahoo-style period ('5d', '6mo', '2y', 'max') to a DateOffset"""
+    if period is None or period in ('max', 'ytd'):
+        return None
+
+    match = re.fullmatch(r'(\d+)(d|wk|mo|y)', period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == 'd':
+        return pd.DateOffset(days=count)
+    if unit == 'wk':
+        return pd.DateOffset(weeks=count)
+    if unit == 'mo':
+        return pd.DateOffset(months=count)
+    return pd.DateOffset(years=count)
+
+
+class RateLimiter:
+    """Token bucket per host, shared by every thread using the same fetcher"""
+
+    def __init__(self, requests_per_second, burst):
+        self.rate = requests_per_second
+        self.burst = burst
+        self._buckets = {}  # host -> (tokens, last_update)
+        self._lock = threading.Lock()
+
+    def acquire(self, host):
+        """Block until a request to host is allowed"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, updated = self._buckets.get(host, (self.burst, now))
+                tokens = min(self.burst, tokens + (now - updated) * self.rate)
+                if tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                wait = (1 - tokens) / self.rate
+            time.sleep(wait)
+
+
+class YahooFetcher:
+    """Fetch OHLCV history from Yahoo Finance"""
+
+    host = 'query1.finance.yahoo.com'
+
+    def fetch(self, symbol, period=None, start=None, interval='1d'):
+        """Return bars for a period, or all bars from `start` onwards"""
+        stock = yf.Ticker(symbol)
+        if start is not None:
+            return stock.history(start=start, interval=interval)
+        return stock.history(period=period, interval=interval)
+
+
+class LocalFetcher:
+    """Serve OHLCV history from in-memory frames or <directory>/<symbol>.csv fixtures
+
+    Stands in for Yahoo in tests and benchmarks. `latency` and
+    `latency_per_bar` (seconds) simulate network round trip and transfer cost;
+    `failures` maps a symbol to how many calls should fail before succeeding.
+    """
+
+    host = 'local'
+
+    def __init__(self, directory=None, frames=None, latency=0.0, latency_per_bar=0.0, failures=None):
+        self.directory = Path(directory) if directory else None
+        self.frames = dict(frames or {})
+        self.latency = latency
+        self.latency_per_bar = latency_per_bar
+        self.failures = dict(failures or {})
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def fetch(self, symbol, period=None, start=None, interval='1d'):
+        """Return bars for a period, or all bars from `start` onwards"""
+        with self._lock:
+            self.calls += 1
+            failing = self.failures.get(symbol, 0) > 0
+            if failing:
+                self.failures[symbol] -= 1
+
+        if failing:
+            time.sleep(self.latency)
+            raise ConnectionError(f"Simulated fetch failure for {symbol}")
+
+        data = self._load(symbol)
+        if data is None or data.empty:
+            return pd.DataFrame()
+
+        if start is not None:
+            data = data[data.index >= start]
+        else:
+            offset = period_to_offset(period)
+            if offset is not None:
+                data = data[data.index > data.index[-1] - offset]
+
+        delay = self.latency + self.latency_per_bar * len(data)
+        if delay:
+            time.sleep(delay)
+        return data.copy()
+
+    def _load(self, symbol):
+        if symbol in self.frames:
+            return self.frames[symbol]
+        if self.directory is None:
+            return None
+
+        path = self.directory / f"{symbol}.csv"
+        if not path.exists():
+            return None
+
+        data = pd.read_csv(path, index_col=0, parse_dates=True)
+        self.frames[symbol] = data
+        return data
@@ -0,0 +1,68 @@
+import threading
+from collections import OrderedDict
+
+from config import FORECAST_CACHE_SETTINGS
+
+
+class ForecastCache:
+    """Point forecasts keyed on (symbol, last input bar, model version)
+
+    Each entry holds the longest horizon computed so far, and shorter
+    requests are served as a prefix of it. Because the key includes the last
+    bar's timestamp and the model/scaler content hash, a new bar or a changed
+    model file simply stops matching; storing the new key drops the stale
+    entries for that symbol.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or FORECAST_CACHE_SETTINGS['max_entries']
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'prefix_hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def get(self, symbol, last_bar, model_version, days_ahead):
+        """Return the first days_ahead predictions, or None on a miss"""
+        key = (symbol, last_bar, model_version)
+        with self._lock:
+            predictions = self._entries.get(key)
+            if predictions is None or len(predictions) < days_ahead:
+                self.stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            if len(predictions) > days_ahead:
+                self.stats['prefix_hits'] += 1
+            return predictions[:days_ahead]
+
+    def put(self, symbol, last_bar, model_version, predictions):
+        """Store a rollout, keeping whichever horizon is longer"""
+        key = (symbol, last_bar, model_version)
+        with self._lock:
+            stale = [k for k in self._entries if k[0] == symbol and k != key]
+            for k in stale:
+                del self._entries[k]
+            self.stats['invalidations'] += len(stale)
+
+            existing = self._entries.get(key)
+            if existing is None or len(predictions) > len(existing):
+                self._entries[key] = list(predictions)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def info(self):
+        """Counters, entry count and hit rate, for monitoring"""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return dict(
+                self.stats,
+                entries=len(self._entries),
+                hit_rate=self.stats['hits'] / lookups if lookups else 0.0
+            )
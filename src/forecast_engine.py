@@ -0,0 +1,26 @@
+import numpy as np
+import tensorflow as tf
+
+
+class ForecastEngine:
+    def __init__(self, model, sequence_length, n_features):
+        self.model = model
+        self.sequence_length = sequence_length
+        self.n_features = n_features
+
+        window_spec = tf.TensorSpec([None, sequence_length, n_features], tf.float32)
+        self._step = tf.function(self._forward, input_signature=[window_spec])
+
+    def _forward(self, windows):
+        """Single forward pass, traced once for any batch size"""
+        return self.model(windows, training=False)
+
+    def warmup(self):
+        """Trace the step graph so the first user request doesn't pay for it"""
+        dummy = np.zeros((1, self.sequence_length, self.n_features), dtype=np.float32)
+        self._step(dummy)
+
+    def predict_next(self, windows):
+        """Predict the next scaled value for a batch of windows"""
+        windows = np.asarray(windows, dtype=np.float32)
+        return self._step(windows).numpy()[:, 0]
@@ -0,0 +1,101 @@
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import BATCH_FORECAST_SETTINGS
+from .utils import clean_symbol
+
+
+class ForecastStore:
+    """Precomputed forecasts as Parquet, partitioned by origin date and symbol
+
+    Layout: `<directory>/date=YYYY-MM-DD/symbol=<SYMBOL>/forecast.parquet`,
+    one row per horizon step. Symbols are keyed without exchange suffix or
+    index caret (see clean_symbol), so BBCA.JK written by the batch job is
+    found by a lookup for BBCA and vice versa. The origin date is the day of the last input
+    bar, so the app looks up the bar it just loaded with a single file read,
+    and the whole directory reads back as one hive-partitioned dataset.
+    """
+
+    FILE_NAME = 'forecast.parquet'
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'writes': 0}
+
+    @classmethod
+    def from_settings(cls):
+        """Store at BATCH_FORECAST_SETTINGS['output_dir'], or None if unset"""
+        directory = BATCH_FORECAST_SETTINGS['output_dir']
+        return cls(directory) if directory else None
+
+    def write(self, symbol, last_bar, model_version, predictions, generated_at=None):
+        """Write one symbol's rollout, replacing any earlier run for the same origin"""
+        predictions = np.asarray(predictions, dtype=np.float64)
+        frame = pd.DataFrame({
+            'origin_date': [pd.Timestamp(last_bar)] * len(predictions),
+            'horizon': np.arange(1, len(predictions) + 1, dtype=np.int16),
+            'predicted_close': predictions,
+            'model_version': model_version,
+            'generated_at': generated_at or datetime.now(timezone.utc),
+        })
+
+        path = self._path(symbol, last_bar)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        frame.to_parquet(tmp_path, index=False)
+        tmp_path.replace(path)
+        with self._lock:
+            self.stats['writes'] += 1
+
+    def get(self, symbol, last_bar, model_version):
+        """Predicted closes for this origin bar and model version, or None"""
+        path = self._path(symbol, last_bar)
+        if not path.exists():
+            self._count('misses')
+            return None
+
+        try:
+            frame = pd.read_parquet(path, columns=['origin_date', 'predicted_close', 'model_version'])
+        except Exception as e:
+            print(f"Error reading stored forecast for {symbol}: {e}")
+            self._count('misses')
+            return None
+
+        # Same calendar day but a different bar (intraday data) or a newer model: recompute
+        if (frame.empty or frame['model_version'].iloc[0] != model_version
+                or pd.Timestamp(frame['origin_date'].iloc[0]) != pd.Timestamp(last_bar)):
+            self._count('stale')
+            return None
+
+        self._count('hits')
+        return frame['predicted_close'].tolist()
+
+    def read(self, date=None):
+        """Every stored forecast (or one origin date's) as a single DataFrame"""
+        path = self.directory if date is None else self.directory / f"date={pd.Timestamp(date):%Y-%m-%d}"
+        if not path.exists():
+            return pd.DataFrame()
+        return pd.read_parquet(path)
+
+    def dates(self):
+        """Origin dates present in the store, oldest first"""
+        if not self.directory.exists():
+            return []
+        return sorted(p.name.split('=', 1)[1] for p in self.directory.glob('date=*') if p.is_dir())
+
+    def info(self):
+        """Counters and partition count, for monitoring"""
+        with self._lock:
+            return dict(self.stats, dates=len(self.dates()))
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _path(self, symbol, last_bar):
+        return self.directory / f"date={pd.Timestamp(last_bar):%Y-%m-%d}" / f"symbol={clean_symbol(symbol)}" / self.FILE_NAME
@@ -0,0 +1,446 @@
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Same columns, in the same order, as utils.add_technical_indicators
+INDICATOR_COLUMNS = [
+    'MA_5', 'MA_10', 'MA_20', 'MA_50', 'EMA_12', 'EMA_26', 'MACD', 'MACD_signal',
+    'RSI', 'BB_middle', 'BB_upper', 'BB_lower', 'Volume_MA', 'Volume_ratio',
+    'Price_change', 'High_Low_ratio', 'Open_Close_ratio'
+]
+
+MA_WINDOWS = (5, 10, 20, 50)
+RSI_WINDOW = 14
+BB_WINDOW = 20
+VOLUME_WINDOW = 20
+EMA_SPANS = {'EMA_12': 12, 'EMA_26': 26, 'MACD_signal': 9}
+
+
+def _alpha(span):
+    return 2.0 / (span + 1.0)
+
+
+# Vectorized batch path
+
+def _rolling_mean(values, window):
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(values, window).mean(axis=1)
+    return out
+
+
+def _rolling_std(values, window):
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(values, window).std(axis=1, ddof=1)
+    return out
+
+
+def _ewm_mean(values, span, num=0.0, den=0.0):
+    """pandas ewm(span, adjust=True).mean() in closed form, one block at a time
+
+    Within a block num_t = decay**t * (decay * num_prev + cumsum(x_j * decay**-j)),
+    and den the same with x = 1. Blocks are sized so decay**-j cannot overflow.
+    Returns (means, num, den) so a streaming state can continue from the end.
+    """
+    decay = 1.0 - _alpha(span)
+    out = np.empty(len(values))
+    block = max(1, min(256, int(300 / -math.log(decay)))) if decay > 0 else 1
+
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        steps = np.arange(len(chunk))
+        grow = decay ** -steps
+        shrink = decay ** steps
+        chunk_num = shrink * (decay * num + np.cumsum(chunk * grow))
+        chunk_den = shrink * (decay * den + np.cumsum(grow))
+        out[start:start + len(chunk)] = chunk_num / chunk_den
+        num, den = chunk_num[-1], chunk_den[-1]
+
+    return out, num, den
+
+
+def compute_indicators(open_, high, low, close, volume):
+    """Vectorized NumPy version of add_technical_indicators
+
+    Takes 1-D float arrays and returns (columns, state): a dict of indicator
+    arrays keyed like INDICATOR_COLUMNS, and the IndicatorState positioned
+    after the last bar so streaming updates can continue from it.
+    """
+    open_, high, low, close, volume = (
+        np.asarray(a, dtype=np.float64) for a in (open_, high, low, close, volume)
+    )
+    columns = {}
+
+    for window in MA_WINDOWS:
+        columns[f'MA_{window}'] = _rolling_mean(close, window)
+
+    columns['EMA_12'], num_12, den_12 = _ewm_mean(close, EMA_SPANS['EMA_12'])
+    columns['EMA_26'], num_26, den_26 = _ewm_mean(close, EMA_SPANS['EMA_26'])
+    columns['MACD'] = columns['EMA_12'] - columns['EMA_26']
+    columns['MACD_signal'], num_9, den_9 = _ewm_mean(columns['MACD'], EMA_SPANS['MACD_signal'])
+
+    # NaN comparisons are False, so the first bar contributes 0 gain and 0 loss
+    delta = np.diff(close, prepend=np.nan)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = _rolling_mean(gain, RSI_WINDOW) / _rolling_mean(loss, RSI_WINDOW)
+        columns['RSI'] = 100 - (100 / (1 + rs))
+
+    columns['BB_middle'] = columns[f'MA_{BB_WINDOW}']
+    bb_std = _rolling_std(close, BB_WINDOW)
+    columns['BB_upper'] = columns['BB_middle'] + (bb_std * 2)
+    columns['BB_lower'] = columns['BB_middle'] - (bb_std * 2)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        columns['Volume_MA'] = _rolling_mean(volume, VOLUME_WINDOW)
+        columns['Volume_ratio'] = volume / columns['Volume_MA']
+        columns['Price_change'] = close / np.concatenate(([np.nan], close[:-1])) - 1
+        columns['High_Low_ratio'] = high / low
+        columns['Open_Close_ratio'] = open_ / close
+
+    state = IndicatorState()
+    state._seed(close, volume, gain, loss, (num_12, den_12), (num_26, den_26), (num_9, den_9))
+    return columns, state
+
+
+def indicator_frame(df):
+    """Drop-in for add_technical_indicators built on the NumPy batch path"""
+    columns, _ = compute_indicators(df['Open'], df['High'], df['Low'], df['Close'], df['Volume'])
+    return df.assign(**{name: columns[name] for name in INDICATOR_COLUMNS})
+
+
+# Streaming path
+
+class RollingWindow:
+    """Fixed-size window with O(1) mean and sample std
+
+    Running sums are recomputed from the buffer each time it wraps, which
+    keeps float drift bounded at amortized O(1) cost.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.buffer = np.zeros(size)
+        self.position = 0
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def push(self, value):
+        old = self.buffer[self.position]
+        self.buffer[self.position] = value
+        self.position = (self.position + 1) % self.size
+
+        if self.count < self.size:
+            self.count += 1
+            self.total += value
+            self.total_sq += value * value
+        elif self.position == 0:
+            self.total = float(self.buffer.sum())
+            self.total_sq = float(np.dot(self.buffer, self.buffer))
+        else:
+            self.total += value - old
+            self.total_sq += value * value - old * old
+
+    def mean(self):
+        if self.count < self.size:
+            return np.nan
+        return self.total / self.size
+
+    def std(self):
+        if self.count < self.size:
+            return np.nan
+        variance = (self.total_sq - self.total * self.total / self.size) / (self.size - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def load(self, values):
+        """Fill the window with the most recent values of an array"""
+        for value in values[-self.size:]:
+            self.push(float(value))
+
+
+class EwmMean:
+    """Streaming pandas ewm(span, adjust=True).mean()"""
+
+    def __init__(self, span, num=0.0, den=0.0):
+        self.decay = 1.0 - _alpha(span)
+        self.num = num
+        self.den = den
+
+    def push(self, value):
+        self.num = value + self.decay * self.num
+        self.den = 1.0 + self.decay * self.den
+        return self.num / self.den
+
+
+class IndicatorState:
+    """Rolling-window and EWM state for one symbol, updated in O(1) per bar"""
+
+    def __init__(self):
+        self.ma = {window: RollingWindow(window) for window in MA_WINDOWS}
+        self.gains = RollingWindow(RSI_WINDOW)
+        self.losses = RollingWindow(RSI_WINDOW)
+        self.volumes = RollingWindow(VOLUME_WINDOW)
+        self.ema_12 = EwmMean(EMA_SPANS['EMA_12'])
+        self.ema_26 = EwmMean(EMA_SPANS['EMA_26'])
+        self.macd_signal = EwmMean(EMA_SPANS['MACD_signal'])
+        self.prev_close = np.nan
+        self.bars = 0
+
+    def _seed(self, close, volume, gain, loss, ema_12, ema_26, macd_signal):
+        """Position the state after the last bar of a batch computation"""
+        for window in self.ma.values():
+            window.load(close)
+        self.gains.load(gain)
+        self.losses.load(loss)
+        self.volumes.load(volume)
+        self.ema_12.num, self.ema_12.den = ema_12
+        self.ema_26.num, self.ema_26.den = ema_26
+        self.macd_signal.num, self.macd_signal.den = macd_signal
+        self.prev_close = float(close[-1]) if len(close) else np.nan
+        self.bars = len(close)
+
+    def update(self, open_, high, low, close, volume):
+        """Add one bar and return its indicator values keyed like INDICATOR_COLUMNS"""
+        for window in self.ma.values():
+            window.push(close)
+        self.volumes.push(volume)
+
+        delta = close - self.prev_close if self.bars else np.nan
+        self.gains.push(delta if delta > 0 else 0.0)
+        self.losses.push(-delta if delta < 0 else 0.0)
+
+        row = {f'MA_{size}': window.mean() for size, window in self.ma.items()}
+
+        row['EMA_12'] = self.ema_12.push(close)
+        row['EMA_26'] = self.ema_26.push(close)
+        row['MACD'] = row['EMA_12'] - row['EMA_26']
+        row['MACD_signal'] = self.macd_signal.push(row['MACD'])
+
+        row['RSI'] = _rsi(self.gains.mean(), self.losses.mean())
+
+        bb_std = self.ma[BB_WINDOW].std()
+        row['BB_middle'] = row[f'MA_{BB_WINDOW}']
+        row['BB_upper'] = row['BB_middle'] + (bb_std * 2)
+        row['BB_lower'] = row['BB_middle'] - (bb_std * 2)
+
+        row['Volume_MA'] = self.volumes.mean()
+        row['Volume_ratio'] = _ratio(volume, row['Volume_MA'])
+        row['Price_change'] = _ratio(close, self.prev_close) - 1
+        row['High_Low_ratio'] = _ratio(high, low)
+        row['Open_Close_ratio'] = _ratio(open_, close)
+
+        self.prev_close = close
+        self.bars += 1
+        return row
+
+
+def _ratio(numerator, denominator):
+    """Division with NumPy semantics for zero and NaN denominators"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.float64(numerator) / np.float64(denominator))
+
+
+def _rsi(avg_gain, avg_loss):
+    rs = _ratio(avg_gain, avg_loss)
+    return 100 - (100 / (1 + rs))
+
+
+class BatchRollingWindow:
+    """RollingWindow for many series advanced in lockstep
+
+    Each row of `buffer` is one series' window in chronological order with
+    the oldest value at `position`. Series with fewer than `size` values
+    are zero-padded at the front; the padding is overwritten first, so the
+    running sums stay exact without per-series bookkeeping.
+    """
+
+    def __init__(self, values, counts, size):
+        self.size = size
+        self.buffer = np.array(values, dtype=np.float64)
+        self.counts = np.minimum(np.asarray(counts), size)
+        self.position = 0
+        self.total = self.buffer.sum(axis=1)
+        self.total_sq = np.einsum('ij,ij->i', self.buffer, self.buffer)
+
+    @classmethod
+    def from_series(cls, values, origins, size):
+        """Windows ending at each index in origins of a 1-D array"""
+        padded = np.concatenate((np.zeros(size - 1), np.nan_to_num(values)))
+        windows = sliding_window_view(padded, size)[origins]
+        return cls(windows, origins + 1, size)
+
+    @classmethod
+    def concat(cls, windows):
+        merged = cls.__new__(cls)
+        merged.size = windows[0].size
+        merged.buffer = np.concatenate([np.roll(w.buffer, -w.position, axis=1) for w in windows])
+        merged.counts = np.concatenate([w.counts for w in windows])
+        merged.position = 0
+        merged.total = np.concatenate([w.total for w in windows])
+        merged.total_sq = np.concatenate([w.total_sq for w in windows])
+        return merged
+
+    def push(self, values):
+        old = self.buffer[:, self.position].copy()
+        self.buffer[:, self.position] = values
+        self.position = (self.position + 1) % self.size
+        self.counts = np.minimum(self.counts + 1, self.size)
+
+        if self.position == 0:
+            self.total = self.buffer.sum(axis=1)
+            self.total_sq = np.einsum('ij,ij->i', self.buffer, self.buffer)
+        else:
+            self.total += values - old
+            self.total_sq += values * values - old * old
+
+    def mean(self):
+        return np.where(self.counts < self.size, np.nan, self.total / self.size)
+
+    def std(self):
+        variance = (self.total_sq - self.total * self.total / self.size) / (self.size - 1)
+        return np.where(self.counts < self.size, np.nan, np.sqrt(np.maximum(variance, 0.0)))
+
+
+class BatchIndicatorState:
+    """IndicatorState for a batch of series, one vectorized update per bar
+
+    Used by autoregressive rollouts, where every window in a batch gains one
+    predicted bar per step. from_history positions the state after any set
+    of bars of one history in a single pass, so walk-forward backtests seed
+    thousands of windows at once.
+    """
+
+    def __init__(self, ma, gains, losses, volumes, ewm, prev_close, bars):
+        self.ma = ma
+        self.gains = gains
+        self.losses = losses
+        self.volumes = volumes
+        self.ewm = ewm  # name -> [num, den] arrays
+        self.prev_close = prev_close
+        self.bars = bars
+
+    @classmethod
+    def from_history(cls, open_, high, low, close, volume, origins=None):
+        """State after bar origins[i] of one OHLCV history (default: after the last bar)"""
+        close = np.asarray(close, dtype=np.float64)
+        volume = np.asarray(volume, dtype=np.float64)
+        origins = np.array([len(close) - 1] if origins is None else origins, dtype=np.int64)
+        columns, _ = compute_indicators(open_, high, low, close, volume)
+
+        delta = np.diff(close, prepend=np.nan)
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = np.where(delta < 0, -delta, 0.0)
+
+        # den_t = sum(decay**k, k <= t) in closed form; num_t = mean_t * den_t
+        ewm = {}
+        for name, span in EMA_SPANS.items():
+            decay = 1.0 - _alpha(span)
+            den = (1.0 - decay ** (origins + 1)) / (1.0 - decay)
+            ewm[name] = [columns[name][origins] * den, den]
+
+        return cls(
+            ma={window: BatchRollingWindow.from_series(close, origins, window) for window in MA_WINDOWS},
+            gains=BatchRollingWindow.from_series(gain, origins, RSI_WINDOW),
+            losses=BatchRollingWindow.from_series(loss, origins, RSI_WINDOW),
+            volumes=BatchRollingWindow.from_series(volume, origins, VOLUME_WINDOW),
+            ewm=ewm,
+            prev_close=close[origins],
+            bars=origins + 1,
+        )
+
+    @classmethod
+    def concat(cls, states):
+        """One batch state from several (e.g. one per symbol)"""
+        return cls(
+            ma={window: BatchRollingWindow.concat([s.ma[window] for s in states]) for window in MA_WINDOWS},
+            gains=BatchRollingWindow.concat([s.gains for s in states]),
+            losses=BatchRollingWindow.concat([s.losses for s in states]),
+            volumes=BatchRollingWindow.concat([s.volumes for s in states]),
+            ewm={
+                name: [np.concatenate([s.ewm[name][i] for s in states]) for i in range(2)]
+                for name in EMA_SPANS
+            },
+            prev_close=np.concatenate([s.prev_close for s in states]),
+            bars=np.concatenate([s.bars for s in states]),
+        )
+
+    def __len__(self):
+        return len(self.prev_close)
+
+    def update(self, open_, high, low, close, volume):
+        """Add one bar per series and return indicator arrays keyed like INDICATOR_COLUMNS"""
+        for window in self.ma.values():
+            window.push(close)
+        self.volumes.push(volume)
+
+        delta = np.where(self.bars > 0, close - self.prev_close, 0.0)
+        self.gains.push(np.where(delta > 0, delta, 0.0))
+        self.losses.push(np.where(delta < 0, -delta, 0.0))
+
+        row = {f'MA_{size}': window.mean() for size, window in self.ma.items()}
+
+        row['EMA_12'] = self._push_ewm('EMA_12', close)
+        row['EMA_26'] = self._push_ewm('EMA_26', close)
+        row['MACD'] = row['EMA_12'] - row['EMA_26']
+        row['MACD_signal'] = self._push_ewm('MACD_signal', row['MACD'])
+
+        bb_std = self.ma[BB_WINDOW].std()
+        row['BB_middle'] = row[f'MA_{BB_WINDOW}']
+        row['BB_upper'] = row['BB_middle'] + (bb_std * 2)
+        row['BB_lower'] = row['BB_middle'] - (bb_std * 2)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = self.gains.mean() / self.losses.mean()
+            row['RSI'] = 100 - (100 / (1 + rs))
+            row['Volume_MA'] = self.volumes.mean()
+            row['Volume_ratio'] = volume / row['Volume_MA']
+            row['Price_change'] = close / self.prev_close - 1
+            row['High_Low_ratio'] = high / low
+            row['Open_Close_ratio'] = open_ / close
+
+        self.prev_close = np.array(close, dtype=np.float64)
+        self.bars = self.bars + 1
+        return row
+
+    def _push_ewm(self, name, values):
+        decay = 1.0 - _alpha(EMA_SPANS[name])
+        num, den = self.ewm[name]
+        num = values + decay * num
+        den = 1.0 + decay * den
+        self.ewm[name] = [num, den]
+        return num / den
+
+
+class IndicatorEngine:
+    """Holds an IndicatorState per symbol
+
+    warm_start runs the vectorized batch path over the available history;
+    update then extends a symbol by one bar in O(1).
+    """
+
+    def __init__(self):
+        self.states = {}
+
+    def warm_start(self, symbol, df):
+        """Compute indicators for a full history and keep the state for streaming"""
+        columns, state = compute_indicators(df['Open'], df['High'], df['Low'], df['Close'], df['Volume'])
+        self.states[symbol] = state
+        return df.assign(**{name: columns[name] for name in INDICATOR_COLUMNS})
+
+    def update(self, symbol, bar):
+        """Add one bar (mapping with Open/High/Low/Close/Volume) and return its indicators"""
+        state = self.states.get(symbol)
+        if state is None:
+            state = self.states[symbol] = IndicatorState()
+        return state.update(
+            float(bar['Open']), float(bar['High']), float(bar['Low']),
+            float(bar['Close']), float(bar['Volume'])
+        )
+
+    def reset(self, symbol):
+        """Forget a symbol's state"""
+        self.states.pop(symbol, None)
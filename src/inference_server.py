@@ -0,0 +1,262 @@
+import json
+import os
+import queue
+import socket
+import socketserver
+import stat
+import threading
+import time
+from concurrent.futures import Future
+
+from .instrumentation import metrics
+from config import INFERENCE_SERVER_SETTINGS
+
+
+class MicroBatcher:
+    """Coalesce concurrent forecast requests into one predict_many call
+
+    The first queued request opens a window of window_seconds; everything
+    that arrives before it closes (up to max_batch requests) goes into the
+    same batched rollout. Duplicate symbols in a batch are forecast once.
+    """
+
+    def __init__(self, predictor, window_seconds=None, max_batch=None):
+        self.predictor = predictor
+        if window_seconds is None:
+            window_seconds = INFERENCE_SERVER_SETTINGS['batch_window_ms'] / 1000
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch or INFERENCE_SERVER_SETTINGS['max_batch']
+        self.stats = {'requests': 0, 'batches': 0, 'largest_batch': 0}
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        threading.Thread(target=self._run, name='inference-batcher', daemon=True).start()
+
+    def submit(self, symbol, days_ahead):
+        """Queue one request; the Future resolves to its list of predicted prices"""
+        future = Future()
+        self._queue.put((symbol, days_ahead, future))
+        return future
+
+    def info(self):
+        """Request and batch counters, for monitoring"""
+        with self._lock:
+            batches = self.stats['batches']
+            return dict(self.stats, mean_batch=self.stats['requests'] / batches if batches else 0.0)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window_seconds
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, batch):
+        symbols = list(dict.fromkeys(symbol for symbol, _, _ in batch))
+        days_ahead = max(days for _, days, _ in batch)
+
+        with self._lock:
+            self.stats['requests'] += len(batch)
+            self.stats['batches'] += 1
+            self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+        metrics.increment('inference_batches')
+        metrics.increment('inference_requests', len(batch))
+
+        try:
+            with metrics.timer('inference_batch'):
+                predictions, errors = self.predictor.predict_many(symbols, days_ahead)
+        except Exception as e:
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        for symbol, days, future in batch:
+            if symbol in predictions:
+                future.set_result(list(predictions[symbol][:days]))
+            else:
+                future.set_exception(ValueError(errors.get(symbol, "No prediction")))
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Newline-delimited JSON: one request object per line, one response per line"""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                response = self.server.dispatch(json.loads(line))
+            except Exception as e:
+                response = {'error': str(e)}
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+
+class InferenceServer(socketserver.ThreadingUnixStreamServer):
+    """Owns one loaded StockPredictor and serves forecasts over a Unix socket
+
+    Every app process (and every session within it) sends requests here
+    instead of loading TensorFlow itself; concurrent requests are
+    micro-batched into single model calls.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, predictor, socket_path=None, window_seconds=None, max_batch=None, timeout=None):
+        self.socket_path = socket_path or INFERENCE_SERVER_SETTINGS['default_socket_path']
+        self.timeout_seconds = timeout or INFERENCE_SERVER_SETTINGS['timeout_seconds']
+        self.predictor = predictor
+        self.batcher = MicroBatcher(predictor, window_seconds, max_batch)
+
+        # A socket file left behind by a server that did not shut down cleanly
+        if os.path.exists(self.socket_path) and stat.S_ISSOCK(os.stat(self.socket_path).st_mode):
+            os.unlink(self.socket_path)
+        super().__init__(self.socket_path, _RequestHandler)
+
+    def dispatch(self, request):
+        op = request.get('op', 'predict')
+        if op == 'ping':
+            return {'ready': self.predictor.is_ready, 'stats': self.batcher.info()}
+        if op == 'predict':
+            if not self.predictor.is_ready:
+                raise ValueError("Predictor not initialized")
+            future = self.batcher.submit(request['symbol'], int(request.get('days_ahead', 7)))
+            return {'predictions': future.result(timeout=self.timeout_seconds)}
+        if op == 'quantiles':
+            # Path simulation is one array op per symbol; no batching needed
+            result = self.predictor.predict_quantiles(
+                request['symbol'], int(request.get('days_ahead', 7)), request.get('quantiles'), request.get('n_paths')
+            )
+            if result is None:
+                raise ValueError(f"No quantile forecast for {request['symbol']}")
+            return {'result': result}
+        raise ValueError(f"Unknown op: {op}")
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class InferenceClient:
+    """StockPredictor-compatible forecasting backed by an InferenceServer
+
+    Opens a short-lived Unix socket connection per call, so one client can be
+    shared by every session of an app process.
+    """
+
+    def __init__(self, socket_path=None, timeout=None):
+        self.socket_path = (socket_path or INFERENCE_SERVER_SETTINGS['socket_path']
+                            or INFERENCE_SERVER_SETTINGS['default_socket_path'])
+        self.timeout = timeout or INFERENCE_SERVER_SETTINGS['timeout_seconds']
+        self._ready_future = None
+
+    def connect_async(self, timeout=None):
+        """Poll the server in a background thread; returns a Future of True
+
+        The Future fails with ConnectionError if the server is not up and
+        ready within timeout seconds (INFERENCE_CONNECT_TIMEOUT by default).
+        """
+        if self._ready_future is None:
+            self._ready_future = Future()
+            timeout = timeout or INFERENCE_SERVER_SETTINGS['connect_timeout_seconds']
+            threading.Thread(target=self._connect_into_future, args=(timeout,),
+                             name='inference-connect', daemon=True).start()
+        return self._ready_future
+
+    @property
+    def ready(self):
+        """Future for the initial connection, or None if it was never started"""
+        return self._ready_future
+
+    def _connect_into_future(self, timeout):
+        deadline = time.monotonic() + timeout
+        error = None
+        while True:
+            try:
+                if self._call({'op': 'ping'})['ready']:
+                    self._ready_future.set_result(True)
+                    return
+                error = "model not loaded"
+            except Exception as e:
+                error = e
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(0.5)
+        self._ready_future.set_exception(ConnectionError(
+            f"Inference server at {self.socket_path} not ready after {timeout:g}s: {error}"
+        ))
+
+    @property
+    def is_ready(self):
+        try:
+            return bool(self._call({'op': 'ping'})['ready'])
+        except Exception:
+            return False
+
+    def predict_prices(self, stock_symbol, days_ahead=7):
+        """Predict stock prices for specified days"""
+        try:
+            return self._call({'op': 'predict', 'symbol': stock_symbol, 'days_ahead': days_ahead})['predictions']
+        except Exception as e:
+            print(f"Prediction error for {stock_symbol}: {e}")
+            return None
+
+    def predict_quantiles(self, stock_symbol, days_ahead=7, quantiles=None, n_paths=None):
+        """Point forecast plus quantile bands, computed by the server"""
+        try:
+            return self._call({
+                'op': 'quantiles', 'symbol': stock_symbol, 'days_ahead': days_ahead,
+                'quantiles': quantiles, 'n_paths': n_paths
+            })['result']
+        except Exception as e:
+            print(f"Quantile forecast error for {stock_symbol}: {e}")
+            return None
+
+    def stats(self):
+        """Server-side batching counters"""
+        return self._call({'op': 'ping'})['stats']
+
+    def _call(self, request):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as f:
+                line = f.readline()
+
+        if not line:
+            raise ConnectionError("Inference server closed the connection")
+        response = json.loads(line)
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response
+
+
+if __name__ == '__main__':
+    # python -m src.inference_server [--socket PATH]: load the model once and serve forecasts
+    import argparse
+    from .predictor import StockPredictor
+
+    parser = argparse.ArgumentParser(description="Serve micro-batched forecasts over a Unix socket")
+    parser.add_argument('--socket', default=INFERENCE_SERVER_SETTINGS['socket_path']
+                        or INFERENCE_SERVER_SETTINGS['default_socket_path'])
+    parser.add_argument('--window-ms', type=float, default=INFERENCE_SERVER_SETTINGS['batch_window_ms'])
+    parser.add_argument('--max-batch', type=int, default=INFERENCE_SERVER_SETTINGS['max_batch'])
+    args = parser.parse_args()
+
+    predictor = StockPredictor()
+    if not predictor.initialize():
+        raise SystemExit("Model files not available")
+
+    server = InferenceServer(predictor, args.socket, args.window_ms / 1000, args.max_batch)
+    print(f"Serving forecasts on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
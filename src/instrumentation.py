@@ -0,0 +1,248 @@
+import functools
+import inspect
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+from config import INSTRUMENTATION_SETTINGS
+
+ENABLED = INSTRUMENTATION_SETTINGS['enabled']
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Metrics:
+    """Per-stage timings (rolling window plus running totals), per-request values and counters"""
+
+    def __init__(self, window=None):
+        self.window = window or INSTRUMENTATION_SETTINGS['window']
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._totals = defaultdict(lambda: [0, 0.0])  # stage -> [count, seconds]
+        self._values = defaultdict(lambda: deque(maxlen=self.window))
+        self._value_totals = defaultdict(lambda: [0, 0.0])  # name -> [count, sum]
+        self._counters = defaultdict(float)
+        self._sources = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        """Record one duration for a stage"""
+        with self._lock:
+            self._samples[stage].append(seconds)
+            totals = self._totals[stage]
+            totals[0] += 1
+            totals[1] += seconds
+
+    def timer(self, stage):
+        """Context manager timing the enclosed block as `stage`"""
+        return _Timer(self, stage)
+
+    def increment(self, name, value=1):
+        """Add to a named counter"""
+        with self._lock:
+            self._counters[name] += value
+
+    def record(self, name, value):
+        """Record one per-request value (e.g. model calls a request needed)"""
+        with self._lock:
+            self._values[name].append(value)
+            totals = self._value_totals[name]
+            totals[0] += 1
+            totals[1] += value
+
+    def register_source(self, name, info_fn):
+        """Include a component's info() dict (cache stats etc.) in every snapshot"""
+        with self._lock:
+            self._sources[name] = info_fn
+
+    def snapshot(self):
+        """Stage percentiles over the rolling window, counters and source stats"""
+        with self._lock:
+            samples = {stage: np.array(values) for stage, values in self._samples.items()}
+            totals = {stage: tuple(values) for stage, values in self._totals.items()}
+            values = {name: np.array(recent) for name, recent in self._values.items()}
+            value_totals = {name: tuple(totals) for name, totals in self._value_totals.items()}
+            counters = dict(self._counters)
+            sources = dict(self._sources)
+
+        stages = {}
+        for stage, values in samples.items():
+            count, seconds = totals[stage]
+            stages[stage] = {
+                'count': count,
+                'total_seconds': seconds,
+                **{f'p{int(q * 100)}_ms': float(np.quantile(values, q)) * 1000 for q in QUANTILES}
+            }
+
+        per_request = {}
+        for name, recent in values.items():
+            count, total = value_totals[name]
+            per_request[name] = {
+                'count': count,
+                'sum': total,
+                **{f'p{int(q * 100)}': float(np.quantile(recent, q)) for q in QUANTILES}
+            }
+
+        source_stats = {}
+        for name, info_fn in sources.items():
+            try:
+                source_stats[name] = info_fn()
+            except Exception as e:
+                print(f"Error reading metrics source {name}: {e}")
+
+        return {'stages': stages, 'values': per_request, 'counters': counters, 'sources': source_stats}
+
+    def render_prometheus(self):
+        """Snapshot in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = ['# TYPE stock_stage_seconds summary']
+        for stage, stats in snapshot['stages'].items():
+            for q in QUANTILES:
+                value = stats[f'p{int(q * 100)}_ms'] / 1000
+                lines.append(f'stock_stage_seconds{{stage="{stage}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'stock_stage_seconds_sum{{stage="{stage}"}} {stats["total_seconds"]:.6f}')
+            lines.append(f'stock_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+
+        lines.append('# TYPE stock_request_value summary')
+        for name, stats in snapshot['values'].items():
+            for q in QUANTILES:
+                lines.append(f'stock_request_value{{name="{name}",quantile="{q}"}} {stats[f"p{int(q * 100)}"]:g}')
+            lines.append(f'stock_request_value_sum{{name="{name}"}} {stats["sum"]:g}')
+            lines.append(f'stock_request_value_count{{name="{name}"}} {stats["count"]}')
+
+        lines.append('# TYPE stock_events_total counter')
+        for name, value in snapshot['counters'].items():
+            lines.append(f'stock_events_total{{name="{name}"}} {value:g}')
+
+        lines.append('# TYPE stock_component gauge')
+        for source, stats in snapshot['sources'].items():
+            for field, value in stats.items():
+                if isinstance(value, (int, float)):
+                    lines.append(f'stock_component{{source="{source}",field="{field}"}} {value:g}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """Write the exposition text to a file (for node_exporter's textfile collector)"""
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        tmp_path.write_text(self.render_prometheus())
+        tmp_path.replace(path)
+
+
+class _Timer:
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class NullMetrics:
+    """Stand-in used when instrumentation is disabled; every call is a no-op"""
+
+    def observe(self, stage, seconds):
+        pass
+
+    def timer(self, stage):
+        return nullcontext()
+
+    def increment(self, name, value=1):
+        pass
+
+    def record(self, name, value):
+        pass
+
+    def register_source(self, name, info_fn):
+        pass
+
+    def snapshot(self):
+        return {'stages': {}, 'values': {}, 'counters': {}, 'sources': {}}
+
+    def render_prometheus(self):
+        return ''
+
+    def write_prometheus(self, path):
+        pass
+
+
+metrics = Metrics() if ENABLED else NullMetrics()
+
+
+def timed(stage):
+    """Decorator timing a function as `stage`
+
+    When instrumentation is disabled the function is returned unchanged, so
+    decorated hot paths carry no overhead at all. Coroutine functions are
+    timed until they complete, not until they return a coroutine.
+    """
+    def decorator(fn):
+        if not ENABLED:
+            return fn
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    metrics.observe(stage, time.perf_counter() - start)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                metrics.observe(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+class _PrometheusHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        payload = metrics.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_exporters():
+    """Start the /metrics endpoint and/or periodic file export configured in settings"""
+    if not ENABLED:
+        return
+
+    port = INSTRUMENTATION_SETTINGS['prometheus_port']
+    if port:
+        server = ThreadingHTTPServer((INSTRUMENTATION_SETTINGS['prometheus_host'], int(port)), _PrometheusHandler)
+        threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+
+    path = INSTRUMENTATION_SETTINGS['prometheus_file']
+    if path:
+        def export_loop():
+            while True:
+                try:
+                    metrics.write_prometheus(path)
+                except Exception as e:
+                    print(f"Error writing metrics file {path}: {e}")
+                time.sleep(INSTRUMENTATION_SETTINGS['export_interval_seconds'])
+
+        threading.Thread(target=export_loop, name='metrics-file', daemon=True).start()
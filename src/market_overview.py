@@ -0,0 +1,153 @@
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from config import MARKET_OVERVIEW_SETTINGS
+
+
+@dataclass
+class Panel:
+    """Aligned wide (dates x symbols) price arrays; NaN where a symbol did not trade"""
+    dates: pd.DatetimeIndex
+    symbols: list
+    close: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+
+
+def build_panel(frames):
+    """Align {symbol: OHLCV frame} on one calendar-date index in a single concat"""
+    frames = {symbol: frame for symbol, frame in frames.items() if frame is not None and not frame.empty}
+    if not frames:
+        return Panel(pd.DatetimeIndex([]), [], *(np.empty((0, 0)) for _ in range(3)))
+
+    columns = []
+    for symbol, frame in frames.items():
+        index = frame.index
+        if getattr(index, 'tz', None) is not None:
+            index = index.tz_localize(None)
+        part = frame[['Close', 'High', 'Low']].set_axis(index.normalize(), axis=0)
+        columns.append(part[~part.index.duplicated(keep='last')])
+
+    wide = pd.concat(columns, axis=1, keys=list(frames), join='outer').sort_index()
+    symbols = list(frames)
+    return Panel(
+        dates=wide.index,
+        symbols=symbols,
+        close=wide.xs('Close', axis=1, level=1)[symbols].to_numpy(dtype=np.float64),
+        high=wide.xs('High', axis=1, level=1)[symbols].to_numpy(dtype=np.float64),
+        low=wide.xs('Low', axis=1, level=1)[symbols].to_numpy(dtype=np.float64),
+    )
+
+
+def forward_fill(values):
+    """Column-wise forward fill of a 2-D array without leaving NumPy"""
+    valid = ~np.isnan(values)
+    rows = np.where(valid, np.arange(len(values))[:, np.newaxis], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return values[rows, np.arange(values.shape[1])]
+
+
+def pairwise_correlation(returns):
+    """Pearson correlation over pairwise-complete observations, as five matrix products
+
+    Matches DataFrame.corr() for data with gaps, without a Python loop over pairs.
+    """
+    mask = (~np.isnan(returns)).astype(np.float64)
+    x = np.nan_to_num(returns)
+    n = mask.T @ mask
+    sum_x = x.T @ mask          # [i, j]: sum of x_i over days where j also traded
+    sum_xx = (x * x).T @ mask
+    sum_xy = x.T @ x
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = n * sum_xy - sum_x * sum_x.T
+        var = n * sum_xx - sum_x * sum_x
+        corr = cov / np.sqrt(var * var.T)
+    corr[n < 3] = np.nan
+    return corr
+
+
+def cross_section(panel, benchmark=None, window=None):
+    """Screener table, correlation matrix and betas from one Panel
+
+    Returns (screener DataFrame indexed by symbol, correlation DataFrame).
+    Every statistic is computed for all symbols at once along the date axis.
+    """
+    benchmark = benchmark or MARKET_OVERVIEW_SETTINGS['benchmark']
+    window = window or MARKET_OVERVIEW_SETTINGS['window_days']
+    trading_days = MARKET_OVERVIEW_SETTINGS['trading_days_per_year']
+    symbols = panel.symbols
+    if not len(panel.dates):
+        return pd.DataFrame(), pd.DataFrame()
+
+    filled = forward_fill(panel.close)
+    last = filled[-1]
+
+    # All-NaN columns (symbols with no bars in the window) just produce NaN
+    with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        screener = {'last_close': last}
+        for label, days in MARKET_OVERVIEW_SETTINGS['return_horizons'].items():
+            base = filled[-1 - days] if len(filled) > days else np.full(len(symbols), np.nan)
+            screener[f'return_{label}_pct'] = (last / base - 1) * 100
+
+        year_start = np.searchsorted(panel.dates, pd.Timestamp(year=panel.dates[-1].year, month=1, day=1))
+        base = filled[year_start - 1] if year_start > 0 else np.full(len(symbols), np.nan)
+        screener['return_YTD_pct'] = (last / base - 1) * 100
+
+        # Simple daily returns; a day is missing if either end is missing
+        returns = panel.close[1:] / panel.close[:-1] - 1
+        recent = returns[-window:]
+        observations = (~np.isnan(recent)).sum(axis=0)
+        screener['volatility_pct'] = np.nanstd(recent, axis=0, ddof=1) * np.sqrt(trading_days) * 100
+        screener['observations'] = observations
+
+        high_52w = np.nanmax(panel.high[-trading_days:], axis=0)
+        low_52w = np.nanmin(panel.low[-trading_days:], axis=0)
+        screener['high_52w'] = high_52w
+        screener['low_52w'] = low_52w
+        screener['range_position_pct'] = (last - low_52w) / (high_52w - low_52w) * 100
+
+        screener['beta'] = _betas(recent, symbols.index(benchmark)) if benchmark in symbols else np.nan
+
+    correlation = pd.DataFrame(pairwise_correlation(recent), index=symbols, columns=symbols)
+    return pd.DataFrame(screener, index=pd.Index(symbols, name='symbol')), correlation
+
+
+def _betas(returns, benchmark_column):
+    """cov(r_i, r_m) / var(r_m) over the days both traded, for every column i"""
+    market = returns[:, benchmark_column][:, np.newaxis]
+    both = ~np.isnan(returns) & ~np.isnan(market)
+    n = both.sum(axis=0)
+
+    x = np.where(both, returns, 0.0)
+    m = np.where(both, market, 0.0)
+    mean_x = x.sum(axis=0) / n
+    mean_m = m.sum(axis=0) / n
+    cov = (x * m).sum(axis=0) / n - mean_x * mean_m
+    var = (m * m).sum(axis=0) / n - mean_m * mean_m
+    return np.where(n >= 3, cov / var, np.nan)
+
+
+class MarketOverview:
+    """Loads a symbol universe through a DataCollector and computes the cross-section"""
+
+    def __init__(self, data_collector):
+        self.data_collector = data_collector
+
+    def load(self, symbols, period=None):
+        """Panel for the symbols plus the benchmark, fetching concurrently"""
+        period = period or MARKET_OVERVIEW_SETTINGS['period']
+        benchmark = MARKET_OVERVIEW_SETTINGS['benchmark']
+        symbols = list(dict.fromkeys(list(symbols) + [benchmark]))
+
+        self.data_collector.prefetch(symbols, period=period)
+        frames = {symbol: self.data_collector.get_stock_data(symbol, period=period) for symbol in symbols}
+        return build_panel(frames)
+
+    def compute(self, symbols, period=None):
+        """(screener, correlation) for the universe"""
+        return cross_section(self.load(symbols, period))
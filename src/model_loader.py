@@ -1,34 +1,126 @@
-import tensorflow as tf
+import hashlib
 import joblib
+import os
+import threading
+import time
 from pathlib import Path
 import logging
-from config import MODEL_PATHS
+from config import MODEL_PATHS, APP_SETTINGS
+from .utils import clean_symbol
 
 class ModelLoader:
-    def __init__(self):
+    def __init__(self, backend=None):
+        self.backend = backend or APP_SETTINGS['inference_backend']
         self.model = None
         self.scalers = None
         self.config = None
         self.is_loaded = False
+        self.load_timings = {}
+        self.loaded_version = None
+        self._version = None
+        self._version_fingerprint = None
+        self._failed_version = None
+        self._lock = threading.Lock()
         
     def load_all(self):
         """Load model, scalers, and config"""
-        try:
-            # Load model
-            self.model = tf.keras.models.load_model(MODEL_PATHS['model'])
+        with self._lock:
+            if self.is_loaded:
+                return True
             
-            # Load scalers
-            self.scalers = joblib.load(MODEL_PATHS['scalers'])
-            
-            # Load config
-            self.config = joblib.load(MODEL_PATHS['config'])
-            
-            self.is_loaded = True
-            return True
-            
-        except Exception as e:
-            print(f"Error loading model components: {e}")
-            return False
+            try:
+                self._install(*self._load_components())
+                return True
+                
+            except Exception as e:
+                print(f"Error loading model components: {e}")
+                return False
+    
+    def reload(self):
+        """Load the model again from disk, swapping it in only once it loaded
+        
+        Requests keep using the current model while the new one loads. If
+        loading fails (e.g. a half-written file), the current model stays
+        and that version is not retried until the files change again.
+        """
+        with self._lock:
+            version = self.model_version()
+            if version == self._failed_version:
+                return False
+            try:
+                self._install(*self._load_components())
+                self._failed_version = None
+                return True
+            except Exception as e:
+                print(f"Error reloading model components, keeping version {self.loaded_version}: {e}")
+                self._failed_version = version
+                return False
+    
+    def _load_components(self):
+        """(model, scalers, config, version) read from disk, without touching the loaded ones"""
+        version = self.model_version()
+        if self.backend == 'numpy':
+            model = self._load_numpy_model()
+        else:
+            model = self._load_keras_model()
+        
+        # Load scalers and config
+        start = time.perf_counter()
+        scalers = joblib.load(MODEL_PATHS['scalers'])
+        config = joblib.load(MODEL_PATHS['config'])
+        self.load_timings['load_scalers_config'] = time.perf_counter() - start
+        return model, scalers, config, version
+    
+    def _install(self, model, scalers, config, version):
+        self.model, self.scalers, self.config = model, scalers, config
+        self.loaded_version = version
+        self.is_loaded = True
+    
+    def model_version(self):
+        """Content hash of the model and scaler files on disk
+        
+        Files are only re-hashed when their size or mtime changes.
+        """
+        paths = [self._model_path(), MODEL_PATHS['scalers']]
+        fingerprint = tuple(
+            (os.stat(path).st_size, os.stat(path).st_mtime_ns) if os.path.exists(path) else None
+            for path in paths
+        )
+        if fingerprint != self._version_fingerprint:
+            digest = hashlib.sha1()
+            for path in paths:
+                if os.path.exists(path):
+                    with open(path, 'rb') as f:
+                        for chunk in iter(lambda: f.read(1 << 20), b''):
+                            digest.update(chunk)
+            self._version = digest.hexdigest()[:16]
+            self._version_fingerprint = fingerprint
+        return self._version
+    
+    def _model_path(self):
+        if self.backend == 'numpy':
+            return MODEL_PATHS['numpy_model']
+        return MODEL_PATHS['model']
+    
+    def _load_keras_model(self):
+        # TensorFlow is imported here, not at module load, so importing
+        # this module stays cheap for code that never touches the model
+        start = time.perf_counter()
+        import tensorflow as tf
+        self.load_timings['import_tensorflow'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        model = tf.keras.models.load_model(MODEL_PATHS['model'])
+        self.load_timings['load_model'] = time.perf_counter() - start
+        return model
+    
+    def _load_numpy_model(self):
+        from .numpy_runtime import NumpyModel
+        
+        start = time.perf_counter()
+        model = NumpyModel.load(MODEL_PATHS['numpy_model'])
+        self.load_timings['load_model'] = time.perf_counter() - start
+        return model
     
     def get_scaler_for_stock(self, stock_symbol):
         """Get appropriate scaler for stock"""
@@ -36,10 +128,10 @@ class ModelLoader:
             return None
             
         # Remove .JK suffix and ^ prefix for symbol matching
-        clean_symbol = stock_symbol.replace('.JK', '').replace('^', '')
+        key = clean_symbol(stock_symbol)
         
-        if clean_symbol in self.scalers:
-            return self.scalers[clean_symbol]
+        if key in self.scalers:
+            return self.scalers[key]
         
         # Fallback to first available scaler
         return list(self.scalers.values())[0]
@@ -0,0 +1,214 @@
+import json
+
+import numpy as np
+
+TOPOLOGY_KEY = '__topology__'
+SUPPORTED_LAYERS = {'InputLayer', 'LSTM', 'GRU', 'Dense', 'Dropout', 'Concatenate'}
+
+
+def _sigmoid(x):
+    # Written via tanh so large negative inputs don't overflow exp
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
+ACTIVATIONS = {
+    'tanh': np.tanh,
+    'sigmoid': _sigmoid,
+    'relu': lambda x: np.maximum(x, 0),
+    'linear': lambda x: x,
+}
+
+
+def _inbound_names(layer_config):
+    """Names of the layers feeding a layer, for Keras 2 and Keras 3 configs"""
+    names = []
+    for node in layer_config.get('inbound_nodes', []):
+        if isinstance(node, dict):
+            # Keras 3: {'args': [keras_tensor or [keras_tensor, ...]], 'kwargs': {...}}
+            pending = list(node.get('args', []))
+            while pending:
+                item = pending.pop(0)
+                if isinstance(item, list):
+                    pending.extend(item)
+                elif isinstance(item, dict) and item.get('class_name') == '__keras_tensor__':
+                    names.append(item['config']['keras_history'][0])
+        else:
+            # Keras 2: [[name, node_index, tensor_index, kwargs], ...]
+            names.extend(entry[0] for entry in node)
+    return names
+
+
+def export_numpy_model(model, path):
+    """Write a Keras model's topology and weights to an .npz file for NumpyModel
+
+    Only the layer types in SUPPORTED_LAYERS are handled; anything else raises
+    ValueError so an incompatible model is caught at export time.
+    """
+    config = model.get_config()
+    topology = []
+    arrays = {}
+
+    for layer_config in config['layers']:
+        class_name = layer_config['class_name']
+        if class_name not in SUPPORTED_LAYERS:
+            raise ValueError(f"Layer type {class_name} is not supported by the NumPy runtime")
+
+        settings = layer_config['config']
+        name = settings['name']
+        topology.append({
+            'name': name,
+            'class_name': class_name,
+            'inbound': _inbound_names(layer_config),
+            'activation': settings.get('activation'),
+            'recurrent_activation': settings.get('recurrent_activation'),
+            'return_sequences': settings.get('return_sequences', False),
+            'reset_after': settings.get('reset_after', False),
+            'axis': settings.get('axis', -1),
+        })
+
+        if class_name in ('LSTM', 'GRU', 'Dense'):
+            for index, weight in enumerate(model.get_layer(name).get_weights()):
+                arrays[f'{name}/{index}'] = weight.astype(np.float32)
+
+    arrays[TOPOLOGY_KEY] = np.array(json.dumps(topology))
+    np.savez(path, **arrays)
+
+
+class NumpyModel:
+    """Inference-only executor for the exported LSTM/GRU/Dense graph"""
+
+    def __init__(self, topology, weights):
+        self.topology = topology
+        self.weights = weights
+        consumed = {name for layer in topology for name in layer['inbound']}
+        self.output_name = [layer['name'] for layer in topology if layer['name'] not in consumed][-1]
+
+    @classmethod
+    def load(cls, path):
+        """Load a model written by export_numpy_model"""
+        with np.load(path, allow_pickle=False) as archive:
+            topology = json.loads(str(archive[TOPOLOGY_KEY]))
+            weights = {}
+            for layer in topology:
+                index = 0
+                while f"{layer['name']}/{index}" in archive:
+                    weights.setdefault(layer['name'], []).append(archive[f"{layer['name']}/{index}"])
+                    index += 1
+        return cls(topology, weights)
+
+    def __call__(self, x):
+        """Forward pass for a (batch, timesteps, features) array; returns (batch, outputs)"""
+        outputs = {}
+        for layer in self.topology:
+            inputs = [outputs[name] for name in layer['inbound']]
+            class_name = layer['class_name']
+
+            if class_name == 'InputLayer':
+                result = np.asarray(x, dtype=np.float32)
+            elif class_name == 'LSTM':
+                result = self._lstm(inputs[0], layer)
+            elif class_name == 'GRU':
+                result = self._gru(inputs[0], layer)
+            elif class_name == 'Dense':
+                kernel, bias = self.weights[layer['name']]
+                result = ACTIVATIONS[layer['activation']](inputs[0] @ kernel + bias)
+            elif class_name == 'Concatenate':
+                result = np.concatenate(inputs, axis=layer['axis'])
+            else:
+                # Dropout is the identity at inference time
+                result = inputs[0]
+
+            outputs[layer['name']] = result
+        return outputs[self.output_name]
+
+    def predict(self, x, verbose=0):
+        """Keras-compatible alias for __call__"""
+        return self(x)
+
+    def _lstm(self, x, layer):
+        kernel, recurrent_kernel, bias = self.weights[layer['name']]
+        activation = ACTIVATIONS[layer['activation']]
+        recurrent_activation = ACTIVATIONS[layer['recurrent_activation']]
+        units = recurrent_kernel.shape[0]
+        batch, steps, _ = x.shape
+
+        # Input projection for every timestep in one matmul; gates are i, f, c, o
+        projected = x @ kernel + bias
+        h = np.zeros((batch, units), dtype=np.float32)
+        c = np.zeros((batch, units), dtype=np.float32)
+        sequence = np.empty((batch, steps, units), dtype=np.float32) if layer['return_sequences'] else None
+
+        for t in range(steps):
+            z = projected[:, t] + h @ recurrent_kernel
+            i = recurrent_activation(z[:, :units])
+            f = recurrent_activation(z[:, units:2 * units])
+            candidate = activation(z[:, 2 * units:3 * units])
+            o = recurrent_activation(z[:, 3 * units:])
+            c = f * c + i * candidate
+            h = o * activation(c)
+            if sequence is not None:
+                sequence[:, t] = h
+
+        return sequence if sequence is not None else h
+
+    def _gru(self, x, layer):
+        kernel, recurrent_kernel, bias = self.weights[layer['name']]
+        activation = ACTIVATIONS[layer['activation']]
+        recurrent_activation = ACTIVATIONS[layer['recurrent_activation']]
+        units = recurrent_kernel.shape[0]
+        batch, steps, _ = x.shape
+
+        if layer['reset_after']:
+            input_bias, recurrent_bias = bias[0], bias[1]
+        else:
+            input_bias, recurrent_bias = bias, None
+
+        # Gates are z (update), r (reset), h (candidate)
+        projected = x @ kernel + input_bias
+        h = np.zeros((batch, units), dtype=np.float32)
+        sequence = np.empty((batch, steps, units), dtype=np.float32) if layer['return_sequences'] else None
+
+        for t in range(steps):
+            x_t = projected[:, t]
+            if layer['reset_after']:
+                recurrent = h @ recurrent_kernel + recurrent_bias
+                z = recurrent_activation(x_t[:, :units] + recurrent[:, :units])
+                r = recurrent_activation(x_t[:, units:2 * units] + recurrent[:, units:2 * units])
+                candidate = activation(x_t[:, 2 * units:] + r * recurrent[:, 2 * units:])
+            else:
+                recurrent = h @ recurrent_kernel[:, :2 * units]
+                z = recurrent_activation(x_t[:, :units] + recurrent[:, :units])
+                r = recurrent_activation(x_t[:, units:2 * units] + recurrent[:, units:])
+                candidate = activation(x_t[:, 2 * units:] + (r * h) @ recurrent_kernel[:, 2 * units:])
+            h = z * h + (1 - z) * candidate
+            if sequence is not None:
+                sequence[:, t] = h
+
+        return sequence if sequence is not None else h
+
+
+class NumpyForecastEngine:
+    """ForecastEngine interface on top of NumpyModel, with no TensorFlow dependency"""
+
+    def __init__(self, model, sequence_length, n_features):
+        self.model = model
+        self.sequence_length = sequence_length
+        self.n_features = n_features
+
+    def warmup(self):
+        """Nothing to trace; run once so first-call allocations happen up front"""
+        self.model(np.zeros((1, self.sequence_length, self.n_features), dtype=np.float32))
+
+    def predict_next(self, windows):
+        """Predict the next scaled value for a batch of windows"""
+        return self.model(np.asarray(windows, dtype=np.float32))[:, 0]
+
+
+if __name__ == '__main__':
+    # python -m src.numpy_runtime: export the Keras model for INFERENCE_BACKEND=numpy
+    import tensorflow as tf
+    from config import MODEL_PATHS
+
+    keras_model = tf.keras.models.load_model(MODEL_PATHS['model'])
+    export_numpy_model(keras_model, MODEL_PATHS['numpy_model'])
+    print(f"Exported {MODEL_PATHS['model']} -> {MODEL_PATHS['numpy_model']}")
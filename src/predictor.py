@@ -1,89 +1,290 @@
+import threading
 import numpy as np
 import pandas as pd
+from concurrent.futures import Future
 from .model_loader import ModelLoader
 from .data_collector import DataCollector
+from .feature_store import FeatureStore
+from .forecast_cache import ForecastCache
+from .forecast_store import ForecastStore
+from .instrumentation import metrics, timed
+from .probabilistic import ResidualBootstrap
+from .rollout import FeatureRollout, history_state
+from .indicators import BatchIndicatorState
 from .utils import add_technical_indicators
-from config import APP_SETTINGS
+from config import APP_SETTINGS, FEATURE_STORE_SETTINGS
 
 class StockPredictor:
-    def __init__(self):
+    def __init__(self, data_collector=None):
         self.model_loader = ModelLoader()
-        self.data_collector = DataCollector()
+        # Share the process-wide market data service unless given a specific collector
+        self.data_collector = data_collector if data_collector is not None else DataCollector.shared()
+        self.engine = None
+        self.rollout = None
+        self.feature_store = None
+        self.forecast_cache = ForecastCache()
+        self.forecast_store = ForecastStore.from_settings()
+        self.bootstrap = ResidualBootstrap(self)
         self.is_ready = False
+        self._ready_future = None
+        self._reload_lock = threading.Lock()
         
     def initialize(self):
         """Initialize predictor"""
+        if self.is_ready:
+            return True
         if self.model_loader.load_all():
+            self._build_engine()
+            if FEATURE_STORE_SETTINGS['directory']:
+                self.feature_store = FeatureStore(
+                    FEATURE_STORE_SETTINGS['directory'],
+                    len(self.model_loader.config['feature_columns'])
+                )
             self.is_ready = True
             return True
         return False
     
+    def _build_engine(self):
+        if self.model_loader.backend == 'numpy':
+            from .numpy_runtime import NumpyForecastEngine as ForecastEngine
+        else:
+            # Imported lazily: this pulls in TensorFlow
+            from .forecast_engine import ForecastEngine
+        engine = ForecastEngine(
+            self.model_loader.model,
+            APP_SETTINGS['sequence_length'],
+            len(self.model_loader.config['feature_columns'])
+        )
+        engine.warmup()
+        self.engine = engine
+        self.rollout = FeatureRollout(
+            engine,
+            self.model_loader.config['feature_columns'],
+            APP_SETTINGS['sequence_length']
+        )
+    
+    def _model_version(self):
+        """Current model version, reloading first if the files on disk changed"""
+        version = self.model_loader.model_version()
+        if version != self.model_loader.loaded_version:
+            with self._reload_lock:
+                if version != self.model_loader.loaded_version and self.model_loader.reload():
+                    self._build_engine()
+            version = self.model_loader.loaded_version
+        return version
+    
+    def initialize_async(self):
+        """Run initialize() in a background thread and return a Future of its result"""
+        if self._ready_future is None:
+            self._ready_future = Future()
+            threading.Thread(target=self._initialize_into_future, name='predictor-init', daemon=True).start()
+        return self._ready_future
+    
+    @property
+    def ready(self):
+        """Future for background initialization, or None if it was never started"""
+        return self._ready_future
+    
+    def _initialize_into_future(self):
+        try:
+            self._ready_future.set_result(self.initialize())
+        except Exception as e:
+            self._ready_future.set_exception(e)
+    
+    @timed('predict_prices')
     def predict_prices(self, stock_symbol, days_ahead=7):
         """Predict stock prices for specified days"""
         if not self.is_ready:
             raise ValueError("Predictor not initialized")
         
+        metrics.increment('forecast_requests')
         try:
             # Get historical data
             data = self.data_collector.get_stock_data(stock_symbol)
             if data is None:
                 return None
             
+            # Serve from the forecast cache or the batch store when neither the data nor the model changed
+            last_bar = data.index[-1]
+            model_version = self._model_version()
+            cached = self._lookup(stock_symbol, last_bar, model_version, days_ahead)
+            if cached is not None:
+                metrics.record('model_calls_per_request', 0)
+                return cached
+            
             # Add technical indicators
             data_with_indicators = add_technical_indicators(data)
             
-            # Prepare sequence
+            # Prepare sequence and the indicator state it ends on
             sequence = self._prepare_sequence(data_with_indicators, stock_symbol)
+            state = history_state(data)
             
-            # Generate predictions
-            predictions = self._generate_predictions(sequence, days_ahead, stock_symbol)
+            # Roll out the longest horizon the app offers so shorter requests hit the cache
+            horizon = max(days_ahead, APP_SETTINGS['max_prediction_days'])
+            predictions = self._generate_predictions(sequence, state, horizon, stock_symbol)
+            metrics.record('model_calls_per_request', horizon)
+            self.forecast_cache.put(stock_symbol, last_bar, model_version, predictions)
             
-            return predictions
+            return predictions[:days_ahead]
             
         except Exception as e:
             print(f"Prediction error for {stock_symbol}: {e}")
             return None
     
-    def _prepare_sequence(self, data, stock_symbol):
-        """Prepare data sequence for prediction"""
-        scaler_info = self.model_loader.get_scaler_for_stock(stock_symbol)
+    @timed('predict_quantiles')
+    def predict_quantiles(self, stock_symbol, days_ahead=7, quantiles=None, n_paths=None):
+        """Point forecast plus quantile bands per day from bootstrapped forecast errors
+        
+        Returns the dict from ResidualBootstrap.quantiles, or None on failure.
+        """
+        predictions = self.predict_prices(stock_symbol, days_ahead)
+        if predictions is None:
+            return None
+        
+        try:
+            return self.bootstrap.quantiles(stock_symbol, predictions, quantiles, n_paths)
+        except Exception as e:
+            print(f"Quantile forecast error for {stock_symbol}: {e}")
+            return None
+    
+    def predict_many(self, stock_symbols, days_ahead=7):
+        """Predict prices for several symbols, one batched model call per step
+        
+        Returns (predictions, errors): dicts keyed by symbol. A symbol that
+        fails to load or prepare is reported in errors and left out of the batch.
+        """
+        if not self.is_ready:
+            raise ValueError("Predictor not initialized")
+        
+        predictions = {}
+        errors = {}
+        symbols = []
+        last_bars = []
+        windows = []
+        states = []
+        scalers = []
+        model_version = self._model_version()
+        horizon = max(days_ahead, APP_SETTINGS['max_prediction_days'])
+        
+        for stock_symbol in stock_symbols:
+            try:
+                data = self.data_collector.get_stock_data(stock_symbol)
+                if data is None:
+                    errors[stock_symbol] = "No data available"
+                    continue
+                
+                cached = self._lookup(stock_symbol, data.index[-1], model_version, days_ahead)
+                if cached is not None:
+                    predictions[stock_symbol] = cached
+                    continue
+                
+                windows.append(self._prepare_window(add_technical_indicators(data)))
+                states.append(history_state(data))
+                scalers.append(self.model_loader.get_scaler_for_stock(stock_symbol))
+                last_bars.append(data.index[-1])
+                symbols.append(stock_symbol)
+                
+            except Exception as e:
+                errors[stock_symbol] = str(e)
+        
+        if not symbols:
+            metrics.record('model_calls_per_request', 0)
+            return predictions, errors
+        
+        try:
+            # One call per step serves the whole batch
+            prices = self._forecast_batch(windows, states, scalers, horizon)
+            metrics.record('model_calls_per_request', horizon)
+            for stock_symbol, last_bar, row in zip(symbols, last_bars, prices):
+                self.forecast_cache.put(stock_symbol, last_bar, model_version, row.tolist())
+                predictions[stock_symbol] = row[:days_ahead].tolist()
+                
+        except Exception as e:
+            print(f"Batch prediction error: {e}")
+            for stock_symbol in symbols:
+                errors[stock_symbol] = str(e)
+        
+        return predictions, errors
+    
+    def _lookup(self, stock_symbol, last_bar, model_version, days_ahead):
+        """Forecast from the in-process cache, else from the precomputed batch store"""
+        cached = self.forecast_cache.get(stock_symbol, last_bar, model_version, days_ahead)
+        if cached is not None:
+            metrics.increment('forecast_cache_hits')
+            return cached
+        
+        if self.forecast_store is not None:
+            stored = self.forecast_store.get(stock_symbol, last_bar, model_version)
+            if stored is not None and len(stored) >= days_ahead:
+                metrics.increment('forecast_store_hits')
+                self.forecast_cache.put(stock_symbol, last_bar, model_version, stored)
+                return stored[:days_ahead]
+        return None
+    
+    def _forecast_batch(self, windows, states, scalers, horizon):
+        """Roll out unscaled windows with per-symbol scalers; returns prices (n_symbols, horizon)"""
+        # (n_symbols, sequence_length, n_features), scaled per symbol in one pass
+        feature_scale, feature_min = self._stack_scalers(scalers, 'feature_scaler')
+        batch = np.stack(windows) * feature_scale[:, np.newaxis, :] + feature_min[:, np.newaxis, :]
+        
+        target_scale, target_min = self._stack_scalers(scalers, 'target_scaler')
+        return self.rollout.run(
+            batch, BatchIndicatorState.concat(states),
+            feature_scale, feature_min, target_scale[:, 0], target_min[:, 0], horizon
+        )
+    
+    def _stack_scalers(self, scalers, key):
+        """Stack MinMaxScaler parameters so transforms run as one array op"""
+        scale = np.stack([scaler_info[key].scale_ for scaler_info in scalers])
+        offset = np.stack([scaler_info[key].min_ for scaler_info in scalers])
+        return scale, offset
+    
+    def _prepare_window(self, data):
+        """Select the last sequence_length rows of unscaled model features"""
         feature_columns = self.model_loader.config['feature_columns']
         sequence_length = APP_SETTINGS['sequence_length']
         
         # Get features
-        features = data[feature_columns].fillna(method='bfill').fillna(method='ffill')
+        features = data[feature_columns].bfill().ffill().values
         
-        # Scale features
-        scaled_features = scaler_info['feature_scaler'].transform(features.values)
-        
-        # Create sequence
-        if len(scaled_features) >= sequence_length:
-            return scaled_features[-sequence_length:]
+        # Create window
+        if len(features) >= sequence_length:
+            return features[-sequence_length:]
         else:
             # Pad with last available data if not enough history
-            padded = np.tile(scaled_features[-1], (sequence_length, 1))
-            padded[-len(scaled_features):] = scaled_features
+            padded = np.tile(features[-1], (sequence_length, 1))
+            padded[-len(features):] = features
             return padded
     
-    def _generate_predictions(self, sequence, days_ahead, stock_symbol):
+    @timed('prepare_sequence')
+    def _prepare_sequence(self, data, stock_symbol):
+        """Prepare data sequence for prediction"""
+        scaler_info = self.model_loader.get_scaler_for_stock(stock_symbol)
+        sequence_length = APP_SETTINGS['sequence_length']
+        
+        if self.feature_store is not None:
+            # Only rows newer than the stored ones get scaled; the window is a view of the memmap
+            feature_columns = self.model_loader.config['feature_columns']
+            self.feature_store.update(stock_symbol, data[feature_columns], scaler_info['feature_scaler'])
+            window = self.feature_store.window(stock_symbol, sequence_length)
+            if len(window) == sequence_length:
+                return window
+        
+        # Scaling is row-wise, so only the window needs transforming
+        window = self._prepare_window(data)
+        return scaler_info['feature_scaler'].transform(window)
+    
+    @timed('generate_predictions')
+    def _generate_predictions(self, sequence, state, days_ahead, stock_symbol):
         """Generate future predictions"""
         scaler_info = self.model_loader.get_scaler_for_stock(stock_symbol)
+        feature_scaler = scaler_info['feature_scaler']
         target_scaler = scaler_info['target_scaler']
         
-        predictions = []
-        current_sequence = sequence.copy()
-        
-        for _ in range(days_ahead):
-            # Predict next value
-            pred_input = current_sequence.reshape(1, *current_sequence.shape)
-            pred_scaled = self.model_loader.model.predict(pred_input, verbose=0)
-            
-            # Inverse transform to get actual price
-            pred_price = target_scaler.inverse_transform(pred_scaled)[0][0]
-            predictions.append(pred_price)
-            
-            # Update sequence (simplified approach)
-            current_sequence = np.roll(current_sequence, -1, axis=0)
-            # You might want to update with new technical indicators here
+        # Each predicted close is appended as a bar and its indicators updated before the next step
+        predictions = self.rollout.run(
+            sequence, state, feature_scaler.scale_, feature_scaler.min_,
+            target_scaler.scale_[0], target_scaler.min_[0], days_ahead
+        )[0]
         
-        return predictions
+        return predictions.tolist()
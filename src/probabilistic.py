@@ -0,0 +1,144 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from .backtester import Backtester
+from config import APP_SETTINGS, PROBABILISTIC_SETTINGS
+
+
+class ResidualBootstrap:
+    """Quantile bands around a point forecast from resampled historical errors
+
+    The model's own walk-forward errors (log of actual over predicted, one
+    trajectory per backtest origin) are resampled as whole rows and applied
+    multiplicatively to the point path, so every simulated path carries a
+    realistic error trajectory across the horizon. All paths are drawn as a
+    single (n_paths, days) array op. Symbols with too little history for a
+    backtest fall back to bootstrapped daily log returns.
+
+    The backtest runs on a background worker the first time a symbol is
+    asked for; until it finishes, requests use the daily-return fallback
+    rather than waiting on it. Each call draws from its own Generator
+    spawned from one SeedSequence, so concurrent sessions never share one.
+    """
+
+    def __init__(self, predictor, n_paths=None, seed=None):
+        self.predictor = predictor
+        self.backtester = Backtester(predictor)
+        self.n_paths = n_paths or PROBABILISTIC_SETTINGS['n_paths']
+        self._seed = np.random.SeedSequence(seed if seed is not None else PROBABILISTIC_SETTINGS['seed'])
+        self._residuals = {}  # (symbol, model_version) -> (n_origins, horizon) log errors
+        self._pending = {}  # (symbol, model_version) -> Future of a running backtest
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def quantiles(self, stock_symbol, predictions, quantiles=None, n_paths=None):
+        """Quantiles of simulated prices per horizon day
+
+        Returns {'point', 'levels', 'quantiles' (one list per level), 'n_paths',
+        'method'}, or None when there is no history to resample from.
+        """
+        levels = list(quantiles or PROBABILISTIC_SETTINGS['quantiles'])
+        n_paths = n_paths or self.n_paths
+        point = np.asarray(predictions, dtype=np.float64)
+        days = len(point)
+
+        rng = self._generator()
+        residuals = self._backtest_residuals(stock_symbol, days)
+        method = 'backtest_residuals'
+        if residuals is None:
+            residuals = self._return_residuals(stock_symbol, days, rng)
+            method = 'historical_returns'
+        if residuals is None:
+            return None
+
+        paths = self.simulate(point, residuals, n_paths, rng)
+        bands = np.quantile(paths, levels, axis=0)
+        return {
+            'point': point.tolist(),
+            'levels': levels,
+            'quantiles': bands.tolist(),
+            'n_paths': n_paths,
+            'method': method,
+        }
+
+    def simulate(self, point, residuals, n_paths, rng=None):
+        """(n_paths, days) price paths: point path times resampled error rows"""
+        rng = rng or self._generator()
+        rows = rng.integers(len(residuals), size=n_paths)
+        return point[np.newaxis, :] * np.exp(residuals[rows, :len(point)])
+
+    def clear(self):
+        """Drop cached residuals (e.g. after a model update)"""
+        with self._lock:
+            self._residuals.clear()
+
+    def prepare(self, stock_symbol, days=None):
+        """Start this symbol's residual backtest in the background; returns its Future
+
+        Resolves to the (n_origins, horizon) residuals. Already computed or
+        running backtests are not repeated.
+        """
+        horizon = max(days or 0, APP_SETTINGS['max_prediction_days'])
+        key = (stock_symbol, self.predictor._model_version())
+        with self._lock:
+            residuals = self._residuals.get(key)
+            if residuals is not None and residuals.shape[1] >= horizon:
+                future = Future()
+                future.set_result(residuals)
+                return future
+            future = self._pending.get(key)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='residual-backtest')
+                future = self._executor.submit(self._run_backtest, key, horizon)
+                self._pending[key] = future
+            return future
+
+    def _run_backtest(self, key, horizon):
+        stock_symbol = key[0]
+        try:
+            residuals = self.backtester.residuals(
+                stock_symbol, horizon, period=PROBABILISTIC_SETTINGS['residual_period']
+            )
+        except Exception as e:
+            print(f"Residual backtest error for {stock_symbol}: {e}")
+            residuals = np.empty((0, horizon))
+        with self._lock:
+            self._residuals[key] = residuals
+            self._pending.pop(key, None)
+        return residuals
+
+    def _generator(self):
+        """Fresh Generator for one call, from an independent child seed"""
+        with self._lock:
+            child = self._seed.spawn(1)[0]
+        return np.random.default_rng(child)
+
+    def _backtest_residuals(self, stock_symbol, days):
+        """Walk-forward errors for this symbol and model, or None while the backtest runs"""
+        future = self.prepare(stock_symbol, days)
+        if not future.done():
+            return None
+
+        residuals = future.result()
+        if len(residuals) < PROBABILISTIC_SETTINGS['min_residuals']:
+            return None
+        return residuals
+
+    def _return_residuals(self, stock_symbol, days, rng):
+        """Random-walk error rows: cumulative sums of resampled, de-meaned daily log returns"""
+        data = self.predictor.data_collector.get_stock_data(stock_symbol)
+        if data is None or len(data) < 2:
+            return None
+
+        returns = np.diff(np.log(data['Close'].to_numpy(dtype=np.float64)))
+        returns = returns[np.isfinite(returns)]
+        if not len(returns):
+            return None
+        returns -= returns.mean()
+
+        n_rows = max(PROBABILISTIC_SETTINGS['min_residuals'], self.n_paths)
+        draws = returns[rng.integers(len(returns), size=(n_rows, days))]
+        return np.cumsum(draws, axis=1)
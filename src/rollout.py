@@ -0,0 +1,95 @@
+import numpy as np
+
+from .indicators import BatchIndicatorState
+from .instrumentation import metrics
+
+
+class WindowRing:
+    """Sliding window of scaled feature rows, (..., length, n_features), advanced in O(1)
+
+    Backed by an array twice the window length with every row written
+    twice, so the current window is always one contiguous slice. Leading
+    dimensions (a batch of windows) are carried through.
+    """
+
+    def __init__(self, window):
+        window = np.asarray(window, dtype=np.float32)
+        self.length = window.shape[-2]
+        self.rows = np.concatenate([window, window], axis=-2)
+        self.head = self.length - 1  # rows[..., head + 1:head + 1 + length, :] is the window
+
+    def window(self):
+        """The current window, a view of the ring"""
+        return self.rows[..., self.head + 1:self.head + 1 + self.length, :]
+
+    def push(self, row):
+        """Append a row and drop the oldest
+
+        NaNs (indicators still warming up on short histories) carry the
+        previous row's value forward.
+        """
+        row = np.where(np.isnan(row), self.rows[..., self.head + self.length, :], row)
+        self.head = (self.head + 1) % self.length
+        self.rows[..., self.head, :] = row
+        self.rows[..., self.head + self.length, :] = row
+
+
+class FeatureRollout:
+    """Autoregressive forecasting that feeds each predicted close back in as a bar
+
+    Each step predicts the next close for every window in the batch, turns it
+    into a synthetic bar (open at the previous close, high/low spanning open
+    and close, volume at its 20-day average), updates every indicator from
+    running state in O(1), scales the new feature row and pushes it onto a
+    WindowRing holding the whole batch.
+    """
+
+    def __init__(self, engine, feature_columns, sequence_length):
+        self.engine = engine
+        self.feature_columns = list(feature_columns)
+        self.sequence_length = sequence_length
+
+    def run(self, windows, state, feature_scale, feature_min, target_scale, target_min, days_ahead):
+        """Predicted prices, shape (batch, days_ahead)
+
+        windows: scaled inputs (batch, sequence_length, n_features) ending at
+        the bar `state` (a BatchIndicatorState) was positioned after. Scaler
+        parameters broadcast against (batch, n_features) and (batch,).
+        """
+        windows = np.asarray(windows, dtype=np.float32)
+        if windows.ndim == 2:
+            windows = windows[np.newaxis]
+        ring = WindowRing(windows)
+
+        prices = np.empty((len(windows), days_ahead))
+        for step in range(days_ahead):
+            scaled = self.engine.predict_next(ring.window())
+            close = (scaled.astype(np.float64) - target_min) / target_scale
+            prices[:, step] = close
+            if step == days_ahead - 1:
+                break
+
+            ring.push(self._next_row(state, close) * feature_scale + feature_min)
+
+        metrics.increment('model_calls', days_ahead)
+        return prices
+
+    def _next_row(self, state, close):
+        """Unscaled feature row (batch, n_features) for the bar closing at `close`"""
+        open_ = state.prev_close
+        high = np.maximum(open_, close)
+        low = np.minimum(open_, close)
+        volume = state.volumes.mean()
+        volume = np.where(np.isnan(volume), state.volumes.buffer[:, state.volumes.position - 1], volume)
+
+        bar = {'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}
+        bar.update(state.update(open_, high, low, close, volume))
+        return np.stack([bar[column] for column in self.feature_columns], axis=1)
+
+
+def history_state(data, origins=None):
+    """BatchIndicatorState after the given rows (default: the last) of an OHLCV frame"""
+    return BatchIndicatorState.from_history(
+        data['Open'].to_numpy(), data['High'].to_numpy(), data['Low'].to_numpy(),
+        data['Close'].to_numpy(), data['Volume'].to_numpy(), origins
+    )
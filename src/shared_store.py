@@ -0,0 +1,135 @@
+import io
+import os
+import sqlite3
+import threading
+import time
+
+from .compact import read_feather, write_feather
+from config import DATA_SERVICE_SETTINGS
+
+
+class SQLiteMarketStore:
+    """Price history shared by every app process on a host, in one SQLite file
+
+    Frames are stored as Arrow IPC (Feather) blobs keyed on
+    (symbol, period, interval). A lease row per key lets one process fetch
+    from the source while the others wait for its result, so N replicas
+    download each symbol once. Leases expire, so a crashed fetcher only
+    delays the others by lease_seconds.
+    """
+
+    def __init__(self, path, lease_seconds=None, poll_seconds=None):
+        self.path = str(path)
+        self.lease_seconds = lease_seconds or DATA_SERVICE_SETTINGS['lease_seconds']
+        self.poll_seconds = poll_seconds or DATA_SERVICE_SETTINGS['poll_seconds']
+        self.owner = f"{os.getpid()}-{id(self)}"
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'leases': 0, 'waits': 0}
+
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS frames "
+                "(key TEXT PRIMARY KEY, written_at REAL NOT NULL, payload BLOB NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases "
+                "(key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    @classmethod
+    def from_settings(cls):
+        """Store at DATA_SERVICE_SETTINGS['shared_store'], or None if unset"""
+        path = DATA_SERVICE_SETTINGS['shared_store']
+        return cls(path) if path else None
+
+    def get(self, key):
+        """Return (data, written_at epoch seconds), or (None, None) if absent"""
+        row = self._connection().execute(
+            "SELECT written_at, payload FROM frames WHERE key = ?", (self._key(key),)
+        ).fetchone()
+        if row is None:
+            self._count('misses')
+            return None, None
+
+        try:
+            data = read_feather(io.BytesIO(row[1]))
+        except Exception as e:
+            print(f"Error reading shared store entry {key}: {e}")
+            self._count('misses')
+            return None, None
+
+        self._count('hits')
+        return data, row[0]
+
+    def put(self, key, data):
+        """Store a frame, replacing any earlier one for the key"""
+        buffer = io.BytesIO()
+        write_feather(data, buffer)
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO frames (key, written_at, payload) VALUES (?, ?, ?)",
+                (self._key(key), time.time(), buffer.getvalue())
+            )
+        self._count('writes')
+
+    def try_lease(self, key):
+        """Claim the right to fetch key; False if another live process holds it"""
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT owner, expires_at FROM leases WHERE key = ?", (self._key(key),)).fetchone()
+            if row is not None and row[0] != self.owner and row[1] > now:
+                conn.execute("COMMIT")
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO leases (key, owner, expires_at) VALUES (?, ?, ?)",
+                (self._key(key), self.owner, now + self.lease_seconds)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._count('leases')
+        return True
+
+    def release(self, key):
+        """Give up a lease taken with try_lease"""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (self._key(key), self.owner))
+
+    def wait(self, key, timeout=None):
+        """Block until no live lease is held on key (or timeout seconds pass)"""
+        self._count('waits')
+        deadline = time.monotonic() + (timeout or self.lease_seconds)
+        while time.monotonic() < deadline:
+            row = self._connection().execute(
+                "SELECT expires_at FROM leases WHERE key = ?", (self._key(key),)
+            ).fetchone()
+            if row is None or row[0] <= time.time():
+                return
+            time.sleep(self.poll_seconds)
+
+    def info(self):
+        """Counters, for monitoring"""
+        with self._lock:
+            return dict(self.stats)
+
+    def _connection(self):
+        # sqlite3 connections can't be shared between threads; keep one per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    @staticmethod
+    def _key(key):
+        return '|'.join(str(part) for part in key)
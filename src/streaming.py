@@ -0,0 +1,395 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .indicators import BatchIndicatorState, indicator_frame
+from .rollout import WindowRing, history_state
+from config import APP_SETTINGS, STREAMING_SETTINGS
+
+OHLCV = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+@dataclass
+class Bar:
+    """One OHLCV bar; closed=False marks a still-forming bar that may be revised"""
+    symbol: str
+    timestamp: pd.Timestamp
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    closed: bool = True
+    received_at: float = field(default_factory=time.perf_counter)
+
+
+class ReplaySource:
+    """Minute bars from a CSV file (timestamp, symbol, open, high, low, close, volume)
+
+    Bars sharing a timestamp are released together. With speed > 0 the gaps
+    between timestamps are replayed at that multiple of real time; speed 0
+    replays as fast as the consumer keeps up.
+    """
+
+    def __init__(self, path, speed=None):
+        self.path = path
+        self.speed = STREAMING_SETTINGS['replay_speed'] if speed is None else speed
+
+    async def bars(self):
+        frame = pd.read_csv(self.path, parse_dates=['timestamp']).sort_values('timestamp', kind='stable')
+        previous = None
+        for timestamp, group in frame.groupby('timestamp', sort=False):
+            if previous is not None:
+                gap = (timestamp - previous).total_seconds()
+                await asyncio.sleep(gap / self.speed if self.speed > 0 else 0)
+            previous = timestamp
+
+            received_at = time.perf_counter()
+            for row in group.itertuples(index=False):
+                yield Bar(row.symbol, timestamp, row.open, row.high, row.low, row.close, row.volume,
+                          closed=True, received_at=received_at)
+
+
+class YahooPollingSource:
+    """Polls Yahoo for 1-minute bars; every bar but the newest is closed
+
+    Polls go through the DataCollector, so they share its per-host rate
+    limit and retries with every other fetch in the process.
+    """
+
+    def __init__(self, symbols, data_collector, poll_seconds=None):
+        self.symbols = list(symbols)
+        self.data_collector = data_collector
+        self.poll_seconds = poll_seconds or STREAMING_SETTINGS['poll_seconds']
+        self._last_seen = {}
+
+    async def bars(self):
+        while True:
+            frames = await asyncio.gather(*(
+                asyncio.to_thread(self.data_collector.fetch_latest, symbol, '1d', STREAMING_SETTINGS['interval'])
+                for symbol in self.symbols
+            ), return_exceptions=True)
+
+            for symbol, frame in zip(self.symbols, frames):
+                if isinstance(frame, Exception) or frame is None or frame.empty:
+                    continue
+                last_seen = self._last_seen.get(symbol)
+                new = frame if last_seen is None else frame[frame.index >= last_seen]
+                received_at = time.perf_counter()
+                for i, (timestamp, row) in enumerate(new.iterrows()):
+                    yield Bar(symbol, timestamp, row['Open'], row['High'], row['Low'], row['Close'], row['Volume'],
+                              closed=i < len(new) - 1, received_at=received_at)
+                self._last_seen[symbol] = frame.index[-1]
+
+            await asyncio.sleep(self.poll_seconds)
+
+
+class SymbolStream:
+    """Bounded per-symbol state: raw bar ring, scaled feature ring and indicator state
+
+    Until sequence_length bars have closed the bars are only buffered; then
+    indicators are computed once over the buffer and every later bar is
+    applied in O(1) and pushed onto the scaled feature WindowRing.
+    """
+
+    def __init__(self, symbol, feature_columns, feature_scaler, sequence_length, capacity):
+        self.symbol = symbol
+        self.feature_columns = feature_columns
+        self.feature_scale = np.asarray(feature_scaler.scale_, dtype=np.float64)
+        self.feature_min = np.asarray(feature_scaler.min_, dtype=np.float64)
+        self.sequence_length = sequence_length
+
+        self.capacity = capacity
+        self.bars = np.empty((capacity, len(OHLCV)))
+        self.timestamps = np.empty(capacity, dtype='datetime64[ns]')
+        self.count = 0
+
+        self.ring = None
+        self.state = None
+        self.pending = None
+        self.last_closed = None
+
+    @property
+    def ready(self):
+        return self.state is not None
+
+    def window(self):
+        """Current scaled model input (sequence_length, n_features), a view of the ring"""
+        return self.ring.window()
+
+    def history(self):
+        """Buffered bars, oldest first, as an OHLCV DataFrame"""
+        n = min(self.count, self.capacity)
+        order = (np.arange(n) + (self.count - n)) % self.capacity
+        return pd.DataFrame(self.bars[order], columns=OHLCV, index=pd.DatetimeIndex(self.timestamps[order]))
+
+    def add(self, bar):
+        """Take a bar; returns the closed bar if this completed one, else None"""
+        if self.last_closed is not None and bar.timestamp <= self.last_closed.timestamp:
+            return None  # late or duplicate
+
+        if not bar.closed:
+            closed = self.pending if self.pending is not None and bar.timestamp > self.pending.timestamp else None
+            self.pending = bar
+            if closed is None:
+                return None
+        else:
+            closed = bar
+            if self.pending is not None and self.pending.timestamp <= bar.timestamp:
+                self.pending = None
+
+        self._close(closed)
+        return closed
+
+    def warm_start(self, frame):
+        """Seed from earlier closed bars (an OHLCV frame) instead of waiting for live ones
+
+        Live bars at or before the last warm bar are then ignored as duplicates.
+        """
+        if frame is None or frame.empty:
+            return
+        frame = frame[list(OHLCV)]
+        if self.last_closed is not None:
+            frame = frame[frame.index > self.last_closed.timestamp]
+        # Older bars would only be overwritten in the ring
+        frame = frame.iloc[-self.capacity:]
+        if frame.empty:
+            return
+        values = frame.to_numpy(dtype=np.float64)
+        for timestamp, row in zip(frame.index, values):
+            self._append(timestamp, row)
+
+        self.last_closed = Bar(self.symbol, frame.index[-1], *values[-1])
+        if self.count >= self.sequence_length:
+            self._seed()
+
+    def _close(self, bar):
+        values = np.array([bar.open, bar.high, bar.low, bar.close, bar.volume], dtype=np.float64)
+        self._append(bar.timestamp, values)
+        self.last_closed = bar
+
+        if self.state is None:
+            if self.count >= self.sequence_length:
+                self._seed()
+            return
+
+        row = self.state.update(*(values[i:i + 1] for i in range(len(OHLCV))))
+        row.update(zip(OHLCV, values))
+        features = np.array([float(np.asarray(row[c]).ravel()[0]) for c in self.feature_columns])
+        self.ring.push(features * self.feature_scale + self.feature_min)
+
+    def _append(self, timestamp, values):
+        position = self.count % self.capacity
+        self.bars[position] = values
+        timestamp = pd.Timestamp(timestamp)
+        self.timestamps[position] = (timestamp.tz_localize(None) if timestamp.tzinfo else timestamp).to_datetime64()
+        self.count += 1
+
+    def _seed(self):
+        """Batch-compute indicators over the buffer and fill the feature ring"""
+        history = indicator_frame(self.history())
+        features = history[self.feature_columns].bfill().ffill().values
+        features = features[-self.sequence_length:]
+
+        self.ring = WindowRing(features * self.feature_scale + self.feature_min)
+        self.state = history_state(history)
+
+
+class StreamingForecaster:
+    """Ingest live bars for many symbols on one asyncio loop and re-forecast on bar close
+
+    Sources are async iterators of Bar. Every closed bar updates its
+    symbol's stream in O(1) and queues a forecast; forecasts for symbols
+    whose bars close within batch_window_ms of each other run as one batched
+    rollout in a worker thread, so ingestion never waits on the model.
+    on_forecast(symbol, bar, prices, lag_seconds) is called for each result.
+    """
+
+    def __init__(self, predictor, horizon=None, batch_window_ms=None, capacity=None, on_forecast=None):
+        if not predictor.is_ready:
+            raise ValueError("Predictor not initialized")
+        self.predictor = predictor
+        self.horizon = horizon or STREAMING_SETTINGS['forecast_steps']
+        window_ms = STREAMING_SETTINGS['batch_window_ms'] if batch_window_ms is None else batch_window_ms
+        self.batch_window = window_ms / 1000
+        self.capacity = capacity or STREAMING_SETTINGS['buffer_bars']
+        self.on_forecast = on_forecast
+
+        self.streams = {}
+        self.latest = {}  # symbol -> (bar timestamp, predicted prices)
+        self.lags = deque(maxlen=10000)
+        self.stats = {'bars': 0, 'closed_bars': 0, 'forecasts': 0, 'batches': 0, 'dropped': 0, 'errors': 0}
+        self._queue = None
+
+    def stream(self, symbol):
+        """The SymbolStream for a symbol, created on first use"""
+        stream = self.streams.get(symbol)
+        if stream is None:
+            scaler_info = self.predictor.model_loader.get_scaler_for_stock(symbol)
+            stream = self.streams[symbol] = SymbolStream(
+                symbol,
+                self.predictor.model_loader.config['feature_columns'],
+                scaler_info['feature_scaler'],
+                APP_SETTINGS['sequence_length'],
+                self.capacity
+            )
+        return stream
+
+    def warm(self, symbols, period=None):
+        """Seed each symbol's stream from the collector's minute history
+
+        The newest bar is left out since it may still be forming; the
+        source delivers it again. Returns the number of symbols that are
+        ready to forecast from the first live bar.
+        """
+        period = period or STREAMING_SETTINGS['warm_period']
+        collector = self.predictor.data_collector
+        collector.prefetch(symbols, period=period, interval=STREAMING_SETTINGS['interval'])
+        for symbol in symbols:
+            history = collector.get_stock_data(symbol, period=period, interval=STREAMING_SETTINGS['interval'])
+            if history is not None and len(history) > 1:
+                self.stream(symbol).warm_start(history.iloc[:-1])
+        return sum(self.streams[symbol].ready for symbol in symbols if symbol in self.streams)
+
+    async def run(self, *sources):
+        """Consume every source until all are exhausted, forecasting as bars close
+
+        Streams for symbols a source declares up front (its `symbols`) are
+        warmed from cached history first.
+        """
+        symbols = [symbol for source in sources for symbol in getattr(source, 'symbols', ())]
+        if symbols:
+            await asyncio.to_thread(self.warm, list(dict.fromkeys(symbols)))
+        self._queue = asyncio.Queue()
+        worker = asyncio.create_task(self._forecast_loop())
+        try:
+            await asyncio.gather(*(self._consume(source) for source in sources))
+            await self._queue.put(None)
+            await worker
+        finally:
+            worker.cancel()
+
+    def ingest(self, bar):
+        """Apply one bar; queue a forecast if it closed a bar on a warmed-up stream"""
+        self.stats['bars'] += 1
+        stream = self.stream(bar.symbol)
+        closed = stream.add(bar)
+        if closed is None:
+            return
+        self.stats['closed_bars'] += 1
+        if stream.ready and self._queue is not None:
+            self._queue.put_nowait((bar.symbol, closed))
+
+    def info(self):
+        """Counters and end-to-end lag percentiles (bar received -> forecast ready)"""
+        lags = np.array(self.lags) * 1000
+        percentiles = {
+            f'lag_p{q}_ms': float(np.percentile(lags, q)) if len(lags) else 0.0 for q in (50, 95, 99)
+        }
+        return dict(self.stats, symbols=len(self.streams), **percentiles)
+
+    async def _consume(self, source):
+        async for bar in source.bars():
+            self.ingest(bar)
+            # Let the forecast loop collect work between bars of a large burst
+            await asyncio.sleep(0)
+
+    async def _forecast_loop(self):
+        loop = asyncio.get_running_loop()
+        done = False
+        while not done:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = {item[0]: item[1]}
+            deadline = loop.time() + self.batch_window
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    done = True
+                    break
+                if item[0] in batch:
+                    self.stats['dropped'] += 1  # superseded by a newer bar before it was forecast
+                batch[item[0]] = item[1]
+
+            # Snapshot windows and state on the loop thread; the rollout runs off it
+            symbols = list(batch)
+            inputs = self._batch_inputs(symbols)
+            try:
+                prices = await asyncio.to_thread(self._rollout, *inputs)
+            except Exception as e:
+                print(f"Streaming forecast error: {e}")
+                self.stats['errors'] += 1
+                continue
+            finished = time.perf_counter()
+
+            self.stats['batches'] += 1
+            for symbol, row in zip(symbols, prices):
+                bar = batch[symbol]
+                lag = finished - bar.received_at
+                self.lags.append(lag)
+                self.latest[symbol] = (bar.timestamp, row.tolist())
+                self.stats['forecasts'] += 1
+                if self.on_forecast is not None:
+                    self.on_forecast(symbol, bar, row.tolist(), lag)
+
+    def _batch_inputs(self, symbols):
+        streams = [self.streams[symbol] for symbol in symbols]
+        scalers = [self.predictor.model_loader.get_scaler_for_stock(symbol) for symbol in symbols]
+        target_scale, target_min = self.predictor._stack_scalers(scalers, 'target_scaler')
+        return (
+            np.stack([stream.window() for stream in streams]),
+            BatchIndicatorState.concat([stream.state for stream in streams]),
+            np.stack([stream.feature_scale for stream in streams]),
+            np.stack([stream.feature_min for stream in streams]),
+            target_scale[:, 0],
+            target_min[:, 0],
+        )
+
+    def _rollout(self, windows, state, feature_scale, feature_min, target_scale, target_min):
+        return self.predictor.rollout.run(
+            windows, state, feature_scale, feature_min, target_scale, target_min, self.horizon
+        )
+
+
+if __name__ == '__main__':
+    # python -m src.streaming (--replay FILE | SYMBOL ...): intraday re-forecasting on every closed bar
+    import argparse
+    from .predictor import StockPredictor
+
+    parser = argparse.ArgumentParser(description="Re-forecast on every closed intraday bar")
+    parser.add_argument('symbols', nargs='*', help="poll these symbols from Yahoo")
+    parser.add_argument('--replay', help="replay a minute-bar CSV instead of polling")
+    parser.add_argument('--speed', type=float, default=STREAMING_SETTINGS['replay_speed'])
+    parser.add_argument('--steps', type=int, default=STREAMING_SETTINGS['forecast_steps'])
+    args = parser.parse_args()
+    if not args.replay and not args.symbols:
+        parser.error("give --replay FILE or at least one symbol")
+
+    predictor = StockPredictor()
+    if not predictor.initialize():
+        raise SystemExit("Model files not available")
+
+    def report(symbol, bar, prices, lag):
+        print(f"{bar.timestamp} {symbol} close {bar.close:.2f} -> {prices[-1]:.2f} ({lag * 1000:.1f} ms)")
+
+    if args.replay:
+        source = ReplaySource(args.replay, args.speed)
+    else:
+        source = YahooPollingSource(args.symbols, predictor.data_collector)
+    streamer = StreamingForecaster(predictor, horizon=args.steps, on_forecast=report)
+    try:
+        asyncio.run(streamer.run(source))
+    except KeyboardInterrupt:
+        pass
+    print(streamer.info())
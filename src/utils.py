@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
+from .instrumentation import timed
 
+@timed('add_technical_indicators')
 def add_technical_indicators(df):
     """Add technical indicators to stock data"""
     df = df.copy()
@@ -27,7 +29,7 @@ def add_technical_indicators(df):
     df['RSI'] = 100 - (100 / (1 + rs))
     
     # Bollinger Bands
-    df['BB_middle'] = df['Close'].rolling(window=20).mean()
+    df['BB_middle'] = df['MA_20']
     bb_std = df['Close'].rolling(window=20).std()
     df['BB_upper'] = df['BB_middle'] + (bb_std * 2)
     df['BB_lower'] = df['BB_middle'] - (bb_std * 2)
@@ -43,6 +45,10 @@ def add_technical_indicators(df):
     
     return df
 
+def clean_symbol(symbol):
+    """Exchange-neutral key for a symbol: BBCA.JK and BBCA -> BBCA, ^JKSE -> JKSE"""
+    return symbol.upper().replace('.JK', '').replace('^', '')
+
 def calculate_price_metrics(data):
     """Calculate price performance metrics"""
     current_price = data['Close'].iloc[-1]
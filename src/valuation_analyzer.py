@@ -1,21 +1,160 @@
-import openai
+import asyncio
+import hashlib
+import random
+import re
+import threading
+import time
+import weakref
+from openai import AsyncAzureOpenAI, AzureOpenAI
 from azure.identity import DefaultAzureCredential
 import json
-from config import AZURE_OPENAI_CONFIG
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from config import AZURE_OPENAI_CONFIG, VALUATION_SETTINGS
+from . import instrumentation
+from .instrumentation import timed
+
+SYSTEM_PROMPT = "You are a financial analyst specializing in Indonesian stock market."
+
+# Size of the pieces a cached report is replayed in through the streaming API
+REPLAY_CHUNK_CHARS = 40
+
+class ResponseCache:
+    """Completion text keyed on a normalized-prompt hash, valid until local midnight
+    
+    Expired entries are purged on every put and the oldest entries are
+    dropped beyond max_entries, so the cache stays bounded.
+    """
+    
+    def __init__(self, timezone=None, max_entries=None):
+        self.timezone = ZoneInfo(timezone or VALUATION_SETTINGS['cache_timezone'])
+        self.max_entries = max_entries or VALUATION_SETTINGS['cache_max_entries']
+        self._entries = OrderedDict()  # key -> (text, expires_at), oldest first
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+    
+    def key(self, prompt, **params):
+        """Hash of the prompt with whitespace collapsed, plus request parameters"""
+        normalized = re.sub(r'\s+', ' ', prompt).strip()
+        payload = json.dumps({'prompt': normalized, **params}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() < entry[1]:
+                self.stats['hits'] += 1
+                return entry[0]
+            self._entries.pop(key, None)
+            self.stats['misses'] += 1
+            return None
+    
+    def put(self, key, text):
+        now = datetime.now(self.timezone)
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), self.timezone)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (text, midnight.timestamp())
+            self._purge(now.timestamp())
+    
+    def _purge(self, now):
+        # Every entry expires at the same midnight, so expired ones sit at the front
+        while self._entries:
+            oldest_key, (_, expires_at) = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[oldest_key]
+            self.stats['evictions'] += 1
+    
+    def info(self):
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries))
+
+class StreamBroadcast:
+    """One upstream completion stream replayed to any number of readers
+    
+    Readers that join late first get every chunk published so far, then
+    follow the live stream.
+    """
+    
+    def __init__(self):
+        self.chunks = []
+        self.connected = False
+        self.done = False
+        self.error = None
+        self._condition = threading.Condition()
+    
+    def connect(self):
+        """Mark the upstream response as open; stall detection starts from here"""
+        with self._condition:
+            self.connected = True
+            self._condition.notify_all()
+    
+    def publish(self, chunk):
+        with self._condition:
+            self.chunks.append(chunk)
+            self._condition.notify_all()
+    
+    def finish(self, error=None):
+        with self._condition:
+            self.done = True
+            self.error = error
+            self._condition.notify_all()
+    
+    def subscribe(self, timeout=None):
+        """Yield every chunk; raises the upstream error, or TimeoutError if the stream stalls
+        
+        Waiting for a concurrency slot and connection retries is bounded by
+        the pump, which finishes with an error if it cannot connect; the
+        stall timeout only applies once the response is open.
+        """
+        timeout = timeout or VALUATION_SETTINGS['timeout_seconds']
+        position = 0
+        with self._condition:
+            self._condition.wait_for(lambda: self.connected or self.done)
+        while True:
+            with self._condition:
+                if not self._condition.wait_for(lambda: len(self.chunks) > position or self.done, timeout):
+                    raise TimeoutError("Valuation stream stalled")
+                chunks = self.chunks[position:]
+                done, error = self.done, self.error
+            position += len(chunks)
+            yield from chunks
+            if done and position == len(self.chunks):
+                if error is not None:
+                    raise error
+                return
+
 
 class ValuationAnalyzer:
     def __init__(self):
         self.client = None
+        self.async_client = None
+        self.cache = ResponseCache()
+        self.stats = {'requests': 0, 'retries': 0, 'coalesced': 0, 'failures': 0}
+        self.stream_metrics = deque(maxlen=100)
+        self._semaphore = threading.BoundedSemaphore(VALUATION_SETTINGS['max_concurrency'])
+        self._inflight = {}
+        self._inflight_streams = {}  # key -> StreamBroadcast
+        self._inflight_lock = threading.Lock()
+        self._async_semaphores = weakref.WeakKeyDictionary()  # event loop -> asyncio.Semaphore
         self._setup_openai_client()
     
     def _setup_openai_client(self):
         """Setup Azure OpenAI client"""
         try:
-            openai.api_type = "azure"
-            openai.api_base = AZURE_OPENAI_CONFIG['endpoint']
-            openai.api_key = AZURE_OPENAI_CONFIG['api_key']
-            openai.api_version = AZURE_OPENAI_CONFIG['api_version']
-            self.client = openai
+            # Retries are handled here, with backoff shared by the sync and async paths
+            settings = dict(
+                azure_endpoint=AZURE_OPENAI_CONFIG['endpoint'],
+                api_key=AZURE_OPENAI_CONFIG['api_key'],
+                api_version=AZURE_OPENAI_CONFIG['api_version'],
+                timeout=VALUATION_SETTINGS['timeout_seconds'],
+                max_retries=0
+            )
+            self.client = AzureOpenAI(**settings)
+            self.async_client = AsyncAzureOpenAI(**settings)
         except Exception as e:
             print(f"Error setting up OpenAI client: {e}")
     
@@ -30,22 +169,282 @@ class ValuationAnalyzer:
                 stock_name, current_price, predicted_prices, historical_data
             )
             
-            # Call Azure OpenAI
-            response = self.client.ChatCompletion.create(
-                engine=AZURE_OPENAI_CONFIG['deployment_name'],
-                messages=[
-                    {"role": "system", "content": "You are a financial analyst specializing in Indonesian stock market."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=800,
-                temperature=0.7
+            return self._complete(prompt)
+            
+        except Exception as e:
+            return f"Error in valuation analysis: {str(e)}"
+    
+    def stream_stock_valuation(self, stock_name, current_price, predicted_prices, historical_data=None, metrics=None):
+        """Yield the valuation report in chunks as they arrive
+        
+        Cached reports are replayed through the same generator, and sessions
+        asking for the same report while it streams share one upstream call.
+        Time to first chunk and total time are written into `metrics` (if
+        given) and appended to stream_metrics when the stream finishes.
+        """
+        if not self.client:
+            yield "Azure OpenAI not configured properly"
+            return
+        
+        start = time.perf_counter()
+        metrics = metrics if metrics is not None else {}
+        metrics.update({'stock': stock_name, 'cached': False, 'ttft_seconds': None, 'total_seconds': None, 'chunks': 0})
+        
+        try:
+            prompt = self._create_valuation_prompt(
+                stock_name, current_price, predicted_prices, historical_data
             )
+            key = self.cache.key(prompt, deployment=AZURE_OPENAI_CONFIG['deployment_name'])
+            cached = self.cache.get(key)
             
-            return response.choices[0].message.content
+            if cached is not None:
+                metrics['cached'] = True
+                chunks = (cached[i:i + REPLAY_CHUNK_CHARS] for i in range(0, len(cached), REPLAY_CHUNK_CHARS))
+            else:
+                chunks = self._join_stream(prompt, key).subscribe()
             
+            for chunk in chunks:
+                if metrics['ttft_seconds'] is None:
+                    metrics['ttft_seconds'] = time.perf_counter() - start
+                metrics['chunks'] += 1
+                yield chunk
+                
+        except Exception as e:
+            yield f"Error in valuation analysis: {str(e)}"
+        finally:
+            metrics['total_seconds'] = time.perf_counter() - start
+            self.stream_metrics.append(metrics)
+            if not metrics['cached']:
+                instrumentation.metrics.observe('openai_stream', metrics['total_seconds'])
+                if metrics['ttft_seconds'] is not None:
+                    instrumentation.metrics.observe('openai_first_chunk', metrics['ttft_seconds'])
+    
+    def _join_stream(self, prompt, key):
+        """The in-flight broadcast for key, starting the upstream stream if there is none
+        
+        The upstream is read on its own thread, so the report still completes
+        (and is cached) if the session that started it stops reading.
+        """
+        with self._inflight_lock:
+            broadcast = self._inflight_streams.get(key)
+            if broadcast is not None:
+                self.stats['coalesced'] += 1
+                return broadcast
+            broadcast = self._inflight_streams[key] = StreamBroadcast()
+        
+        threading.Thread(
+            target=self._pump_stream, args=(prompt, key, broadcast), name='valuation-stream', daemon=True
+        ).start()
+        return broadcast
+    
+    def _pump_stream(self, prompt, key, broadcast):
+        error = None
+        try:
+            for chunk in self._stream_completion(prompt, key, on_connect=broadcast.connect):
+                broadcast.publish(chunk)
+        except Exception as e:
+            error = e
+        finally:
+            # Retire the entry before finishing: by then the text is cached for later callers
+            with self._inflight_lock:
+                self._inflight_streams.pop(key, None)
+            broadcast.finish(error)
+    
+    def _stream_completion(self, prompt, key, on_connect=None):
+        """Stream a completion under the concurrency limit and cache the full text
+        
+        on_connect() is called once the response is open, before the first chunk.
+        """
+        attempts = 0
+        while True:
+            attempts += 1
+            self._semaphore.acquire()
+            try:
+                self.stats['requests'] += 1
+                response = self.client.chat.completions.create(
+                    **self._request_params(prompt), stream=True
+                )
+                break
+            except Exception:
+                # Only the connection is retried, off the semaphore; a stream that fails midway is surfaced
+                self._semaphore.release()
+                if attempts > VALUATION_SETTINGS['max_retries']:
+                    self.stats['failures'] += 1
+                    raise
+                self.stats['retries'] += 1
+                backoff = VALUATION_SETTINGS['backoff_seconds'] * 2 ** (attempts - 1)
+                time.sleep(random.uniform(0, backoff))
+        
+        try:
+            if on_connect is not None:
+                on_connect()
+            parts = []
+            for event in response:
+                if not event.choices:
+                    continue
+                content = event.choices[0].delta.content
+                if content:
+                    parts.append(content)
+                    yield content
+        finally:
+            self._semaphore.release()
+        
+        self.cache.put(key, ''.join(parts))
+    
+    async def analyze_stock_valuation_async(self, stock_name, current_price, predicted_prices, historical_data=None):
+        """Async variant of analyze_stock_valuation on the async client; shares its cache and de-duplication"""
+        if not self.async_client:
+            return "Azure OpenAI not configured properly"
+        
+        try:
+            prompt = self._create_valuation_prompt(
+                stock_name, current_price, predicted_prices, historical_data
+            )
+            return await self._complete_async(prompt)
         except Exception as e:
             return f"Error in valuation analysis: {str(e)}"
     
+    async def analyze_universe(self, requests):
+        """Valuation reports for many stocks concurrently
+        
+        requests maps stock name -> (current_price, predicted_prices); returns
+        stock name -> report text. At most max_concurrency calls per event
+        loop are in flight. Run it with asyncio.run() or await it from a
+        running loop.
+        """
+        names = list(requests)
+        reports = await asyncio.gather(*(
+            self.analyze_stock_valuation_async(name, *requests[name]) for name in names
+        ))
+        return dict(zip(names, reports))
+    
+    def _complete(self, prompt):
+        """Cached, de-duplicated chat completion for a user prompt"""
+        key, cached, future, leader = self._claim(prompt)
+        if cached is not None:
+            return cached
+        if not leader:
+            return future.result(timeout=VALUATION_SETTINGS['inflight_wait_seconds'])
+        
+        text = error = None
+        try:
+            text = self._request_with_retry(prompt)
+            return text
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._settle(key, future, text, error)
+    
+    async def _complete_async(self, prompt):
+        """_complete on the async client; waits on in-flight requests from either path"""
+        key, cached, future, leader = self._claim(prompt)
+        if cached is not None:
+            return cached
+        if not leader:
+            # Shielded: a follower that times out or is cancelled must not cancel the shared future
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)), VALUATION_SETTINGS['inflight_wait_seconds']
+            )
+        
+        text = error = None
+        try:
+            text = await self._request_with_retry_async(prompt)
+            return text
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._settle(key, future, text, error)
+    
+    def _claim(self, prompt):
+        """(key, cached text, future, leader): identical prompts from concurrent callers share one request"""
+        key = self.cache.key(prompt, deployment=AZURE_OPENAI_CONFIG['deployment_name'])
+        cached = self.cache.get(key)
+        if cached is not None:
+            return key, cached, None, False
+        
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.stats['coalesced'] += 1
+        return key, None, future, leader
+    
+    def _settle(self, key, future, text=None, error=None):
+        """Publish the leader's result (cached on success) and retire the in-flight entry
+        
+        Runs however the leader exits. If it was cancelled or interrupted,
+        waiting followers get a RuntimeError rather than the cancellation.
+        """
+        # Cache before retiring the entry so no caller in between starts a second request
+        if error is None:
+            self.cache.put(key, text)
+        with self._inflight_lock:
+            self._inflight.pop(key, None)
+        if error is None:
+            future.set_result(text)
+        else:
+            self.stats['failures'] += 1
+            if not isinstance(error, Exception):
+                error = RuntimeError(f"Valuation request was interrupted ({type(error).__name__})")
+            future.set_exception(error)
+    
+    @timed('openai_request')
+    def _request_with_retry(self, prompt):
+        """Call Azure OpenAI under the concurrency limit, retrying with jittered backoff"""
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                with self._semaphore:
+                    self.stats['requests'] += 1
+                    response = self.client.chat.completions.create(**self._request_params(prompt))
+                return response.choices[0].message.content
+            except Exception:
+                if attempts > VALUATION_SETTINGS['max_retries']:
+                    raise
+                self.stats['retries'] += 1
+                backoff = VALUATION_SETTINGS['backoff_seconds'] * 2 ** (attempts - 1)
+                time.sleep(random.uniform(0, backoff))
+    
+    @timed('openai_request')
+    async def _request_with_retry_async(self, prompt):
+        """_request_with_retry on the async client, limited per event loop"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._async_semaphores[loop] = asyncio.Semaphore(VALUATION_SETTINGS['max_concurrency'])
+        
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                async with semaphore:
+                    self.stats['requests'] += 1
+                    response = await self.async_client.chat.completions.create(**self._request_params(prompt))
+                return response.choices[0].message.content
+            except Exception:
+                if attempts > VALUATION_SETTINGS['max_retries']:
+                    raise
+                self.stats['retries'] += 1
+                backoff = VALUATION_SETTINGS['backoff_seconds'] * 2 ** (attempts - 1)
+                await asyncio.sleep(random.uniform(0, backoff))
+    
+    def _request_params(self, prompt):
+        """Chat completion arguments shared by every call path"""
+        return dict(
+            model=AZURE_OPENAI_CONFIG['deployment_name'],
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=VALUATION_SETTINGS['max_tokens'],
+            temperature=VALUATION_SETTINGS['temperature']
+        )
+    
     def _create_valuation_prompt(self, stock_name, current_price, predicted_prices, historical_data):
         """Create prompt for valuation analysis"""
         avg_predicted = sum(predicted_prices) / len(predicted_prices)
@@ -3,25 +3,31 @@ import sys
 import os
 from pathlib import Path
 
-# Add src directory to Python path
+# Add project root to Python path; src modules use package-relative imports
 current_dir = Path(__file__).parent
-src_dir = current_dir / "src"
-sys.path.insert(0, str(src_dir))
 sys.path.insert(0, str(current_dir))
 
 # Now import modules
-from data_collector import DataCollector
-from model_loader import ModelLoader
-from predictor import StockPredictor
-from valuation_analyzer import ValuationAnalyzer
-from utils import add_technical_indicators, calculate_price_metrics
-from config import INDONESIAN_STOCKS, AZURE_OPENAI_CONFIG, APP_SETTINGS
+from src.data_collector import DataCollector
+from src.model_loader import ModelLoader
+from src.predictor import StockPredictor
+from src.inference_server import InferenceClient
+from src.valuation_analyzer import ValuationAnalyzer
+from src.market_overview import MarketOverview
+from src.utils import add_technical_indicators, calculate_price_metrics
+from src import instrumentation
+from config import INDONESIAN_STOCKS, AZURE_OPENAI_CONFIG, APP_SETTINGS, INFERENCE_SERVER_SETTINGS, DATA_SERVICE_SETTINGS
 
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+# Cached frames are shared by every session; with copy-on-write a session
+# that modifies one gets its own copy. Set once here, before any frame exists.
+if DATA_SERVICE_SETTINGS['copy_on_write']:
+    pd.set_option('mode.copy_on_write', True)
+
 # App configuration
 st.set_page_config(
     page_title="Indonesia Stock Prediction",
@@ -33,22 +39,49 @@ st.set_page_config(
 @st.cache_resource
 def init_components():
     try:
-        data_collector = DataCollector()
-        model_loader = ModelLoader()
-        predictor = StockPredictor()
+        # One market data service per process, shared by every session and component
+        data_collector = DataCollector.shared()
+        predictor = StockPredictor(data_collector=data_collector)
         valuation_analyzer = ValuationAnalyzer()
         
-        # Initialize predictor
-        if predictor.initialize():
-            st.success("✅ Model loaded successfully!")
+        if INFERENCE_SERVER_SETTINGS['socket_path']:
+            # Forecasts come from the shared inference server; this process never loads TensorFlow
+            forecaster = InferenceClient()
+            forecaster.connect_async()
         else:
-            st.error("❌ Failed to load model")
+            # Load TensorFlow and the model in the background so the
+            # Analysis tab can render while it finishes
+            predictor.initialize_async()
+            forecaster = predictor
+        
+        # Cache stats feed the metrics export; no-ops unless instrumentation is enabled
+        instrumentation.metrics.register_source('market_data_cache', data_collector.cache.info)
+        if data_collector.shared_store is not None:
+            instrumentation.metrics.register_source('shared_market_store', data_collector.shared_store.info)
+        instrumentation.metrics.register_source('forecast_cache', predictor.forecast_cache.info)
+        if predictor.forecast_store is not None:
+            instrumentation.metrics.register_source('forecast_store', predictor.forecast_store.info)
+        instrumentation.metrics.register_source('valuation_cache', valuation_analyzer.cache.info)
+        instrumentation.start_exporters()
             
-        return data_collector, predictor, valuation_analyzer
+        return data_collector, predictor, forecaster, valuation_analyzer
         
     except Exception as e:
         st.error(f"Error initializing components: {e}")
-        return None, None, None
+        return None, None, None, None
+
+def model_status(predictor):
+    """Show model loading state; returns True once predictions can run"""
+    if predictor.is_ready:
+        return True
+    
+    # A finished load (or server connect) that left the predictor unready means it failed
+    if predictor.ready is not None and predictor.ready.done():
+        error = predictor.ready.exception()
+        st.error(f"❌ Failed to load model: {error}" if error else "❌ Failed to load model")
+    else:
+        st.info("⏳ Model is still loading, please try again in a moment.")
+    return False
 
 # Main app
 st.title("🇮🇩 Indonesia Stock Prediction & Valuation")
@@ -73,11 +106,43 @@ with st.sidebar:
     )
 
 # Load components
-data_collector, predictor, valuation_analyzer = init_components()
+data_collector, predictor, forecaster, valuation_analyzer = init_components()
 
-if all([data_collector, predictor, valuation_analyzer]):
+if all([data_collector, predictor, forecaster, valuation_analyzer]):
+    with st.sidebar:
+        with st.expander("⚙️ Cache Stats"):
+            st.caption("Market data (shared by all sessions)")
+            st.json(data_collector.cache.info())
+            if data_collector.shared_store is not None:
+                st.json(data_collector.shared_store.info())
+            st.caption("Forecast cache")
+            st.json(predictor.forecast_cache.info())
+            if predictor.forecast_store is not None:
+                st.caption("Precomputed forecasts")
+                st.json(predictor.forecast_store.info())
+            if forecaster is not predictor:
+                st.caption("Inference server")
+                try:
+                    st.json(forecaster.stats())
+                except Exception as e:
+                    st.caption(f"unavailable: {e}")
+        
+        if instrumentation.ENABLED:
+            with st.expander("🔍 Pipeline Metrics"):
+                snapshot = instrumentation.metrics.snapshot()
+                if snapshot['stages']:
+                    st.dataframe(
+                        pd.DataFrame(snapshot['stages']).T[['count', 'p50_ms', 'p95_ms', 'p99_ms']],
+                        use_container_width=True
+                    )
+                if snapshot['values']:
+                    st.dataframe(pd.DataFrame(snapshot['values']).T, use_container_width=True)
+                st.json(snapshot['counters'])
+    
     # Main content tabs
-    tab1, tab2, tab3 = st.tabs(["📊 Stock Analysis", "🤖 Price Prediction", "💰 Valuation Report"])
+    tab1, tab2, tab3, tab4 = st.tabs(
+        ["📊 Stock Analysis", "🤖 Price Prediction", "💰 Valuation Report", "🌏 Market Overview"]
+    )
     
     with tab1:
         st.subheader(f"📊 Analysis for {selected_stock_name}")
@@ -135,14 +200,27 @@ if all([data_collector, predictor, valuation_analyzer]):
     with tab2:
         st.subheader(f"🤖 Price Prediction for {selected_stock_name}")
         
-        if st.button("🚀 Generate Prediction", type="primary"):
+        show_bands = st.checkbox(
+            "Show uncertainty bands",
+            help="Quantiles from simulated paths using the model's historical forecast errors"
+        )
+        if show_bands and forecaster is predictor and predictor.is_ready:
+            # Start the error backtest now so the bands use it by the time the button is pressed
+            predictor.bootstrap.prepare(selected_stock_code, prediction_days)
+        
+        if model_status(forecaster) and st.button("🚀 Generate Prediction", type="primary"):
             with st.spinner("Generating predictions..."):
                 try:
-                    # Clean stock symbol for prediction
-                    stock_symbol = selected_stock_code.replace('.JK', '').replace('^', '')
+                    # Predict on the exchange symbol; scaler and store lookups normalize it
+                    stock_symbol = selected_stock_code
                     
                     # Generate predictions
-                    predictions = predictor.predict_prices(stock_symbol, days_ahead=prediction_days)
+                    bands = None
+                    if show_bands:
+                        bands = forecaster.predict_quantiles(stock_symbol, days_ahead=prediction_days)
+                        predictions = bands['point'] if bands else None
+                    else:
+                        predictions = forecaster.predict_prices(stock_symbol, days_ahead=prediction_days)
                     
                     if predictions is not None:
                         st.success("✅ Prediction completed!")
@@ -158,10 +236,16 @@ if all([data_collector, predictor, valuation_analyzer]):
                             'Date': future_dates,
                             'Predicted_Price': predictions
                         })
+                        band_columns = []
+                        if bands:
+                            for level, values in zip(bands['levels'], bands['quantiles']):
+                                column = f"P{level * 100:g}"
+                                pred_df[column] = values
+                                band_columns.append(column)
                         
                         # Display predictions table
                         st.dataframe(
-                            pred_df.style.format({'Predicted_Price': 'Rp {:,.0f}'}),
+                            pred_df.style.format({c: 'Rp {:,.0f}' for c in ['Predicted_Price'] + band_columns}),
                             use_container_width=True
                         )
                         
@@ -177,6 +261,22 @@ if all([data_collector, predictor, valuation_analyzer]):
                             line=dict(color='blue')
                         ))
                         
+                        # Quantile bands, outermost pair first
+                        if bands:
+                            n_levels = len(bands['levels'])
+                            for i in range(n_levels // 2):
+                                lower, upper = bands['quantiles'][i], bands['quantiles'][n_levels - 1 - i]
+                                label = f"P{bands['levels'][i] * 100:g}–P{bands['levels'][n_levels - 1 - i] * 100:g}"
+                                fig_pred.add_trace(go.Scatter(
+                                    x=future_dates, y=upper, mode='lines',
+                                    line=dict(width=0), showlegend=False, hoverinfo='skip'
+                                ))
+                                fig_pred.add_trace(go.Scatter(
+                                    x=future_dates, y=lower, mode='lines', name=label,
+                                    line=dict(width=0), fill='tonexty',
+                                    fillcolor=f'rgba(255, 0, 0, {0.12 + 0.12 * i:.2f})'
+                                ))
+                        
                         # Predicted prices
                         fig_pred.add_trace(go.Scatter(
                             x=future_dates,
@@ -192,6 +292,8 @@ if all([data_collector, predictor, valuation_analyzer]):
                         )
                         
                         st.plotly_chart(fig_pred, use_container_width=True)
+                        if bands:
+                            st.caption(f"{bands['n_paths']:,} simulated paths · errors from {bands['method'].replace('_', ' ')}")
                         
                     else:
                         st.error("❌ Prediction failed. Please try again.")
@@ -202,31 +304,74 @@ if all([data_collector, predictor, valuation_analyzer]):
     with tab3:
         st.subheader(f"💰 Valuation Analysis for {selected_stock_name}")
         
-        if st.button("📊 Generate Valuation Report", type="primary"):
-            with st.spinner("Analyzing with AI..."):
+        if model_status(forecaster) and st.button("📊 Generate Valuation Report", type="primary"):
+            try:
+                current_price = stock_data['Close'].iloc[-1]
+                
+                # Get predictions first
+                with st.spinner("Preparing forecast..."):
+                    predictions = forecaster.predict_prices(selected_stock_code, days_ahead=7)
+                
+                if predictions:
+                    # Render the report as it streams in
+                    report = st.empty()
+                    text = ""
+                    metrics = {}
+                    for chunk in valuation_analyzer.stream_stock_valuation(
+                        selected_stock_name,
+                        current_price,
+                        predictions,
+                        stock_data,
+                        metrics=metrics
+                    ):
+                        text += chunk
+                        report.markdown(text + "▌")
+                    report.markdown(text)
+                    
+                    source = "cache" if metrics['cached'] else "Azure OpenAI"
+                    st.caption(
+                        f"First token {metrics['ttft_seconds'] or 0:.2f}s · "
+                        f"total {metrics['total_seconds']:.2f}s · from {source}"
+                    )
+                else:
+                    st.error("❌ Unable to generate predictions for valuation")
+                    
+            except Exception as e:
+                st.error(f"Error during valuation analysis: {str(e)}")
+    
+    with tab4:
+        st.subheader("🌏 Market Overview")
+        
+        if st.button("📈 Load Market Overview"):
+            with st.spinner("Fetching the universe..."):
                 try:
-                    current_price = stock_data['Close'].iloc[-1]
+                    overview = MarketOverview(data_collector)
+                    screener, correlation = overview.compute(INDONESIAN_STOCKS.values())
                     
-                    # Get predictions first
-                    stock_symbol = selected_stock_code.replace('.JK', '').replace('^', '')
-                    predictions = predictor.predict_prices(stock_symbol, days_ahead=7)
+                    names = {code: name for name, code in INDONESIAN_STOCKS.items()}
+                    screener.insert(0, 'name', [names.get(code, code) for code in screener.index])
+                    
+                    st.dataframe(
+                        screener.style.format({
+                            'last_close': 'Rp {:,.0f}', 'high_52w': 'Rp {:,.0f}', 'low_52w': 'Rp {:,.0f}',
+                            **{c: '{:+.2f}%' for c in screener.columns if c.startswith('return_')},
+                            'volatility_pct': '{:.1f}%', 'range_position_pct': '{:.0f}%', 'beta': '{:.2f}'
+                        }, na_rep='-'),
+                        use_container_width=True
+                    )
+                    
+                    fig_corr = go.Figure(data=go.Heatmap(
+                        z=correlation.values,
+                        x=correlation.columns,
+                        y=correlation.index,
+                        zmin=-1, zmax=1,
+                        colorscale='RdBu'
+                    ))
+                    fig_corr.update_layout(title="Daily Return Correlation (1 year)", height=500)
+                    st.plotly_chart(fig_corr, use_container_width=True)
                     
-                    if predictions:
-                        # Generate valuation analysis
-                        analysis = valuation_analyzer.analyze_stock_valuation(
-                            selected_stock_name,
-                            current_price,
-                            predictions,
-                            stock_data
-                        )
-                        
-                        st.success("✅ Valuation analysis completed!")
-                        st.markdown(analysis)
-                    else:
-                        st.error("❌ Unable to generate predictions for valuation")
-                        
                 except Exception as e:
-                    st.error(f"Error during valuation analysis: {str(e)}")
+                    st.error(f"Error building market overview: {str(e)}")
 
 else:
     st.error("❌ Failed to initialize application components. Please check your model files and configuration.")
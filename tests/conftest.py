@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make `config`, `src.*` and the benchmarks' synthetic data and stub model importable when pytest runs from anywhere
+ROOT_DIR = Path(__file__).resolve().parent.parent
+for path in (ROOT_DIR, ROOT_DIR / 'benchmarks'):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from synthetic import synthetic_ohlcv  # noqa: E402
+
+
+@pytest.fixture
+def ohlcv():
+    return synthetic_ohlcv(600)
+
+
+@pytest.fixture
+def stub_predictor():
+    """Build an initialized StockPredictor over {symbol: frame} with the benchmarks' stub model"""
+    from src.cache import MarketDataCache
+    from src.data_collector import DataCollector
+    from src.fetchers import LocalFetcher, RateLimiter
+    from src.predictor import StockPredictor
+    from stub_model import StubModelLoader
+
+    def build(frames):
+        collector = DataCollector(cache=MarketDataCache(), fetcher=LocalFetcher(frames=frames))
+        collector.rate_limiter = RateLimiter(requests_per_second=1000, burst=1000)
+        predictor = StockPredictor(data_collector=collector)
+        predictor.model_loader = StubModelLoader(frames)
+        predictor.forecast_store = None
+        assert predictor.initialize()
+        return predictor
+
+    return build
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtester import Backtester
+from src.rollout import history_state
+from src.utils import add_technical_indicators
+from synthetic import synthetic_ohlcv
+
+SEQUENCE_LENGTH = 60
+
+
+@pytest.fixture
+def frames():
+    return {'SYN.JK': synthetic_ohlcv(300), 'ALT.JK': synthetic_ohlcv(250, start_price=800.0, seed=1)}
+
+
+def test_windows_align_with_origins(stub_predictor, frames):
+    predictor = stub_predictor(frames)
+    data = frames['SYN.JK']
+    results = Backtester(predictor, batch_size=16).run('SYN.JK', horizons=[1, 5], period='max')
+
+    close = data['Close'].to_numpy()
+    rows = data.index.get_indexer(results['origin_date'])
+    # First origin is the last bar of the first full window; the last leaves 5 bars of future
+    assert rows.min() == SEQUENCE_LENGTH - 1
+    assert rows.max() == len(data) - 1 - 5
+    np.testing.assert_array_equal(results['base_close'], close[rows])
+    np.testing.assert_array_equal(results['actual_close'], close[rows + results['horizon'].to_numpy()])
+
+    # A window's forecast is the live forecast made with only the bars up to its origin
+    origin = 200
+    history = data.iloc[:origin + 1]
+    expected = predictor._forecast_batch(
+        [predictor._prepare_window(add_technical_indicators(history))], [history_state(history)],
+        [predictor.model_loader.get_scaler_for_stock('SYN.JK')], 5
+    )[0]
+    row = results[results['origin_date'] == data.index[origin]].set_index('horizon')['predicted_close']
+    np.testing.assert_allclose(row.loc[[1, 5]], expected[[0, 4]], rtol=1e-5)
+
+
+def test_universe_summary_metrics(stub_predictor, frames, tmp_path):
+    predictor = stub_predictor(frames)
+    output = tmp_path / 'results.parquet'
+    summary = Backtester(predictor).run_universe(list(frames), output, horizons=[1, 5], period='max')
+
+    results = pd.read_parquet(output)
+    assert sorted(summary['symbol'].unique()) == ['ALT.JK', 'SYN.JK']
+    for (symbol, horizon), group in results.groupby(['symbol', 'horizon']):
+        scored = summary[(summary['symbol'] == symbol) & (summary['horizon'] == horizon)].iloc[0]
+        error = (group['predicted_close'] - group['actual_close']).abs()
+        hits = np.sign(group['predicted_close'] - group['base_close']) == np.sign(group['actual_close'] - group['base_close'])
+        assert scored['windows'] == len(group)
+        assert scored['mae'] == pytest.approx(error.mean())
+        assert scored['mape'] == pytest.approx((error / group['actual_close']).mean() * 100)
+        assert scored['directional_accuracy'] == pytest.approx(hits.mean() * 100)
+
+
+def test_universe_with_only_short_histories(stub_predictor, tmp_path):
+    predictor = stub_predictor({'SHORT.JK': synthetic_ohlcv(70)})
+    output = tmp_path / 'results.parquet'
+    summary = Backtester(predictor).run_universe(['SHORT.JK'], output, period='max')
+
+    assert summary.empty
+    assert output.exists() and output.with_name('results_summary.parquet').exists()
@@ -0,0 +1,82 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import pytest
+
+from src.cache import MarketDataCache
+
+JAKARTA = ZoneInfo('Asia/Jakarta')
+
+
+def at(day, hour, minute=0):
+    return datetime(2024, 6, day, hour, minute, tzinfo=JAKARTA)
+
+
+def test_entries_expire_after_ttl_during_session():
+    cache = MarketDataCache(session_ttl_seconds=300)
+    written = at(12, 10).timestamp()  # Wednesday mid-session
+
+    assert cache.is_fresh(written, now=at(12, 10, 4))
+    assert not cache.is_fresh(written, now=at(12, 10, 6))
+
+
+def test_data_written_after_close_lasts_until_next_open():
+    cache = MarketDataCache(session_ttl_seconds=300)
+    friday_close = at(14, 16, 30).timestamp()
+
+    assert cache.is_fresh(friday_close, now=at(15, 12))  # Saturday
+    assert cache.is_fresh(friday_close, now=at(17, 8, 59))  # Monday pre-open
+    assert not cache.is_fresh(friday_close, now=at(17, 9, 10))
+    # Written before Friday's close, so stale once the session has ended
+    assert not cache.is_fresh(at(14, 15, 55).timestamp(), now=at(15, 12))
+
+
+def test_stale_entry_is_dropped(ohlcv):
+    cache = MarketDataCache()
+    cache.put(('BBCA.JK', '1y', '1d'), ohlcv, written_at=1.0)
+
+    assert cache.get(('BBCA.JK', '1y', '1d')) is None
+    assert cache.info()['expirations'] == 1
+    assert cache.info()['entries'] == 0
+
+
+def test_lru_eviction_by_bytes_keeps_recently_used(ohlcv):
+    nbytes = int(ohlcv.memory_usage(deep=True).sum())
+    cache = MarketDataCache(max_bytes=int(nbytes * 2.5))
+    for symbol in ('A', 'B'):
+        cache.put((symbol, '1y', '1d'), ohlcv)
+
+    cache.get(('A', '1y', '1d'))
+    cache.put(('C', '1y', '1d'), ohlcv)
+
+    assert cache.get(('B', '1y', '1d')) is None
+    assert cache.get(('A', '1y', '1d')) is not None
+    assert cache.get(('C', '1y', '1d')) is not None
+    assert cache.info()['evictions'] == 1
+    assert cache.info()['bytes'] <= cache.max_bytes
+
+
+def test_oversized_entry_is_still_kept(ohlcv):
+    cache = MarketDataCache(max_bytes=1)
+    cache.put(('A', '1y', '1d'), ohlcv)
+    cache.put(('B', '1y', '1d'), ohlcv)
+
+    assert cache.info()['entries'] == 1
+    assert cache.get(('B', '1y', '1d')) is not None
+
+
+@pytest.mark.parametrize('file_format', ['parquet', 'feather'])
+def test_restarted_cache_reloads_from_disk(tmp_path, ohlcv, file_format):
+    key = ('BBCA.JK', '1y', '1d')
+    MarketDataCache(cache_dir=tmp_path, file_format=file_format).put(key, ohlcv)
+
+    restarted = MarketDataCache(cache_dir=tmp_path, file_format=file_format)
+    data = restarted.get(key)
+
+    assert data is not None
+    pd.testing.assert_frame_equal(data, ohlcv, check_freq=False)
+    assert restarted.info()['disk_hits'] == 1
+    # The second lookup is served from memory
+    restarted.get(key)
+    assert restarted.info()['disk_hits'] == 1
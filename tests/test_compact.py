@@ -0,0 +1,47 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from src.compact import HISTORY_COLUMNS, PRICE_COLUMNS, compact_frame, is_compact, read_feather, write_feather
+
+
+def test_compact_frame_halves_prices_and_keeps_volume(ohlcv):
+    compact = compact_frame(ohlcv)
+
+    assert list(compact.columns) == HISTORY_COLUMNS
+    assert is_compact(compact)
+    assert compact.index.equals(ohlcv.index)
+    relative = np.abs(compact[PRICE_COLUMNS].to_numpy(np.float64) / ohlcv[PRICE_COLUMNS].to_numpy() - 1)
+    assert relative.max() < 1e-6
+    np.testing.assert_array_equal(compact['Volume'].to_numpy(), ohlcv['Volume'].to_numpy())
+    assert compact.memory_usage(deep=True).sum() < ohlcv[HISTORY_COLUMNS].memory_usage(deep=True).sum()
+    assert compact_frame(compact) is compact
+
+
+def test_daily_feather_round_trip_is_exact(tmp_path, ohlcv):
+    compact = compact_frame(ohlcv)
+    path = tmp_path / 'BBCA.JK.feather'
+    write_feather(compact, path)
+
+    restored = read_feather(path)
+    pd.testing.assert_frame_equal(restored, compact, check_freq=False)
+    assert str(restored.index.tz) == 'Asia/Jakarta'
+    assert restored.index.name == 'Date'
+
+
+def test_intraday_round_trip_keeps_timestamps(ohlcv):
+    minutes = compact_frame(ohlcv.iloc[:120])
+    minutes.index = pd.date_range('2024-06-14 09:00', periods=120, freq='min', tz='Asia/Jakarta')
+    buffer = io.BytesIO()
+    write_feather(minutes, buffer)
+
+    restored = read_feather(io.BytesIO(buffer.getvalue()))
+    pd.testing.assert_frame_equal(restored, minutes, check_freq=False)
+
+
+def test_reads_plain_feather(tmp_path, ohlcv):
+    path = tmp_path / 'plain.feather'
+    ohlcv.reset_index().to_feather(path)
+
+    pd.testing.assert_frame_equal(read_feather(path), ohlcv, check_freq=False)
@@ -0,0 +1,36 @@
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler
+
+from src.feature_store import FeatureStore
+
+COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def scaled(features, scaler):
+    return scaler.transform(features.values).astype(np.float32)
+
+
+def test_appends_only_new_rows(tmp_path, ohlcv):
+    features = ohlcv[COLUMNS]
+    scaler = MinMaxScaler().fit(features.values)
+    store = FeatureStore(tmp_path, len(COLUMNS))
+
+    assert store.update('SYN.JK', features.iloc[:-5], scaler) == len(features) - 5
+    # The last stored row is rewritten along with the five new ones
+    assert store.update('SYN.JK', features, scaler) == 6
+    np.testing.assert_allclose(store.window('SYN.JK', 60), scaled(features, scaler)[-60:], rtol=1e-6)
+
+
+def test_back_adjusted_history_rebuilds(tmp_path, ohlcv):
+    features = ohlcv[COLUMNS]
+    scaler = MinMaxScaler().fit(features.values)
+    store = FeatureStore(tmp_path, len(COLUMNS))
+    store.update('SYN.JK', features.iloc[:-1], scaler)
+
+    # A 2:1 split on the last bar halves every earlier price
+    adjusted = features.copy()
+    adjusted.iloc[:-1, :4] /= 2
+    written = store.update('SYN.JK', adjusted, scaler)
+
+    assert written == len(adjusted)
+    np.testing.assert_allclose(store.window('SYN.JK', 60), scaled(adjusted, scaler)[-60:], rtol=1e-6)
@@ -0,0 +1,47 @@
+import pandas as pd
+
+from src.forecast_cache import ForecastCache
+
+BAR = pd.Timestamp('2024-06-14')
+NEXT_BAR = pd.Timestamp('2024-06-17')
+
+
+def test_shorter_horizons_are_served_as_a_prefix():
+    cache = ForecastCache()
+    cache.put('BBCA.JK', BAR, 'v1', [1.0, 2.0, 3.0, 4.0])
+
+    assert cache.get('BBCA.JK', BAR, 'v1', 2) == [1.0, 2.0]
+    assert cache.get('BBCA.JK', BAR, 'v1', 4) == [1.0, 2.0, 3.0, 4.0]
+    assert cache.get('BBCA.JK', BAR, 'v1', 5) is None
+    assert cache.info()['prefix_hits'] == 1
+
+    # A shorter rollout never replaces a longer one
+    cache.put('BBCA.JK', BAR, 'v1', [9.0])
+    assert cache.get('BBCA.JK', BAR, 'v1', 4) == [1.0, 2.0, 3.0, 4.0]
+
+
+def test_new_bar_or_model_version_invalidates():
+    cache = ForecastCache()
+    cache.put('BBCA.JK', BAR, 'v1', [1.0, 2.0])
+    cache.put('TLKM.JK', BAR, 'v1', [3.0, 4.0])
+
+    assert cache.get('BBCA.JK', NEXT_BAR, 'v1', 1) is None
+    assert cache.get('BBCA.JK', BAR, 'v2', 1) is None
+
+    cache.put('BBCA.JK', NEXT_BAR, 'v1', [5.0, 6.0])
+    assert cache.get('BBCA.JK', BAR, 'v1', 1) is None
+    assert cache.get('BBCA.JK', NEXT_BAR, 'v1', 2) == [5.0, 6.0]
+    assert cache.get('TLKM.JK', BAR, 'v1', 2) == [3.0, 4.0]
+    assert cache.info()['invalidations'] == 1
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ForecastCache(max_entries=2)
+    cache.put('A', BAR, 'v1', [1.0])
+    cache.put('B', BAR, 'v1', [2.0])
+    cache.get('A', BAR, 'v1', 1)
+    cache.put('C', BAR, 'v1', [3.0])
+
+    assert cache.get('B', BAR, 'v1', 1) is None
+    assert cache.get('A', BAR, 'v1', 1) == [1.0]
+    assert cache.info()['entries'] == 2
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from config import INDONESIAN_STOCKS
+from src.batch_forecast import load_symbols
+from src.forecast_store import ForecastStore
+from src.predictor import StockPredictor
+
+LAST_BAR = pd.Timestamp('2024-06-14')
+PREDICTIONS = [9100.0, 9150.0, 9125.0, 9180.0, 9200.0, 9210.0, 9190.0]
+
+
+def test_cli_forecast_found_by_app_lookup(tmp_path):
+    # The batch CLI suffixes bare codes from the symbols file and writes under them
+    symbols_file = tmp_path / 'symbols.txt'
+    symbols_file.write_text("BBCA\n")
+    store = ForecastStore(tmp_path / 'forecasts')
+    for symbol in load_symbols(symbols_file):
+        store.write(symbol, LAST_BAR, 'v1', PREDICTIONS)
+
+    # The app looks up the selected stock's code
+    predictor = StockPredictor(data_collector=object())
+    predictor.forecast_store = store
+    app_symbol = INDONESIAN_STOCKS['Bank BCA (BBCA)']
+    assert predictor._lookup(app_symbol, LAST_BAR, 'v1', 7) == PREDICTIONS
+    assert store.stats['hits'] == 1
+
+
+def test_symbol_spellings_share_one_entry(tmp_path):
+    store = ForecastStore(tmp_path)
+    store.write('BBCA.JK', LAST_BAR, 'v1', PREDICTIONS)
+
+    assert store.get('BBCA', LAST_BAR, 'v1') == PREDICTIONS
+    assert store.get('bbca.jk', LAST_BAR, 'v1') == PREDICTIONS
+    assert store.get('BBCA.JK', LAST_BAR, 'v2') is None
+
+
+def test_store_disabled_unless_configured(monkeypatch, tmp_path):
+    from src import forecast_store
+
+    monkeypatch.setitem(forecast_store.BATCH_FORECAST_SETTINGS, 'output_dir', None)
+    assert ForecastStore.from_settings() is None
+
+    monkeypatch.setitem(forecast_store.BATCH_FORECAST_SETTINGS, 'output_dir', str(tmp_path))
+    assert ForecastStore.from_settings().directory == tmp_path
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.indicators import INDICATOR_COLUMNS, BatchIndicatorState, IndicatorEngine, indicator_frame
+from src.rollout import history_state
+from src.utils import add_technical_indicators
+
+RTOL = 1e-8
+
+
+def assert_indicators_close(expected, actual, rtol=RTOL):
+    for column in INDICATOR_COLUMNS:
+        np.testing.assert_allclose(
+            np.asarray(actual[column], dtype=float), np.asarray(expected[column], dtype=float),
+            rtol=rtol, atol=1e-9, equal_nan=True, err_msg=column
+        )
+
+
+def streamed(df, warm_bars):
+    engine = IndicatorEngine()
+    parts = []
+    if warm_bars:
+        parts.append(engine.warm_start('SYN', df.iloc[:warm_bars]))
+    rest = df.iloc[warm_bars:]
+    rows = [engine.update('SYN', bar) for bar in rest.to_dict('records')]
+    parts.append(rest.assign(**{name: [row[name] for row in rows] for name in INDICATOR_COLUMNS}))
+    return pd.concat(parts)
+
+
+def test_batch_matches_pandas(ohlcv):
+    assert_indicators_close(add_technical_indicators(ohlcv), indicator_frame(ohlcv))
+
+
+@pytest.mark.parametrize('warm_bars', [0, 1, 30, 300])
+def test_streaming_matches_pandas(ohlcv, warm_bars):
+    assert_indicators_close(add_technical_indicators(ohlcv), streamed(ohlcv, warm_bars))
+
+
+def test_closed_form_state_matches_pandas(ohlcv):
+    # State seeded at many origins in one pass, then advanced one bar each
+    origins = np.array([60, 100, 250, len(ohlcv) - 2])
+    state = BatchIndicatorState.from_history(
+        ohlcv['Open'], ohlcv['High'], ohlcv['Low'], ohlcv['Close'], ohlcv['Volume'], origins
+    )
+    nxt = ohlcv.iloc[origins + 1]
+    row = state.update(*(nxt[c].to_numpy(dtype=float) for c in ['Open', 'High', 'Low', 'Close', 'Volume']))
+
+    expected = add_technical_indicators(ohlcv).iloc[origins + 1]
+    assert_indicators_close(expected, row)
+
+
+def test_concat_keeps_each_series(ohlcv):
+    other = ohlcv.assign(Close=ohlcv['Close'] * 1.5)
+    merged = BatchIndicatorState.concat([history_state(ohlcv.iloc[:-1]), history_state(other.iloc[:-1])])
+    bars = [ohlcv.iloc[-1], other.iloc[-1]]
+    row = merged.update(*(np.array([bar[c] for bar in bars], dtype=float)
+                          for c in ['Open', 'High', 'Low', 'Close', 'Volume']))
+
+    for i, frame in enumerate((ohlcv, other)):
+        expected = add_technical_indicators(frame).iloc[-1]
+        for column in INDICATOR_COLUMNS:
+            np.testing.assert_allclose(row[column][i], expected[column], rtol=RTOL, err_msg=column)
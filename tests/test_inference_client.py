@@ -0,0 +1,35 @@
+import threading
+
+import pytest
+
+from src.inference_server import InferenceClient, InferenceServer
+
+
+class ReadyPredictor:
+    is_ready = True
+
+    def predict_many(self, symbols, days_ahead):
+        return {symbol: [1.0] * days_ahead for symbol in symbols}, {}
+
+
+def test_connect_fails_when_server_is_down(tmp_path):
+    client = InferenceClient(socket_path=str(tmp_path / 'missing.sock'))
+    future = client.connect_async(timeout=0.2)
+
+    with pytest.raises(ConnectionError, match='not ready'):
+        future.result(timeout=5)
+    assert client.ready is future
+    assert not client.is_ready
+
+
+def test_connect_succeeds_against_running_server(tmp_path):
+    path = str(tmp_path / 'inference.sock')
+    server = InferenceServer(ReadyPredictor(), path, window_seconds=0.001)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = InferenceClient(socket_path=path)
+        assert client.connect_async(timeout=5).result(timeout=5) is True
+        assert client.predict_prices('BBCA.JK', days_ahead=3) == [1.0, 1.0, 1.0]
+    finally:
+        server.shutdown()
+        server.server_close()
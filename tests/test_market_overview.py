@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import MARKET_OVERVIEW_SETTINGS
+from src.market_overview import build_panel, cross_section
+from synthetic import generate_universe
+
+WINDOW = 120
+
+
+@pytest.fixture(scope='module')
+def universe():
+    return generate_universe(12, 2)
+
+
+def test_statistics_match_pandas(universe):
+    panel = build_panel(universe)
+    screener, correlation = cross_section(panel, window=WINDOW)
+
+    closes = pd.DataFrame({symbol: frame['Close'] for symbol, frame in universe.items()}).sort_index()
+    recent = (closes / closes.shift(1) - 1).iloc[1:].iloc[-WINDOW:]
+    assert recent.isna().any().any()  # suspensions leave gaps, so pairwise-complete handling is exercised
+
+    symbols = panel.symbols
+    np.testing.assert_allclose(correlation.values, recent.corr().loc[symbols, symbols].values, atol=1e-10)
+
+    market = recent[MARKET_OVERVIEW_SETTINGS['benchmark']]
+    betas = [recent[symbol].cov(market) / market[recent[symbol].notna()].var() for symbol in symbols]
+    np.testing.assert_allclose(screener['beta'].values, betas, atol=1e-10)
+
+    volatility = recent.std()[symbols] * np.sqrt(MARKET_OVERVIEW_SETTINGS['trading_days_per_year']) * 100
+    np.testing.assert_allclose(screener['volatility_pct'].values, volatility.values, atol=1e-8)
+    assert (screener['observations'] == recent.notna().sum()[symbols]).all()
+
+
+def test_returns_use_last_traded_close(universe):
+    screener, _ = cross_section(build_panel(universe), window=WINDOW)
+
+    closes = pd.DataFrame({symbol: frame['Close'] for symbol, frame in universe.items()}).sort_index().ffill()
+    month = (closes.iloc[-1] / closes.iloc[-22] - 1) * 100
+    np.testing.assert_allclose(screener['last_close'].values, closes.iloc[-1][screener.index].values)
+    np.testing.assert_allclose(screener['return_1M_pct'].values, month[screener.index].values)
+    assert screener['range_position_pct'].between(0, 100).all()
+
+
+def test_panel_aligns_timezones_and_skips_empty_frames(ohlcv):
+    local = ohlcv.tz_localize('Asia/Jakarta') if ohlcv.index.tz is None else ohlcv
+    panel = build_panel({'A.JK': local, 'B.JK': local.iloc[-100:], 'C.JK': pd.DataFrame()})
+
+    assert panel.symbols == ['A.JK', 'B.JK']
+    assert panel.dates.tz is None
+    assert panel.close.shape == (len(ohlcv), 2)
+    assert np.isnan(panel.close[:-100, 1]).all()
+    np.testing.assert_array_equal(panel.close[-100:, 0], panel.close[-100:, 1])
+
+
+def test_empty_panel():
+    screener, correlation = cross_section(build_panel({}))
+    assert screener.empty and correlation.empty
@@ -0,0 +1,67 @@
+import threading
+import time
+
+from src.model_loader import ModelLoader
+
+
+class FileLoader(ModelLoader):
+    """Loads whatever `files` currently hold; a 'corrupt' model raises like a half-written .h5"""
+
+    def __init__(self):
+        super().__init__(backend='numpy')
+        self.files = {'version': 'v1', 'model': 'model-v1'}
+        self.loads = 0
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def model_version(self):
+        return self.files['version']
+
+    def _load_components(self):
+        self.loads += 1
+        version, model = self.files['version'], self.files['model']
+        self.gate.wait(5)
+        if model == 'corrupt':
+            raise OSError("Unable to open file (truncated file)")
+        return model, {'BBCA': f'scaler-{version}'}, {'feature_columns': []}, version
+
+
+def test_reload_keeps_serving_the_old_model_until_the_new_one_is_in():
+    loader = FileLoader()
+    assert loader.load_all()
+
+    loader.files = {'version': 'v2', 'model': 'model-v2'}
+    loader.gate.clear()
+    reloading = threading.Thread(target=loader.reload)
+    reloading.start()
+    while loader.loads < 2:
+        time.sleep(0.01)
+
+    # Mid-reload: still loaded, still the old model and scalers
+    assert loader.is_loaded
+    assert loader.get_scaler_for_stock('BBCA.JK') == 'scaler-v1'
+    assert (loader.model, loader.loaded_version) == ('model-v1', 'v1')
+
+    loader.gate.set()
+    reloading.join()
+    assert loader.get_scaler_for_stock('BBCA.JK') == 'scaler-v2'
+    assert (loader.model, loader.loaded_version) == ('model-v2', 'v2')
+
+
+def test_failed_reload_keeps_the_old_model_and_is_not_retried():
+    loader = FileLoader()
+    assert loader.load_all()
+
+    loader.files = {'version': 'v2', 'model': 'corrupt'}
+    assert not loader.reload()
+    assert loader.is_loaded
+    assert (loader.model, loader.loaded_version) == ('model-v1', 'v1')
+
+    # Same broken files: no second load attempt
+    assert not loader.reload()
+    assert loader.loads == 2
+
+    # The file finished writing: the next reload picks it up
+    loader.files = {'version': 'v3', 'model': 'model-v3'}
+    assert loader.reload()
+    assert loader.loaded_version == 'v3'
@@ -0,0 +1,59 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.probabilistic import ResidualBootstrap
+
+POINT = np.linspace(1000, 1100, 7)
+
+
+class FakePredictor:
+    def __init__(self, ohlcv):
+        self.data_collector = self
+        self.data = ohlcv
+
+    def get_stock_data(self, symbol):
+        return self.data
+
+    def _model_version(self):
+        return 'v1'
+
+
+class BlockingBacktester:
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def residuals(self, symbol, horizon, period=None):
+        self.calls += 1
+        self.release.wait(5)
+        return np.random.default_rng(0).normal(0, 0.01, size=(200, horizon)).cumsum(axis=1)
+
+
+def test_backtest_runs_off_the_request_path(ohlcv):
+    bootstrap = ResidualBootstrap(FakePredictor(ohlcv), n_paths=200, seed=1)
+    bootstrap.backtester = BlockingBacktester()
+
+    # The backtest is still running: answer from daily returns without waiting
+    assert bootstrap.quantiles('SYN.JK', POINT)['method'] == 'historical_returns'
+    assert bootstrap.quantiles('SYN.JK', POINT)['method'] == 'historical_returns'
+
+    bootstrap.backtester.release.set()
+    bootstrap.prepare('SYN.JK').result(timeout=5)
+    assert bootstrap.quantiles('SYN.JK', POINT)['method'] == 'backtest_residuals'
+    assert bootstrap.backtester.calls == 1
+
+
+def test_seeded_draws_reproducible_and_thread_safe(ohlcv):
+    first = ResidualBootstrap(FakePredictor(ohlcv), n_paths=500, seed=7)
+    second = ResidualBootstrap(FakePredictor(ohlcv), n_paths=500, seed=7)
+    residuals = np.random.default_rng(0).normal(0, 0.02, size=(300, len(POINT)))
+
+    np.testing.assert_array_equal(first.simulate(POINT, residuals, 500), second.simulate(POINT, residuals, 500))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        paths = list(pool.map(lambda _: first.simulate(POINT, residuals, 500), range(32)))
+    assert all(p.shape == (500, len(POINT)) and np.isfinite(p).all() for p in paths)
+    # Each call gets its own child stream
+    assert not np.array_equal(paths[0], paths[1])
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from config import APP_SETTINGS
+from src.rollout import WindowRing
+from src.utils import add_technical_indicators
+from synthetic import synthetic_ohlcv
+
+DAYS = 10
+
+
+def recompute_rollout(predictor, data, symbol, days_ahead):
+    """Append each predicted bar and recompute every indicator over the whole frame"""
+    feature_columns = predictor.model_loader.config['feature_columns']
+    scalers = predictor.model_loader.get_scaler_for_stock(symbol)
+    frame = data[['Open', 'High', 'Low', 'Close', 'Volume']].copy()
+    predictions = []
+    for _ in range(days_ahead):
+        features = add_technical_indicators(frame)[feature_columns].bfill().ffill()
+        window = scalers['feature_scaler'].transform(features.values[-APP_SETTINGS['sequence_length']:])
+        scaled = predictor.model_loader.model(window[np.newaxis].astype(np.float32))
+        close = float(scalers['target_scaler'].inverse_transform(scaled)[0, 0])
+        predictions.append(close)
+
+        open_ = frame['Close'].iloc[-1]
+        frame.loc[frame.index[-1] + pd.offsets.BDay()] = {
+            'Open': open_, 'High': max(open_, close), 'Low': min(open_, close),
+            'Close': close, 'Volume': frame['Volume'].iloc[-20:].mean()
+        }
+    return np.array(predictions)
+
+
+def test_rollout_matches_full_recompute(stub_predictor):
+    data = synthetic_ohlcv(400)
+    predictor = stub_predictor({'SYN.JK': data})
+
+    predicted = predictor.predict_prices('SYN.JK', days_ahead=DAYS)
+    np.testing.assert_allclose(predicted, recompute_rollout(predictor, data, 'SYN.JK', DAYS), rtol=1e-5)
+
+
+def test_predict_many_matches_predict_prices(stub_predictor):
+    frames = {
+        'SYN.JK': synthetic_ohlcv(400),
+        'ALT.JK': synthetic_ohlcv(300, start_price=900.0, seed=1),
+        'SML.JK': synthetic_ohlcv(120, start_price=150.0, seed=2),
+    }
+    predictor = stub_predictor(frames)
+
+    batched, errors = predictor.predict_many(list(frames), days_ahead=DAYS)
+    assert errors == {}
+
+    predictor.forecast_cache.clear()
+    for symbol in frames:
+        np.testing.assert_allclose(batched[symbol], predictor.predict_prices(symbol, days_ahead=DAYS), rtol=1e-6)
+
+
+def test_window_ring_slides_and_carries_nans_forward():
+    window = np.arange(12, dtype=np.float32).reshape(2, 3, 2)  # two windows of 3 rows
+    ring = WindowRing(window)
+    for step in range(5):
+        ring.push(np.array([[100.0 + step, np.nan], [200.0 + step, 1.0]]))
+
+    np.testing.assert_array_equal(ring.window()[0], [[102, 5], [103, 5], [104, 5]])
+    np.testing.assert_array_equal(ring.window()[1], [[202, 1], [203, 1], [204, 1]])
@@ -0,0 +1,94 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from src.cache import MarketDataCache
+from src.data_collector import DataCollector
+from src.fetchers import LocalFetcher, RateLimiter
+from src.shared_store import SQLiteMarketStore
+
+KEY = ('BBCA.JK', '1y', '1d')
+
+
+def make_collector(frames, latency=0.0, shared_store=None):
+    collector = DataCollector(
+        cache=MarketDataCache(),
+        fetcher=LocalFetcher(frames=frames, latency=latency),
+        shared_store=shared_store,
+        compact=False
+    )
+    collector.rate_limiter = RateLimiter(requests_per_second=1000, burst=1000)
+    return collector
+
+
+def test_concurrent_callers_share_one_fetch(ohlcv):
+    collector = make_collector({'BBCA.JK': ohlcv}, latency=0.2)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: collector._load(KEY), range(8)))
+
+    statuses = [info['status'] for _, info in results]
+    assert collector.fetcher.calls == 1
+    assert statuses.count('ok') == 1
+    assert set(statuses) <= {'ok', 'coalesced', 'cached'}
+    assert all(data is results[0][0] for data, _ in results)
+    assert not collector._inflight
+
+
+def test_lease_is_exclusive_until_released(tmp_path):
+    first = SQLiteMarketStore(tmp_path / 'market.db')
+    second = SQLiteMarketStore(tmp_path / 'market.db')
+
+    assert first.try_lease(KEY)
+    assert not second.try_lease(KEY)
+    assert first.try_lease(KEY)  # the holder may renew
+    first.release(KEY)
+    assert second.try_lease(KEY)
+
+
+def test_expired_lease_can_be_taken_over(tmp_path):
+    crashed = SQLiteMarketStore(tmp_path / 'market.db', lease_seconds=0.1)
+    other = SQLiteMarketStore(tmp_path / 'market.db', lease_seconds=0.1)
+
+    assert crashed.try_lease(KEY)
+    time.sleep(0.15)
+    assert other.try_lease(KEY)
+
+
+def test_second_process_adopts_stored_frame(tmp_path, ohlcv):
+    frames = {'BBCA.JK': ohlcv}
+    first = make_collector(frames, shared_store=SQLiteMarketStore(tmp_path / 'market.db'))
+    second = make_collector(frames, shared_store=SQLiteMarketStore(tmp_path / 'market.db'))
+
+    data, info = first._load(KEY)
+    assert info['status'] == 'ok'
+
+    adopted, info = second._load(KEY)
+    assert info['status'] == 'shared'
+    assert second.fetcher.calls == 0
+    pd.testing.assert_frame_equal(adopted, data, check_freq=False)
+
+
+def test_waiter_adopts_result_of_lease_holder(tmp_path, ohlcv):
+    holder = SQLiteMarketStore(tmp_path / 'market.db')
+    collector = make_collector(
+        {'BBCA.JK': ohlcv},
+        shared_store=SQLiteMarketStore(tmp_path / 'market.db', poll_seconds=0.01)
+    )
+    assert holder.try_lease(KEY)
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(collector._load(KEY)))
+    waiter.start()
+    time.sleep(0.1)
+    holder.put(KEY, ohlcv)
+    holder.release(KEY)
+    waiter.join(timeout=5)
+
+    data, info = results[0]
+    assert info['status'] == 'shared'
+    assert collector.fetcher.calls == 0
+    assert collector.shared_store.info()['waits'] >= 1
+    pd.testing.assert_frame_equal(data, ohlcv, check_freq=False)
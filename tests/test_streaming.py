@@ -0,0 +1,65 @@
+import asyncio
+
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler
+
+from src.cache import MarketDataCache
+from src.data_collector import DataCollector
+from src.fetchers import LocalFetcher
+from src.indicators import INDICATOR_COLUMNS, indicator_frame
+from src.streaming import Bar, SymbolStream, YahooPollingSource
+
+COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume'] + INDICATOR_COLUMNS[:4]
+
+
+def bars(frame, symbol='SYN.JK'):
+    for timestamp, row in frame.iterrows():
+        yield Bar(symbol, timestamp, row['Open'], row['High'], row['Low'], row['Close'], row['Volume'])
+
+
+def make_stream(ohlcv):
+    scaler = MinMaxScaler().fit(indicator_frame(ohlcv)[COLUMNS].dropna().values)
+    return SymbolStream('SYN.JK', COLUMNS, scaler, sequence_length=60, capacity=390)
+
+
+def test_warm_start_matches_live_bars(ohlcv):
+    live = make_stream(ohlcv)
+    for bar in bars(ohlcv):
+        live.add(bar)
+
+    warmed = make_stream(ohlcv)
+    warmed.warm_start(ohlcv.iloc[:300])
+    assert warmed.ready
+    # Bars already in the warm history are dropped as duplicates
+    assert warmed.add(next(bars(ohlcv.iloc[299:300]))) is None
+    for bar in bars(ohlcv.iloc[300:]):
+        warmed.add(bar)
+
+    np.testing.assert_allclose(warmed.window(), live.window(), rtol=1e-5)
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.hosts = []
+
+    def acquire(self, host):
+        self.hosts.append(host)
+
+
+def test_polling_goes_through_collector_rate_limit(ohlcv):
+    fetcher = LocalFetcher(frames={'SYN.JK': ohlcv, 'ALT.JK': ohlcv})
+    collector = DataCollector(cache=MarketDataCache(), fetcher=fetcher)
+    collector.rate_limiter = CountingLimiter()
+    source = YahooPollingSource(['SYN.JK', 'ALT.JK'], collector, poll_seconds=0.01)
+
+    async def first_poll():
+        received = []
+        async for bar in source.bars():
+            received.append(bar)
+            if len(received) == 2:
+                return received
+
+    received = asyncio.run(first_poll())
+    assert sorted(bar.symbol for bar in received) == ['ALT.JK', 'SYN.JK']
+    assert collector.rate_limiter.hosts == ['local', 'local']
+    assert fetcher.calls == 2
@@ -0,0 +1,223 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src import valuation_analyzer
+from src.valuation_analyzer import ResponseCache, ValuationAnalyzer
+
+
+def completion(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+class FakeCompletions:
+    """Counts calls; every call takes `latency` seconds and answers with a fixed text"""
+
+    def __init__(self, latency=0.2):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def create(self, **params):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return completion('report')
+
+
+class FakeAsyncCompletions(FakeCompletions):
+    async def create(self, **params):
+        with self._lock:
+            self.calls += 1
+        await asyncio.sleep(self.latency)
+        return completion('report')
+
+
+@pytest.fixture
+def analyzer():
+    analyzer = ValuationAnalyzer()
+    analyzer.client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions()))
+    analyzer.async_client = SimpleNamespace(chat=SimpleNamespace(completions=FakeAsyncCompletions()))
+    return analyzer
+
+
+def test_concurrent_identical_requests_share_one_call(analyzer):
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(analyzer.analyze_stock_valuation('BBCA', 9000.0, [9100.0] * 7)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ['report'] * 5
+    assert analyzer.client.chat.completions.calls == 1
+    assert analyzer.stats['coalesced'] == 4
+
+    # A later identical request is served from the cache
+    assert analyzer.analyze_stock_valuation('BBCA', 9000.0, [9100.0] * 7) == 'report'
+    assert analyzer.client.chat.completions.calls == 1
+
+
+def test_async_requests_share_one_call(analyzer):
+    async def run():
+        return await asyncio.gather(*(
+            analyzer.analyze_stock_valuation_async('TLKM', 3000.0, [3100.0] * 7) for _ in range(5)
+        ))
+
+    assert asyncio.run(run()) == ['report'] * 5
+    assert analyzer.async_client.chat.completions.calls == 1
+    assert analyzer.client.chat.completions.calls == 0
+
+
+def test_analyze_universe_runs_inside_a_loop(analyzer):
+    async def run():
+        return await analyzer.analyze_universe({'BBCA': (9000.0, [9100.0] * 7), 'TLKM': (3000.0, [3100.0] * 7)})
+
+    assert asyncio.run(run()) == {'BBCA': 'report', 'TLKM': 'report'}
+
+
+def test_cache_entries_expire_at_midnight(monkeypatch):
+    cache = ResponseCache()
+    cache.put('a', 'text')
+    assert cache.get('a') == 'text'
+
+    tomorrow = time.time() + 86400
+    monkeypatch.setattr(valuation_analyzer.time, 'time', lambda: tomorrow)
+    assert cache.get('a') is None
+
+
+def test_put_purges_expired_entries(monkeypatch):
+    cache = ResponseCache()
+    for key in 'abc':
+        cache.put(key, 'text')
+    for key in 'abc':
+        cache._entries[key] = ('text', time.time() - 1)
+
+    cache.put('d', 'text')
+    assert cache.info()['entries'] == 1
+    assert cache.get('d') == 'text'
+
+
+def test_cache_is_bounded():
+    cache = ResponseCache(max_entries=3)
+    for key in 'abcde':
+        cache.put(key, key)
+
+    assert cache.info()['entries'] == 3
+    assert cache.get('a') is None
+    assert cache.get('e') == 'e'
+
+
+class FakeStream:
+    def __init__(self, latency=0.2, chunk_delay=0.01):
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.calls = 0
+
+    def create(self, **params):
+        self.calls += 1
+        time.sleep(self.latency)
+        return self._events()
+
+    def _events(self):
+        for word in ('Fair ', 'value, ', 'hold.'):
+            time.sleep(self.chunk_delay)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word))])
+
+
+def test_concurrent_streams_share_one_upstream_call(analyzer):
+    upstream = FakeStream()
+    analyzer.client = SimpleNamespace(chat=SimpleNamespace(completions=upstream))
+    reports = []
+
+    def session():
+        reports.append(''.join(analyzer.stream_stock_valuation('BBNI', 5000.0, [5100.0] * 7)))
+
+    threads = [threading.Thread(target=session) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.05)  # later sessions join mid-stream
+    for thread in threads:
+        thread.join()
+
+    assert reports == ['Fair value, hold.'] * 4
+    assert upstream.calls == 1
+    assert analyzer.stats['coalesced'] == 3
+
+    metrics = {}
+    assert ''.join(analyzer.stream_stock_valuation('BBNI', 5000.0, [5100.0] * 7, metrics=metrics)) == 'Fair value, hold.'
+    assert metrics['cached'] and upstream.calls == 1
+
+
+def test_cancelled_leader_retires_its_request(analyzer):
+    analyzer.async_client.chat.completions.latency = 1.0
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(analyzer.analyze_stock_valuation_async('ASII', 5000.0, [5100.0] * 7), 0.1)
+
+    asyncio.run(run())
+    assert analyzer._inflight == {}
+
+    # The next identical request starts its own call instead of waiting on the abandoned one
+    analyzer.client.chat.completions.latency = 0.0
+    assert analyzer.analyze_stock_valuation('ASII', 5000.0, [5100.0] * 7) == 'report'
+    assert analyzer.client.chat.completions.calls == 1
+
+
+def test_followers_of_a_cancelled_leader_get_an_error(analyzer):
+    analyzer.async_client.chat.completions.latency = 1.0
+
+    async def run():
+        leader = asyncio.create_task(analyzer.analyze_stock_valuation_async('UNVR', 2500.0, [2600.0] * 7))
+        await asyncio.sleep(0.05)
+        follower = asyncio.create_task(analyzer.analyze_stock_valuation_async('UNVR', 2500.0, [2600.0] * 7))
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        return await asyncio.wait_for(follower, 2)
+
+    assert 'interrupted' in asyncio.run(run())
+    assert analyzer._inflight == {}
+
+
+def test_slow_connection_is_not_a_stall(analyzer, monkeypatch):
+    # Connecting takes longer than the stall timeout; chunks then arrive promptly
+    monkeypatch.setitem(valuation_analyzer.VALUATION_SETTINGS, 'timeout_seconds', 0.1)
+    analyzer.client = SimpleNamespace(chat=SimpleNamespace(completions=FakeStream(latency=0.4)))
+
+    assert ''.join(analyzer.stream_stock_valuation('ADRO', 2500.0, [2600.0] * 7)) == 'Fair value, hold.'
+
+
+class FlakyStream(FakeStream):
+    """Fails the first connection attempt"""
+
+    def create(self, **params):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError("connection reset")
+        return self._events()
+
+
+def test_stream_backoff_releases_the_concurrency_slot(analyzer, monkeypatch):
+    monkeypatch.setitem(valuation_analyzer.VALUATION_SETTINGS, 'backoff_seconds', 1.0)
+    monkeypatch.setattr(valuation_analyzer.random, 'uniform', lambda low, high: high)
+    analyzer._semaphore = threading.BoundedSemaphore(1)
+    analyzer.client = SimpleNamespace(chat=SimpleNamespace(completions=FlakyStream()))
+    reports = []
+    thread = threading.Thread(
+        target=lambda: reports.append(''.join(analyzer.stream_stock_valuation('PTBA', 3000.0, [3100.0] * 7)))
+    )
+    thread.start()
+    time.sleep(0.1)
+
+    # The stream is backing off after its failed attempt; the only slot is free for other requests
+    assert analyzer._semaphore.acquire(timeout=0.5)
+    analyzer._semaphore.release()
+    thread.join()
+    assert reports == ['Fair value, hold.']